@@ -0,0 +1,32 @@
+from allauth.account import app_settings
+from allauth.account.app_settings import LoginMethod
+from allauth.account.auth_backends import AuthenticationBackend
+from allauth.account.models import EmailAddress
+
+from apps.core.models import User
+
+
+class EmailAuthenticationBackend(AuthenticationBackend):
+    """allauth's backend with email logins resolved through indexes only.
+
+    allauth also looks for the email in ``users`` with a plain ``email = %s``
+    whenever the address isn't verified (always, with verification off),
+    which no index serves. Here that lookup goes through
+    ``User.objects.by_email``, which uses ``users_email_ci_unique``; the
+    ``EmailAddress`` lookup is indexed already.
+    """
+
+    def _authenticate_by_email(self, email, password):
+        if not email or LoginMethod.EMAIL not in app_settings.LOGIN_METHODS:
+            return None
+        addresses = list(
+            EmailAddress.objects.filter(email=email.strip().lower()).select_related("user")
+        )
+        verified = [address.user for address in addresses if address.verified]
+        users = verified or [address.user for address in addresses]
+        if not verified:
+            users += [user for user in User.objects.by_email(email) if user not in users]
+        for user in users:
+            if self._check_password(user, password):
+                return user
+        return None
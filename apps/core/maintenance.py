@@ -0,0 +1,59 @@
+"""Maintenance steps for core, run by ``daily_cleanup``.
+
+Each step works in bounded batches; see ``onlydjango.maintenance``.
+"""
+
+from datetime import timedelta
+
+from allauth.account.models import EmailConfirmation
+from django.contrib.sessions.models import Session
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from onlydjango.maintenance import delete_in_batches, step
+
+from .models import User
+
+# Uploads younger than this may not be saved on a user yet.
+AVATAR_GRACE_PERIOD = timedelta(days=1)
+
+
+@step("sessions.expired")
+def expired_sessions(batch_size):
+    """Delete expired database sessions."""
+    yield from delete_in_batches(Session.objects.filter(expire_date__lt=timezone.now()), batch_size)
+
+
+@step("allauth.stale_email_confirmations")
+def stale_email_confirmations(batch_size):
+    """Delete email confirmations past allauth's expiry."""
+    yield from delete_in_batches(EmailConfirmation.objects.all_expired(), batch_size)
+
+
+@step("core.orphaned_avatars")
+def orphaned_avatars(batch_size):
+    """Delete avatar files in storage that no user references."""
+    directory = User._meta.get_field("avatar").upload_to.rstrip("/")
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return
+
+    cutoff = timezone.now() - AVATAR_GRACE_PERIOD
+    for start in range(0, len(files), batch_size):
+        names = [f"{directory}/{name}" for name in files[start:start + batch_size]]
+        referenced = set(User.objects.filter(avatar__in=names).values_list("avatar", flat=True))
+        deleted = 0
+        for name in names:
+            if name in referenced or _modified_after(name, cutoff):
+                continue
+            default_storage.delete(name)
+            deleted += 1
+        yield deleted
+
+
+def _modified_after(name: str, cutoff) -> bool:
+    try:
+        return default_storage.get_modified_time(name) > cutoff
+    except (NotImplementedError, FileNotFoundError):
+        return True
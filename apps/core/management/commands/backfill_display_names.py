@@ -0,0 +1,42 @@
+"""Fill the stored User.display_name for rows saved before it existed.
+
+Saves keep the column current; run this once after migrating, or after
+changing get_display_name(). Rows already up to date are not rewritten.
+
+Usage:
+    python manage.py backfill_display_names
+    python manage.py backfill_display_names --batch-size 20000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.models.user.methods import backfill_display_names
+from onlydjango.db.timeouts import statement_timeout
+
+
+class Command(BaseCommand):
+    help = "Fill the stored User.display_name in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Users per UPDATE statement (default: 5000)",
+        )
+
+    # One UPDATE per --batch-size rows can outlast DB_STATEMENT_TIMEOUT_MS.
+    @statement_timeout(0)
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        updated = batches = 0
+        for rows in backfill_display_names(options["batch_size"]):
+            updated += rows
+            batches += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  batch {batches}: {rows} updated")
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {updated} display names in {batches} batches ({time.monotonic() - started:.1f}s)"
+        ))
@@ -0,0 +1,43 @@
+"""Run process_user_actions over every user in resumable chunks.
+
+Usage:
+    python manage.py fan_out_user_action profile_update
+    python manage.py fan_out_user_action profile_update --chunk-size 5000 --restart
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.tasks import fan_out_user_action
+
+
+class Command(BaseCommand):
+    help = "Run process_user_actions over every user in resumable chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", type=str, help="Action to process for every user")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Users per task (default: 1000)",
+        )
+        parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            default=8,
+            help="Chunks queued or running at once (default: 8)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore the checkpoint of an interrupted run and start over",
+        )
+
+    def handle(self, *args, **options):
+        dispatched = fan_out_user_action(
+            options["action"],
+            chunk_size=options["chunk_size"],
+            max_in_flight=options["max_in_flight"],
+            restart=options["restart"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Dispatched {dispatched} users"))
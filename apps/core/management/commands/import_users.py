@@ -0,0 +1,99 @@
+"""Bulk import users from a CSV or NDJSON file.
+
+Columns: email (required), username (defaults to the email), first_name,
+last_name, bio, password (plain text; hashed on --workers processes). Users
+without a password, or all of them with --no-passwords, get an unusable one;
+send them a set-password link with --notify invite.
+
+Usage:
+    python manage.py import_users customers.csv
+    python manage.py import_users users.ndjson.gz --on-conflict update --workers 8
+    python manage.py import_users users.csv --no-passwords --notify invite
+"""
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.models.user.importing import BATCH_SIZE, import_users
+from apps.core.tasks import send_account_invites, send_welcome_email
+from onlydjango.db.timeouts import statement_timeout
+from onlydjango.imports import FORMATS, RowError, detect_format, open_input, read_rows
+
+NOTIFY_TASKS = {"welcome": send_welcome_email, "invite": send_account_invites}
+
+
+class Command(BaseCommand):
+    help = "Bulk import users from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, .gz allowed (- for stdin)")
+        parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Rows validated and inserted per batch (default: {BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--on-conflict",
+            choices=("skip", "update"),
+            default="skip",
+            help="What to do with rows whose email already exists (default: skip)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processes hashing passwords (default: one per CPU)",
+        )
+        parser.add_argument(
+            "--no-passwords",
+            action="store_true",
+            help="Ignore the password column and create unusable passwords",
+        )
+        parser.add_argument(
+            "--notify",
+            choices=("none", *NOTIFY_TASKS),
+            default="none",
+            help="Queue welcome emails or set-password invites for created users",
+        )
+
+    # Large batches insert and update for longer than a web request may.
+    @statement_timeout(0)
+    def handle(self, *args, **options):
+        notify = NOTIFY_TASKS.get(options["notify"])
+        verbosity = options["verbosity"]
+
+        def on_batch(report, ids):
+            if notify is not None and ids:
+                for user_id in ids:
+                    notify(user_id=user_id)
+                notify.flush()
+            if verbosity > 1:
+                self.stdout.write(f"  {report.rows:>10,} rows  {report.rows_per_second:>8,.0f} rows/s")
+
+        path = options["path"]
+        try:
+            with open_input(path) as file:
+                rows = read_rows(file, options["format"] or detect_format(path))
+                report = import_users(
+                    rows,
+                    batch_size=options["batch_size"],
+                    on_conflict=options["on_conflict"],
+                    hash_passwords=not options["no_passwords"],
+                    workers=options["workers"],
+                    on_batch=on_batch,
+                )
+        except (OSError, RowError) as exc:
+            raise CommandError(f"Import stopped: {exc}")
+
+        for error in report.errors:
+            self.stderr.write(f"  {error}")
+        if report.invalid > len(report.errors):
+            self.stderr.write(f"  ... and {report.invalid - len(report.errors)} more")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.rows:,} rows in {report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s): "
+            f"{report.created:,} created, {report.updated:,} updated, "
+            f"{report.skipped:,} skipped, {report.invalid:,} invalid"
+        ))
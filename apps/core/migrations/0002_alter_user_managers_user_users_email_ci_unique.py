@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:06
+#
+# Edited: on PostgreSQL the unique index is built CONCURRENTLY, so writes to
+# users continue while it builds (a plain CREATE UNIQUE INDEX holds a SHARE
+# lock that blocks them). CONCURRENTLY can't run inside a transaction, hence
+# atomic = False; a build that fails (e.g. on duplicate emails) leaves an
+# INVALID index, which must be dropped before re-running. Other databases add
+# the constraint as usual. The state gets the AddConstraint either way.
+
+import apps.core.models.user.managers
+import django.db.models.functions.text
+from django.db import migrations, models
+
+CONSTRAINT = models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='users_email_ci_unique', violation_error_message='A user with that email address already exists.')
+
+CREATE = "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS users_email_ci_unique ON users (LOWER(email)) WHERE NOT (email = '')"
+DROP = "DROP INDEX CONCURRENTLY IF EXISTS users_email_ci_unique"
+
+
+def add_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE)
+    else:
+        schema_editor.add_constraint(apps.get_model("core", "User"), CONSTRAINT)
+
+
+def remove_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP)
+    else:
+        schema_editor.remove_constraint(apps.get_model("core", "User"), CONSTRAINT)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', apps.core.models.user.managers.UserManager()),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_constraint, remove_constraint),
+            ],
+            state_operations=[
+                migrations.AddConstraint(model_name='user', constraint=CONSTRAINT),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_user_managers_user_users_email_ci_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='display_name',
+            field=models.CharField(blank=True, editable=False, max_length=301),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:09
+#
+# Edited: PostgreSQL-only search schema for User.objects.search(). The column
+# is generated, so PostgreSQL keeps it current and the model doesn't declare
+# it; other databases get nothing and search falls back to icontains.
+#
+# Adding a STORED generated column rewrites the whole table under an ACCESS
+# EXCLUSIVE lock: reads and writes to users wait until it finishes. Run it in
+# a quiet window on large tables. The indexes are built concurrently in 0005.
+
+from django.db import migrations
+
+FORWARDS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE users ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig,
+            coalesce(first_name, '') || ' ' || coalesce(last_name, '')), 'A')
+        || setweight(to_tsvector('simple'::regconfig,
+            coalesce(username, '') || ' ' || coalesce(email, '')), 'B')
+        || setweight(to_tsvector('english'::regconfig, coalesce(bio, '')), 'C')
+    ) STORED
+    """,
+]
+
+BACKWARDS = [
+    "ALTER TABLE users DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_user_display_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgresql(FORWARDS), run_on_postgresql(BACKWARDS)),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:34
+#
+# Edited: the GIN indexes for User.objects.search(), built CONCURRENTLY so
+# writes to users continue while they build. CONCURRENTLY can't run inside a
+# transaction, hence atomic = False; a build that fails halfway leaves an
+# INVALID index, which must be dropped before re-running. PostgreSQL only.
+
+from django.db import migrations
+
+FORWARDS = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS users_search_vector_gin ON users USING gin (search_vector)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS users_email_trgm ON users USING gin (email gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS users_display_name_trgm ON users USING gin (display_name gin_trgm_ops)",
+]
+
+BACKWARDS = [
+    "DROP INDEX CONCURRENTLY IF EXISTS users_display_name_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS users_email_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS users_search_vector_gin",
+]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0004_user_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgresql(FORWARDS), run_on_postgresql(BACKWARDS)),
+    ]
@@ -0,0 +1,38 @@
+"""Queryset and manager for the User model."""
+
+from django.contrib.auth.models import UserManager as DjangoUserManager
+from django.db import models
+from django.db.models.functions import Lower
+
+from .search import search
+
+# Columns member lists render: the stored name and avatar, no bio or hashes.
+LIST_FIELDS = ("id", "username", "email", "avatar", "display_name")
+
+
+class UserQuerySet(models.QuerySet):
+    def for_list(self):
+        """Load only what lists of users render; use ``user.name`` for the name."""
+        return self.only(*LIST_FIELDS)
+
+    def search(self, query: str):
+        """Users matching ``query``, best first, annotated with ``rank``."""
+        return search(self, query)
+
+    def by_email(self, email: str):
+        """Users whose email matches ``email`` case-insensitively.
+
+        Filters exactly as ``users_email_ci_unique`` is defined, lower(email)
+        excluding blanks, so the lookup is an index scan at any table size;
+        ``email__iexact`` compiles to UPPER() and can't use it.
+        """
+        return self.by_emails([email])
+
+    def by_emails(self, emails):
+        """``by_email`` for many addresses at once."""
+        lowered = {email.strip().lower() for email in emails if email and email.strip()}
+        return self.exclude(email="").alias(email_lower=Lower("email")).filter(email_lower__in=lowered)
+
+
+class UserManager(DjangoUserManager.from_queryset(UserQuerySet)):
+    pass
@@ -10,6 +10,10 @@ if TYPE_CHECKING:
     from .models import User
 
 
+# Fields get_display_name() reads; saving any of them refreshes display_name.
+DISPLAY_NAME_SOURCES = frozenset({"first_name", "last_name", "username", "email"})
+
+
 def get_display_name(user: User) -> str:
     """Return the best display name for the user."""
     if user.first_name and user.last_name:
@@ -17,3 +21,69 @@ def get_display_name(user: User) -> str:
     if user.first_name:
         return user.first_name
     return user.username or user.email
+
+
+def display_name_expression():
+    """``get_display_name`` as SQL, to backfill ``display_name`` in bulk.
+
+    Keep the two in sync.
+    """
+    from django.db.models import Case, CharField, Q, Value, When
+    from django.db.models.functions import Concat
+
+    return Case(
+        When(~Q(first_name="") & ~Q(last_name=""), then=Concat("first_name", Value(" "), "last_name")),
+        When(~Q(first_name=""), then="first_name"),
+        When(~Q(username=""), then="username"),
+        default="email",
+        output_field=CharField(),
+    )
+
+
+# Columns users can be exported with; never the password hash.
+EXPORT_FIELDS = (
+    "id", "username", "email", "first_name", "last_name", "bio",
+    "is_active", "is_staff", "date_joined", "last_login", "updated_at",
+)
+
+
+def export_users(fields=None, format: str = "csv", compress: bool = False,
+                 chunk_size: int = 2000):
+    """Yield every user's ``fields`` as CSV/NDJSON bytes, streaming from the database.
+
+    Raises ``ValueError`` for fields outside ``EXPORT_FIELDS`` or unknown formats.
+    """
+    from onlydjango.exports import export, select_fields
+
+    from .models import User
+
+    fields = select_fields(fields, EXPORT_FIELDS)
+    return export(User.objects.order_by("pk"), fields, format, compress, chunk_size)
+
+
+def backfill_display_names(batch_size: int = 5000):
+    """Recompute ``display_name`` in SQL, one primary-key range per statement.
+
+    Only rows whose stored name differs are written. Yields the number of
+    rows updated per batch.
+    """
+    from django.db.models import F, Q
+
+    from onlydjango.cache import dependencies
+
+    from .models import User
+
+    expression = display_name_expression()
+    last_pk = 0
+    while True:
+        pks = list(User.objects.filter(pk__gt=last_pk).order_by("pk")
+                   .values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        stale = (User.objects.filter(pk__gt=last_pk, pk__lte=pks[-1])
+                 .alias(computed=expression).filter(~Q(display_name=F("computed"))))
+        updated = stale.update(display_name=expression)
+        if updated:
+            dependencies.changed_rows(User, pks)
+        yield updated
+        last_pk = pks[-1]
@@ -1,5 +1,10 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .managers import UserManager
+from .methods import DISPLAY_NAME_SOURCES, get_display_name
 
 
 class User(AbstractUser):
@@ -12,14 +17,39 @@ class User(AbstractUser):
     # Profile fields
     bio = models.TextField(blank=True)
     avatar = models.ImageField(upload_to="avatars/", blank=True)
+    # get_display_name() stored on save, so lists needn't load the name columns.
+    display_name = models.CharField(max_length=301, blank=True, editable=False)
     
     # Timestamps
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserManager()
+
     class Meta:
         db_table = "users"
         verbose_name = "user"
         verbose_name_plural = "users"
+        constraints = (
+            # Logins look users up by email; User.objects.by_email() uses this.
+            models.UniqueConstraint(
+                Lower("email"),
+                name="users_email_ci_unique",
+                condition=~Q(email=""),
+                violation_error_message="A user with that email address already exists.",
+            ),
+        )
 
     def __str__(self) -> str:
         return self.email or self.username
+
+    def save(self, *args, **kwargs):
+        self.display_name = get_display_name(self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and DISPLAY_NAME_SOURCES.intersection(update_fields):
+            kwargs["update_fields"] = {*update_fields, "display_name"}
+        super().save(*args, **kwargs)
+
+    @property
+    def name(self) -> str:
+        """Display name for templates, from the stored column."""
+        return self.display_name or self.username or self.email
@@ -0,0 +1,56 @@
+"""Ranked user search: full-text plus trigram on PostgreSQL, icontains elsewhere.
+
+On PostgreSQL (see migrations ``0004_user_search`` and
+``0005_user_search_indexes``) a row matches when
+
+- the generated ``search_vector`` (names weighted A, username and email B,
+  bio C) matches the query as words, through ``users_search_vector_gin``, or
+- the query is trigram-similar to ``email`` or ``display_name`` (typos,
+  partial addresses), through ``users_email_trgm`` and
+  ``users_display_name_trgm``,
+
+and rows are ranked by ``ts_rank_cd`` plus the best trigram similarity.
+SQLite has none of this, so there every word of the query must be an
+``icontains`` match in one of the same columns, and names rank highest.
+"""
+
+from django.db import connections
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+# Both configurations: 'simple' for names and emails, 'english' for the
+# stemmed bio.
+_TSQUERY = "(websearch_to_tsquery('simple', %s) || websearch_to_tsquery('english', %s))"
+
+PG_MATCH = (
+    f'"users"."search_vector" @@ {_TSQUERY}'
+    ' OR "users"."email" %% %s OR "users"."display_name" %% %s'
+)
+PG_RANK = (
+    f'ts_rank_cd("users"."search_vector", {_TSQUERY})'
+    ' + greatest(similarity("users"."email", %s), similarity("users"."display_name", %s))'
+)
+
+
+def search(queryset, query: str):
+    """Users of ``queryset`` matching ``query``, best first, with a ``rank``."""
+    query = query.strip()
+    if not query:
+        return queryset.none()
+    if connections[queryset.db].vendor == "postgresql":
+        params = [query] * 4
+        return (
+            queryset
+            .filter(RawSQL(PG_MATCH, params, output_field=BooleanField()))
+            .annotate(rank=RawSQL(PG_RANK, params, output_field=FloatField()))
+            .order_by("-rank", "pk")
+        )
+    # Every word must appear in some column; words found in names rank higher.
+    condition, rank = Q(), Value(0.0)
+    for word in query.split():
+        names = Q(first_name__icontains=word) | Q(last_name__icontains=word)
+        account = Q(email__icontains=word) | Q(username__icontains=word)
+        condition &= names | account | Q(bio__icontains=word)
+        rank += Case(When(names, then=Value(2.0)), When(account, then=Value(1.0)),
+                     default=Value(0.5), output_field=FloatField())
+    return queryset.filter(condition).annotate(rank=rank).order_by("-rank", "pk")
@@ -1,12 +1,14 @@
 """Background tasks using Huey.
 
-In DEBUG mode, tasks run immediately (synchronously) within the request.
-In production, tasks are queued to Redis and processed by Huey workers.
+Where tasks run follows settings.TASKS_MODE:
+- "inline" (dev default): immediately, within the request.
+- "threaded": on an in-process thread pool, no Redis needed.
+- "huey" (production default): queued to Redis and processed by Huey workers.
 
 Usage:
     from apps.core.tasks import send_welcome_email
     
-    # Call the task - behavior depends on DEBUG setting
+    # Call the task - behavior depends on TASKS_MODE
     send_welcome_email(user_id=123)
 
 Running Huey workers (production):
@@ -14,92 +16,119 @@ Running Huey workers (production):
 """
 
 import logging
-from functools import wraps
 
-from django.conf import settings
+from django.core.mail import EmailMessage
+from huey import crontab
+
+from onlydjango import maintenance
+from onlydjango.mail import send_bulk
+from onlydjango.tasks import periodic_task, task
+from onlydjango.tasks.fanout import fan_out
 
 logger = logging.getLogger(__name__)
 
 
 # =============================================================================
-# TASK DECORATOR - DEBUG-AWARE
+# TASKS
 # =============================================================================
 #
-# In DEBUG mode: Tasks run synchronously (immediately)
-# In production: Tasks are queued to Redis via Huey
-# =============================================================================
-
-if settings.DEBUG:
-    def task():
-        """Synchronous task wrapper for DEBUG mode.
-        
-        Tasks execute immediately within the request cycle.
-        Useful for development and testing without running Huey workers.
-        """
-        def decorator(func):
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                return func(*args, **kwargs)
-            return wrapper
-        return decorator
-    
-    def periodic_task(cron):
-        """No-op periodic task decorator for DEBUG mode.
-        
-        Periodic tasks don't auto-run in DEBUG mode.
-        Trigger them manually via management commands.
-        """
-        def decorator(func):
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                return func(*args, **kwargs)
-            return wrapper
-        return decorator
-else:
-    from huey.contrib.djhuey import db_task as task
-    from huey.contrib.djhuey import db_periodic_task as periodic_task
-
-
-# =============================================================================
-# TASKS
+# Batched tasks (``@task(batch=...)``) coalesce calls: each call buffers its
+# keyword arguments and the body receives a list of them, one message per
+# batch instead of one per call.
+#
+# Deduplicated tasks (``@task(dedup=True)``) drop calls identical to one that
+# is still waiting in the queue.
+#
+# On-commit tasks (``@task(on_commit=True)``) called inside a transaction are
+# enqueued only after it commits, so workers never see rows that don't exist.
+#
+# Rate-limited tasks (``@task(rate=..., max_concurrency=...)``) are rescheduled
+# with backoff instead of running over the limit, across all workers.
+#
+# Results expire after ``result_ttl`` seconds (a day by default) and can be
+# read back in bulk with ``get_results``; ``discard_result=True`` skips
+# storing them when nobody reads them.
 # =============================================================================
 
 
-@task()
-def send_welcome_email(user_id: int) -> bool:
-    """Send welcome email to a newly registered user.
+# Each run sends one batch over SMTP (smtp.gmail.com in production); keep the
+# batch rate and parallel connections under the provider's sending limits.
+@task(batch=500, on_commit=True, rate=1, max_concurrency=2, discard_result=True)
+def send_welcome_email(calls: list[dict]) -> int:
+    """Send welcome emails to newly registered users.
     
     Args:
-        user_id: The ID of the user to send the email to
+        calls: Buffered calls, each with a ``user_id`` key
         
     Returns:
-        True if email was sent successfully, False otherwise
+        Number of emails sent
     """
     from apps.core.models import User
     
-    try:
-        user = User.objects.get(id=user_id)
-        
-        # TODO: Implement actual email sending
-        # send_mail(
-        #     subject="Welcome!",
-        #     message=f"Hi {user.first_name}, welcome!",
-        #     from_email=settings.DEFAULT_FROM_EMAIL,
-        #     recipient_list=[user.email],
-        # )
-        
-        logger.info(f"Welcome email sent to user {user_id} ({user.email})")
-        return True
+    user_ids = {call["user_id"] for call in calls}
+    users = User.objects.filter(id__in=user_ids).only("id", "email", "first_name")
+    
+    messages = [
+        EmailMessage(
+            subject="Welcome!",
+            body=f"Hi {user.first_name or user.email}, welcome!",
+            to=[user.email],
+        )
+        for user in users
+        if user.email
+    ]
+    # One SMTP connection for the whole batch (kept open across runs with
+    # the pooled backend).
+    sent = send_bulk(messages)
+    logger.info(f"Welcome emails sent: {sent} of {len(messages)}")
+
+    missing = user_ids - {user.id for user in users}
+    if missing:
+        logger.error(f"Cannot send welcome email: Users {sorted(missing)} not found")
+    return sent
+
+
+@task(batch=500, on_commit=True, rate=1, max_concurrency=2, discard_result=True)
+def send_account_invites(calls: list[dict]) -> int:
+    """Email imported users a link to set their password.
+    
+    Args:
+        calls: Buffered calls, each with a ``user_id`` key
         
-    except User.DoesNotExist:
-        logger.error(f"Cannot send welcome email: User {user_id} not found")
-        return False
-    except Exception as e:
-        logger.exception(f"Failed to send welcome email to user {user_id}: {e}")
-        return False
-
+    Returns:
+        Number of emails sent
+    """
+    from allauth.account.forms import default_token_generator
+    from allauth.account.utils import user_pk_to_url_str
+    from allauth.utils import build_absolute_uri
+    from django.urls import reverse
 
-@task()
+    from apps.core.models import User
+    
+    user_ids = {call["user_id"] for call in calls}
+    users = User.objects.filter(id__in=user_ids).only("id", "email", "first_name", "password", "last_login")
+    
+    messages = []
+    for user in users:
+        if not user.email:
+            continue
+        path = reverse("account_reset_password_from_key", kwargs={
+            "uidb36": user_pk_to_url_str(user),
+            "key": default_token_generator.make_token(user),
+        })
+        messages.append(EmailMessage(
+            subject="Your new account",
+            body=f"Hi {user.first_name or user.email}, set your password here: "
+                 f"{build_absolute_uri(None, path)}",
+            to=[user.email],
+        ))
+    sent = send_bulk(messages)
+    logger.info(f"Account invites sent: {sent} of {len(messages)}")
+    return sent
+
+
+# Not on_commit: callers read the Result, which a held call doesn't have yet.
+@task(dedup=True, result_ttl=3600)
 def process_user_action(user_id: int, action: str, metadata: dict | None = None) -> dict:
     """Process a user action asynchronously.
     
@@ -132,12 +161,75 @@ def process_user_action(user_id: int, action: str, metadata: dict | None = None)
         return {"user_id": user_id, "action": action, "status": "error"}
 
 
+@task(result_ttl=3600)
+def process_user_actions(user_ids: list[int], action: str, metadata: dict | None = None) -> int:
+    """Process an action for a chunk of users with a single query.
+    
+    Args:
+        user_ids: Chunk of user IDs, as dispatched by fan_out_user_action
+        action: Type of action (e.g., 'profile_update', 'settings_change')
+        metadata: Additional data about the action
+        
+    Returns:
+        Number of users processed
+    """
+    from apps.core.models import User
+    
+    processed = User.objects.filter(id__in=user_ids).count()
+    logger.info(f"Processed action '{action}' for {processed} users")
+    return processed
+
+
+def fan_out_user_action(action: str, metadata: dict | None = None, chunk_size: int = 1000,
+                        max_in_flight: int = 8, restart: bool = False) -> int:
+    """Run process_user_actions over every user in resumable keyset chunks.
+    
+    Re-running after an interruption resumes after the last finished chunk
+    unless restart is True.
+    
+    Returns:
+        Number of users dispatched by this run
+    """
+    from apps.core.models import User
+    
+    return fan_out(
+        User.objects.all(),
+        process_user_actions,
+        name=f"process_user_actions:{action}",
+        chunk_size=chunk_size,
+        max_in_flight=max_in_flight,
+        restart=restart,
+        action=action,
+        metadata=metadata,
+    )
+
+
+@task(discard_result=True)
+def refresh_cached_value(key: str, compute: str, args: list, ttl: int, stale: int,
+                         token: str, using: str = "default") -> None:
+    """Recompute a stale ``get_or_compute`` value off the request path.
+
+    Args:
+        key: The get_or_compute key
+        compute: Dotted path of the compute function
+        args: Its positional arguments
+        ttl, stale: get_or_compute's timeout and stale (``timeout`` is
+            taken by Huey's own call options)
+        token: The recompute lock taken by the caller, released when done
+        using: Cache alias
+    """
+    from onlydjango.cache.compute import refresh
+
+    refresh(key, compute, args, ttl, stale, token, using)
+
+
 # =============================================================================
-# PERIODIC TASKS (production only)
+# PERIODIC TASKS
 # =============================================================================
 #
-# In DEBUG mode, trigger these manually via management commands.
-# In production, Huey runs them on schedule.
+# In "inline" mode, trigger these manually via management commands
+# (``daily_cleanup.call_local()``). In "threaded" and "huey" modes they run
+# on schedule.
 #
 # Schedule examples:
 #   crontab(minute='0', hour='*')     - Every hour
@@ -145,18 +237,17 @@ def process_user_action(user_id: int, action: str, metadata: dict | None = None)
 #   crontab(minute='0', hour='0')     - Daily at midnight
 # =============================================================================
 
-if not settings.DEBUG:
-    from huey import crontab
-    
-    @periodic_task(crontab(minute="0", hour="0"))
-    def daily_cleanup() -> int:
-        """Run daily cleanup tasks at midnight."""
-        cleaned = 0
-        logger.info(f"Daily cleanup completed: {cleaned} items removed")
-        return cleaned
-else:
-    def daily_cleanup() -> int:
-        """Run daily cleanup tasks (manual trigger in DEBUG)."""
-        cleaned = 0
-        logger.info(f"Daily cleanup completed: {cleaned} items removed")
-        return cleaned
+
+@periodic_task(crontab(minute="0", hour="0"))
+def daily_cleanup() -> int:
+    """Run the registered maintenance steps at midnight, time-boxed.
+
+    Steps live in each app's ``maintenance.py`` (see ``onlydjango.maintenance``)
+    and delete in bounded batches until done or the budget is spent; whatever
+    is left is picked up the next night.
+    """
+    reports = maintenance.run()
+    cleaned = sum(report.rows for report in reports)
+    unfinished = [report.name for report in reports if not report.complete]
+    logger.info(f"Daily cleanup completed: {cleaned} items removed, unfinished: {unfinished or 'none'}")
+    return cleaned
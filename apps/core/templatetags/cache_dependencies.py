@@ -0,0 +1,15 @@
+from django import template
+
+from onlydjango.cache.dependencies import depends_on
+
+register = template.Library()
+
+
+@register.simple_tag
+def dependency_version(*targets):
+    """Version of models ("app.Model") and rows, for ``{% cache %}`` keys.
+
+    {% dependency_version "core.User" request.user as version %}
+    {% cache 86400 sidebar version %}...{% endcache %}
+    """
+    return depends_on(*targets).version()
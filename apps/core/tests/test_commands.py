@@ -0,0 +1,66 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.core.tasks import send_account_invites
+
+
+class ExportUsersCommandTests(TestCase):
+    def test_writes_csv_file(self):
+        get_user_model().objects.create_user("ada", "ada@example.com")
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "users.csv"
+            call_command("export_users", fields="username,email", output=str(path), stderr=StringIO())
+            rows = list(csv.reader(path.open()))
+        self.assertEqual(rows, [["username", "email"], ["ada", "ada@example.com"]])
+
+    def test_rejects_unknown_fields(self):
+        with self.assertRaisesMessage(CommandError, "password"):
+            call_command("export_users", fields="password")
+
+
+class ImportUsersCommandTests(TestCase):
+    def write(self, directory, name, content):
+        path = Path(directory) / name
+        path.write_text(content)
+        return str(path)
+
+    def test_imports_csv_and_reports_rate(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write(directory, "users.csv", "email,first_name\nada@example.com,Ada\nbad,x\n")
+            call_command("import_users", path, workers=1, stdout=out, stderr=StringIO())
+        self.assertIn("1 created", out.getvalue())
+        self.assertIn("1 invalid", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+        self.assertEqual(get_user_model().objects.get().first_name, "Ada")
+
+    def test_invites_created_users(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write(directory, "users.ndjson", '{"email": "ada@example.com"}\n')
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("import_users", path, no_passwords=True, notify="invite", stdout=StringIO())
+            send_account_invites.flush()
+        self.assertEqual(mail.outbox[0].to, ["ada@example.com"])
+        self.assertIn("/accounts/password/reset/key/", mail.outbox[0].body)
+
+    def test_stops_on_malformed_ndjson(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write(directory, "users.ndjson", "{nope\n")
+            with self.assertRaisesMessage(CommandError, "line 1"):
+                call_command("import_users", path, stdout=StringIO())
+
+
+class BackfillDisplayNamesCommandTests(TestCase):
+    def test_fills_missing_names(self):
+        get_user_model().objects.bulk_create([get_user_model()(username="ada", first_name="Ada")])
+        out = StringIO()
+        call_command("backfill_display_names", stdout=out)
+        self.assertIn("Updated 1 display names", out.getvalue())
+        self.assertEqual(get_user_model().objects.get().display_name, "Ada")
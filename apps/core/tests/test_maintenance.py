@@ -0,0 +1,43 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.maintenance import orphaned_avatars
+from apps.core.models import User
+from apps.core.tasks import daily_cleanup
+
+
+class DailyCleanupTests(TestCase):
+    def test_removes_expired_sessions_only(self):
+        now = timezone.now()
+        Session.objects.create(session_key="old", session_data="", expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key="live", session_data="", expire_date=now + timedelta(days=1))
+
+        self.assertEqual(daily_cleanup.call_local(), 1)
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), ["live"])
+
+    def test_orphaned_avatars_keep_referenced_and_recent_files(self):
+        kept = default_storage.save("avatars/kept.png", ContentFile(b"x"))
+        orphan = default_storage.save("avatars/orphan.png", ContentFile(b"x"))
+        User.objects.create_user(username="alice", avatar=kept)
+
+        self.assertEqual(sum(orphaned_avatars(batch_size=100)), 0)  # still in grace period
+
+        later = timezone.now() + timedelta(days=2)
+        with mock.patch("apps.core.maintenance.timezone.now", return_value=later):
+            self.assertEqual(sum(orphaned_avatars(batch_size=100)), 1)
+        self.assertTrue(default_storage.exists(kept))
+        self.assertFalse(default_storage.exists(orphan))
+
+    def test_command_reports_each_step(self):
+        out = StringIO()
+        call_command("maintenance", stdout=out)
+        self.assertIn("sessions.expired", out.getvalue())
+        self.assertIn("core.orphaned_avatars", out.getvalue())
@@ -1,5 +1,14 @@
+from itertools import chain
+from unittest import mock, skipUnless
+
+from django.contrib.auth import authenticate
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
 
+from apps.core.models import User
+from apps.core.models.user.importing import import_users
+from apps.core.models.user.methods import backfill_display_names, get_display_name
+
 
 class ModelTestCase(TestCase):
     """Base test case for models"""
@@ -8,3 +17,135 @@ class ModelTestCase(TestCase):
         pass
     
     # Add your model tests here
+
+
+class ImportUsersTests(ModelTestCase):
+    def setUp(self):
+        self.existing = User.objects.create_user("old", "Ada@Example.com", first_name="Old")
+
+    def test_creates_skips_and_reports_invalid_rows(self):
+        rows = [
+            {"email": "ada@example.com", "first_name": "Ada"},
+            {"email": "grace@example.com", "password": "s3cret!"},
+            {"email": "not-an-email"},
+            {"email": "GRACE@example.com"},
+            {"email": "linus@example.com", "username": "old"},
+            {"email": "ken@example.com"},
+        ]
+        seen = []
+        report = import_users(rows, batch_size=4, on_batch=lambda report, ids: seen.append(ids))
+
+        self.assertEqual((report.rows, report.created, report.skipped, report.invalid), (6, 2, 1, 3))
+        self.assertEqual(len(seen), 2)
+        grace = User.objects.get(email="grace@example.com")
+        self.assertEqual(grace.username, "grace@example.com")
+        self.assertTrue(grace.check_password("s3cret!"))
+        self.assertFalse(User.objects.get(email="ken@example.com").has_usable_password())
+        self.assertEqual(sorted(chain.from_iterable(seen)), sorted(User.objects.exclude(pk=self.existing.pk)
+                                                      .values_list("pk", flat=True)))
+
+    def test_update_on_conflict(self):
+        report = import_users([{"email": "ada@example.com", "first_name": "Ada"}], on_conflict="update")
+        self.assertEqual((report.created, report.updated), (0, 1))
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.first_name, "Ada")
+
+    def test_mid_batch_conflict_rejects_only_that_row(self):
+        rows = [{"email": "grace@example.com"}, {"email": "ADA@example.com"}, {"email": "ken@example.com"}]
+        # As if ada registered between the pre-check and the insert.
+        with mock.patch.object(User.objects, "by_emails", return_value=User.objects.none()):
+            report = import_users(rows)
+
+        self.assertEqual((report.created, report.invalid), (2, 1))
+        self.assertTrue(report.errors[0].startswith("row 2: "))
+        self.assertEqual(User.objects.filter(email__in=["grace@example.com", "ken@example.com"]).count(), 2)
+
+    def test_hashes_on_a_process_pool(self):
+        rows = [{"email": f"user{i}@example.com", "password": f"pw-{i}"} for i in range(4)]
+        import_users(rows, workers=2)
+        self.assertTrue(User.objects.get(email="user3@example.com").check_password("pw-3"))
+
+    def test_no_passwords(self):
+        import_users([{"email": "grace@example.com", "password": "s3cret!"}], hash_passwords=False)
+        self.assertFalse(User.objects.get(email="grace@example.com").has_usable_password())
+
+
+class UserEmailLookupTests(ModelTestCase):
+    def setUp(self):
+        self.ada = User.objects.create_user("ada", "Ada@Example.com", password="s3cret!")
+
+    def test_email_is_unique_case_insensitively_except_blank(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user("ada2", "ada@example.COM")
+        User.objects.create_user("blank1")
+        User.objects.create_user("blank2")
+
+    def test_by_email_uses_the_index(self):
+        self.assertEqual(list(User.objects.by_email(" ADA@example.com ")), [self.ada])
+        self.assertFalse(User.objects.by_email("").exists())
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        self.assertIn("users_email_ci_unique", User.objects.by_email("ada@example.com").explain())
+
+    def test_login_by_email_in_any_case(self):
+        self.assertEqual(authenticate(None, email="ADA@example.com", password="s3cret!"), self.ada)
+        self.assertIsNone(authenticate(None, email="ADA@example.com", password="wrong"))
+        self.assertIsNone(authenticate(None, email="nobody@example.com", password="s3cret!"))
+
+
+class DisplayNameTests(ModelTestCase):
+    def test_maintained_on_save(self):
+        user = User.objects.create_user("ada", "ada@example.com", first_name="Ada")
+        self.assertEqual(user.display_name, "Ada")
+        user.last_name = "Lovelace"
+        user.save(update_fields=["last_name"])
+        user.refresh_from_db()
+        self.assertEqual(user.display_name, "Ada Lovelace")
+
+    def test_backfill_matches_get_display_name(self):
+        User.objects.bulk_create([
+            User(username="ada", first_name="Ada", last_name="Lovelace"),
+            User(username="grace", first_name="Grace"),
+            User(username="linus", last_name="Torvalds"),
+            User(username="", email="ken@example.com"),
+        ])
+        self.assertEqual(sum(backfill_display_names(batch_size=3)), 4)
+        for user in User.objects.all():
+            self.assertEqual(user.display_name, get_display_name(user))
+        self.assertEqual(sum(backfill_display_names()), 0)
+
+    def test_for_list_loads_only_list_columns(self):
+        User.objects.create_user("ada", "ada@example.com", first_name="Ada", bio="x" * 10_000)
+        with self.assertNumQueries(1):
+            names = [user.name for user in User.objects.for_list()]
+        self.assertEqual(names, ["Ada"])
+        self.assertIn("bio", User.objects.for_list().get().get_deferred_fields())
+
+
+class UserSearchTests(ModelTestCase):
+    def setUp(self):
+        self.ada = User.objects.create_user("ada", "ada@example.com", first_name="Ada", last_name="Lovelace")
+        self.grace = User.objects.create_user("grace", "grace@navy.mil", first_name="Grace",
+                                              bio="Wrote the first compiler; loves running")
+        self.lovelace_fan = User.objects.create_user("fan", "fan@example.com", bio="Lovelace fan")
+
+    def test_matches_names_emails_and_bio_best_first(self):
+        self.assertEqual(list(User.objects.search("lovelace")), [self.ada, self.lovelace_fan])
+        self.assertEqual(list(User.objects.search("navy.mil")), [self.grace])
+        self.assertEqual(list(User.objects.search("ada lovelace")), [self.ada])
+        self.assertFalse(User.objects.search("  ").exists())
+
+    def test_combines_with_for_list(self):
+        with self.assertNumQueries(1):
+            names = [user.name for user in User.objects.for_list().search("grace")]
+        self.assertEqual(names, ["Grace"])
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL full-text and trigram search")
+    def test_postgresql_stemming_typos_and_indexes(self):
+        self.assertEqual(list(User.objects.search("runs")), [self.grace])
+        self.assertIn(self.ada, User.objects.search("ada@exmple.com"))
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = User.objects.search("lovelace").explain()
+        self.assertIn("users_search_vector_gin", plan)
@@ -0,0 +1,49 @@
+from django.core import mail
+from django.db import transaction
+from django.test import TestCase
+
+from apps.core.models import User
+from apps.core.tasks import fan_out_user_action, process_user_action, send_welcome_email
+
+
+class SendWelcomeEmailTests(TestCase):
+    def test_sends_one_email_per_existing_user(self):
+        alice = User.objects.create_user(username="alice", email="alice@example.com")
+        bob = User.objects.create_user(username="bob", email="bob@example.com")
+        calls = [{"user_id": alice.id}, {"user_id": bob.id}, {"user_id": alice.id}, {"user_id": 0}]
+
+        with self.assertNumQueries(1):
+            sent = send_welcome_email.call_local(calls)
+
+        self.assertEqual(sent, 2)
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ["alice@example.com", "bob@example.com"])
+
+    def test_calls_wait_for_commit_then_buffer_until_flush(self):
+        user = User.objects.create_user(username="carol", email="carol@example.com")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            send_welcome_email(user_id=user.id)
+            self.assertEqual(send_welcome_email.pending, 0)
+
+        self.assertEqual(send_welcome_email.pending, 1)
+        self.assertEqual(send_welcome_email.flush(), 1)
+        self.assertEqual(send_welcome_email.pending, 0)
+
+
+class ProcessUserActionTests(TestCase):
+    def test_callers_inside_a_transaction_get_a_result(self):
+        user = User.objects.create_user(username="dave", email="dave@example.com")
+
+        with transaction.atomic():
+            result = process_user_action(user.id, "profile_update")
+
+        self.assertIsNotNone(result)
+        self.assertEqual(result()["user_id"], user.id)
+
+
+class FanOutUserActionTests(TestCase):
+    def test_dispatches_every_user(self):
+        for i in range(5):
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com")
+
+        self.assertEqual(fan_out_user_action("profile_update", chunk_size=2), 5)
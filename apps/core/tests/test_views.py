@@ -1,11 +1,48 @@
+import gzip
+import json
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 
+from onlydjango.db.queries import QueryBudgetMixin
+
+
+class ViewTestCase(QueryBudgetMixin, TestCase):
+    """Base test case for views.
 
-class ViewTestCase(TestCase):
-    """Base test case for views"""
+    ``with self.assertQueryBudget(max_queries=5, max_duplicates=0):`` fails the
+    test when the block runs more queries, or repeats one (N+1).
+    """
     
     def setUp(self):
         pass
     
     # Add your view tests here
+
+
+class UserExportViewTests(ViewTestCase):
+    def setUp(self):
+        self.staff = get_user_model().objects.create_user("staff", "staff@example.com", is_staff=True)
+        self.url = reverse("core:user_export")
+
+    def test_requires_staff(self):
+        self.client.force_login(get_user_model().objects.create_user("member"))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_streams_selected_fields_as_ndjson(self):
+        self.client.force_login(self.staff)
+        with self.assertQueryBudget(max_queries=5):
+            response = self.client.get(self.url, {"format": "ndjson", "fields": "id,email"})
+            body = b"".join(response.streaming_content)
+        self.assertEqual(json.loads(body), {"id": self.staff.pk, "email": "staff@example.com"})
+
+    def test_gzip_csv(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, {"fields": "username", "gzip": "1"})
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), b"username\r\nstaff\r\n")
+
+    def test_unknown_field_is_a_bad_request(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(self.url, {"fields": "password"}).status_code, 400)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .views import UserExportView
+
+app_name = "core"
+
+urlpatterns = [
+    path("users/export/", UserExportView.as_view(), name="user_export"),
+]
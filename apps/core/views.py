@@ -1,3 +1,27 @@
-from django.shortcuts import render
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import HttpResponseBadRequest
+from django.views import View
 
-# Create your views here.
+from onlydjango.exports import streaming_response
+
+from .models.user.methods import export_users
+
+
+class UserExportView(UserPassesTestMixin, View):
+    """Stream all users as CSV or NDJSON, for staff.
+
+    Query parameters: ``format`` (csv, ndjson), ``fields`` (comma separated,
+    default all of ``EXPORT_FIELDS``) and ``gzip=1``.
+    """
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request):
+        format = request.GET.get("format", "csv")
+        compress = request.GET.get("gzip") in ("1", "true")
+        try:
+            chunks = export_users(request.GET.get("fields"), format, compress)
+        except ValueError as exc:
+            return HttpResponseBadRequest(str(exc))
+        return streaming_response(chunks, format, "users", compress)
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class OnlyDjangoConfig(AppConfig):
+    name = "onlydjango"
+
+    def ready(self):
+        # Imported for their receivers and checks: the global_settings system
+        # check, and lifting the statement timeout while migrate runs.
+        from .cache.generations import track
+        from .db import timeouts  # noqa: F401
+        from .helpers import onlydjango_globals  # noqa: F401
+
+        # Bump cache dependencies on writes to the declared models.
+        track(*getattr(settings, "CACHE_DEPENDENCY_MODELS", ()))
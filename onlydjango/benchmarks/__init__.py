@@ -0,0 +1,49 @@
+"""Benchmarks run with ``manage.py benchmark <name>``.
+
+Each benchmark module exposes ``run(size, write)`` where ``size`` is the number
+of rows to generate and ``write`` prints one line of the report. Benchmarks run
+inside a transaction that is rolled back afterwards, so generated rows never
+persist.
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+
+BENCHMARKS = {
+    "email_pool": "onlydjango.benchmarks.email_pool",
+    "global_settings": "onlydjango.benchmarks.global_settings",
+    "login_lookup": "onlydjango.benchmarks.login_lookup",
+    "pagination": "onlydjango.benchmarks.pagination",
+    "task_batching": "onlydjango.benchmarks.task_batching",
+    "user_search": "onlydjango.benchmarks.user_search",
+}
+
+
+class Timer:
+    elapsed = 0.0
+
+
+@contextmanager
+def timed():
+    """Measure wall-clock time of a block into ``Timer.elapsed`` (seconds)."""
+    timer = Timer()
+    start = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.elapsed = time.perf_counter() - start
+
+
+def create_users(size: int, batch_size: int = 5000) -> list[int]:
+    """Bulk insert ``size`` throwaway users and return their ids."""
+    User = get_user_model()
+    ids = []
+    for offset in range(0, size, batch_size):
+        users = [
+            User(username=f"bench-{i}", email=f"bench-{i}@example.com")
+            for i in range(offset, min(offset + batch_size, size))
+        ]
+        ids.extend(user.pk for user in User.objects.bulk_create(users))
+    return ids
@@ -0,0 +1,44 @@
+"""Per-message SMTP connections vs a pooled connection.
+
+Sends messages to a local SMTP stand-in that delays each new connection by
+50ms, roughly a TLS handshake plus AUTH against a real provider, and reports
+messages/s and connections opened. The per-message variant sends at most 200
+messages to keep the run short.
+"""
+
+from django.core.mail import EmailMessage
+from django.core.mail.backends.smtp import EmailBackend
+
+from onlydjango.mail.backends import PooledEmailBackend, close_connections
+
+from . import timed
+from .smtp import LocalSMTPServer
+
+CONNECT_DELAY = 0.05
+
+
+def _messages(count: int) -> list[EmailMessage]:
+    return [
+        EmailMessage("Welcome", "Hello!", "noreply@example.com", [f"bench-{i}@example.com"])
+        for i in range(count)
+    ]
+
+
+def run(size: int, write) -> None:
+    write(f"{'variant':<12} {'messages':>9} {'msgs/s':>10} {'connections':>12}")
+    with LocalSMTPServer(connect_delay=CONNECT_DELAY) as server:
+        per_message = _messages(min(size, 200))
+        with timed() as elapsed:
+            for message in per_message:
+                EmailBackend(host=server.host, port=server.port).send_messages([message])
+        write(f"{'per-message':<12} {len(per_message):>9} "
+              f"{len(per_message) / elapsed.elapsed:>10,.0f} {server.connections:>12}")
+
+        server.connections = 0
+        pooled = _messages(size)
+        with timed() as elapsed:
+            backend = PooledEmailBackend(host=server.host, port=server.port)
+            for start in range(0, size, 100):
+                backend.send_messages(pooled[start:start + 100])
+        close_connections()
+        write(f"{'pooled':<12} {size:>9} {size / elapsed.elapsed:>10,.0f} {server.connections:>12}")
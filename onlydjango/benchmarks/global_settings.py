@@ -0,0 +1,54 @@
+"""Per-render cost of the ``global_settings`` context processor.
+
+Calls the processor ``size`` times and renders a template that doesn't use
+``og_url`` (most partials) ``size`` times through ``RequestContext``, with
+the original implementation (validate and read all 12 settings, build
+``og_url`` on every call) and the current one (frozen static part, lazy
+``og_url``). No rows are generated.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.template import Engine, RequestContext
+from django.test import RequestFactory, override_settings
+
+from onlydjango.helpers.onlydjango_globals import REQUIRED_SETTINGS, global_settings
+
+from . import timed
+
+
+def _previous(request):
+    context = {}
+    for setting_name, key in REQUIRED_SETTINGS.items():
+        if not hasattr(settings, setting_name):
+            raise ImproperlyConfigured(f"Missing setting `{setting_name}`")
+        context[key] = getattr(settings, setting_name)
+    context['og_url'] = request.build_absolute_uri()
+    return context
+
+
+def _per_call_us(processor, request, size: int) -> float:
+    with timed() as elapsed:
+        for _ in range(size):
+            processor(request)
+    return elapsed.elapsed / size * 1_000_000
+
+
+def _per_render_us(processor, request, size: int) -> float:
+    template = Engine(context_processors=[]).from_string("<title>{{ site_name }}</title>")
+    with timed() as elapsed:
+        for _ in range(size):
+            context = RequestContext(request, {})
+            context.update(processor(request))
+            template.render(context)
+    return elapsed.elapsed / size * 1_000_000
+
+
+def run(size: int, write) -> None:
+    request = RequestFactory().get("/some/page/?q=1", HTTP_HOST="benchmark.local")
+    write(f"{'variant':<10} {'call us':>9} {'render us':>10}")
+    for name, processor in (("before", _previous), ("after", global_settings)):
+        with override_settings(ALLOWED_HOSTS=["benchmark.local"]):
+            processor(request)  # warm up the frozen context
+            write(f"{name:<10} {_per_call_us(processor, request, size):>9.2f}"
+                  f" {_per_render_us(processor, request, size):>10.2f}")
@@ -0,0 +1,47 @@
+"""Login lookup by email: allauth's query vs ``User.objects.by_email``.
+
+Generates ``size`` users (use ``--size 1000000`` for the production-scale
+numbers) and looks up 200 random addresses, in mixed case, both ways:
+
+- before: ``email = %s`` on ``users``, the query allauth runs on every login
+  when the address isn't verified. No index serves it.
+- after: ``lower(email) = %s``, served by ``users_email_ci_unique``.
+
+Reports p50/p95 latency and the plan of each query.
+"""
+
+import random
+import statistics
+
+from django.contrib.auth import get_user_model
+
+from . import create_users, timed
+
+LOOKUPS = 200
+
+
+def _latencies(lookup, emails) -> list[float]:
+    samples = []
+    for email in emails:
+        with timed() as elapsed:
+            list(lookup(email))
+        samples.append(elapsed.elapsed * 1000)
+    return samples
+
+
+def run(size: int, write) -> None:
+    User = get_user_model()
+    create_users(size)
+    emails = [f"Bench-{random.randrange(size)}@Example.com" for _ in range(LOOKUPS)]
+    variants = {
+        "before": lambda email: User.objects.filter(email=email.lower()),
+        "after": lambda email: User.objects.by_email(email),
+    }
+
+    write(f"{'variant':<8} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, lookup in variants.items():
+        samples = _latencies(lookup, emails)
+        p95 = statistics.quantiles(samples, n=20)[-1]
+        write(f"{name:<8} {statistics.median(samples):>8.3f} {p95:>8.3f}")
+    for name, lookup in variants.items():
+        write(f"{name} plan: {lookup(emails[0]).explain()}")
@@ -0,0 +1,57 @@
+"""Offset ``Paginator`` vs ``CursorPaginator`` deep into a listing.
+
+Generates ``size`` users and times fetching page 1, and page 1000 (or the
+last full page for smaller sizes), 20 rows per page, ordered by id. The
+offset variant includes the ``COUNT(*)`` Paginator runs for every page; the
+cursor variant starts from the previous page's cursor, as a "load more"
+click would. Reports the median of five runs.
+"""
+
+import statistics
+
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+
+from onlydjango.helpers.pagination import CursorPaginator
+
+from . import create_users, timed
+
+PER_PAGE = 20
+TARGET_PAGE = 1000
+RUNS = 5
+
+
+def _median_ms(fetch) -> float:
+    samples = []
+    for _ in range(RUNS):
+        with timed() as elapsed:
+            fetch()
+        samples.append(elapsed.elapsed * 1000)
+    return statistics.median(samples)
+
+
+def _cursor_before(paginator: CursorPaginator, number: int) -> str | None:
+    # Skip ahead with a single query to the row ending page ``number - 1``.
+    if number == 1:
+        return None
+    last = paginator.queryset[(number - 1) * PER_PAGE - 1]
+    return paginator.encode(paginator.values_of(last))
+
+
+def run(size: int, write) -> None:
+    User = get_user_model()
+    create_users(size)
+    queryset = User.objects.order_by("pk")
+    deep = max(1, min(TARGET_PAGE, size // PER_PAGE))
+
+    write(f"{'page':>6} {'offset ms':>10} {'cursor ms':>10} {'speedup':>8}")
+    for number in sorted({1, deep}):
+        offset_ms = _median_ms(
+            lambda: list(Paginator(queryset, PER_PAGE).page(number).object_list)
+        )
+        paginator = CursorPaginator(queryset, PER_PAGE)
+        cursor = _cursor_before(paginator, number)
+        cursor_ms = _median_ms(
+            lambda: list(CursorPaginator(queryset, PER_PAGE).page(cursor))
+        )
+        write(f"{number:>6} {offset_ms:>10.2f} {cursor_ms:>10.2f} {offset_ms / cursor_ms:>7.1f}x")
@@ -0,0 +1,64 @@
+"""Per-call vs batched task submission.
+
+Reports enqueue throughput, messages produced and worker queries per 1k calls
+for a ``User.objects.get`` task against its batched ``filter(id__in=...)``
+equivalent. Uses the Redis connection from ``settings.HUEY`` when it is a
+Redis Huey, otherwise an in-memory queue.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from huey import MemoryHuey
+from huey.contrib.djhuey import HUEY
+from huey.storage import RedisStorage
+
+from onlydjango.tasks import BatchedTask
+
+from . import create_users, timed
+
+
+def _bench_huey():
+    if not HUEY.immediate and isinstance(HUEY.storage, RedisStorage):
+        return type(HUEY)("benchmark", connection_pool=HUEY.storage.pool)
+    return MemoryHuey("benchmark")
+
+
+def _drain(huey) -> None:
+    while (message := huey.dequeue()) is not None:
+        huey.execute(message)
+
+
+def run(size: int, write) -> None:
+    User = get_user_model()
+    user_ids = create_users(size)
+    huey = _bench_huey()
+    huey.flush()
+
+    @huey.task(name="bench_per_call")
+    def per_call(user_id: int) -> None:
+        User.objects.get(id=user_id)
+
+    @huey.task(name="bench_batched")
+    def batched(calls: list[dict]) -> None:
+        list(User.objects.filter(id__in=[call["user_id"] for call in calls]))
+
+    variants = [
+        ("per-call", per_call),
+        ("batched", BatchedTask(batched, size=500, window=3600)),
+    ]
+    write(f"{'variant':<10} {'calls/s':>12} {'messages':>9} {'queries/1k':>11}")
+    for label, submit in variants:
+        with timed() as enqueue:
+            for user_id in user_ids:
+                submit(user_id=user_id)
+            if isinstance(submit, BatchedTask):
+                submit.flush()
+        messages = huey.pending_count()
+        with CaptureQueriesContext(connection) as queries:
+            _drain(huey)
+        write(
+            f"{label:<10} {size / enqueue.elapsed:>12,.0f} {messages:>9} "
+            f"{len(queries) * 1000 / size:>11.1f}"
+        )
+    huey.flush()
@@ -0,0 +1,73 @@
+"""``icontains`` scans vs ``User.objects.search``.
+
+Generates ``size`` users with names, emails and short bios (use ``--size
+1000000`` for the production-scale comparison) and times name, email and
+bio queries both ways, reporting the median of three runs and the matches
+found. On PostgreSQL ``search`` uses the full-text and trigram indexes; on
+other databases it falls back to ``icontains`` itself, so expect no gain.
+"""
+
+import random
+import statistics
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+
+from . import timed
+
+FIRST = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Frances", "Ken", "Linus", "Margaret"]
+LAST = ["Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Allen", "Thompson", "Torvalds"]
+WORDS = ["compilers", "databases", "gardening", "running", "painting", "chess", "music", "travel"]
+QUERIES = ["margaret hopper", "user-4242@example", "running chess"]
+RUNS = 3
+
+
+def _create(size: int, batch_size: int = 5000) -> None:
+    User = get_user_model()
+    for offset in range(0, size, batch_size):
+        users = []
+        for i in range(offset, min(offset + batch_size, size)):
+            first, last = random.choice(FIRST), random.choice(LAST)
+            users.append(User(
+                username=f"search-{i}",
+                email=f"user-{i}@example.com",
+                first_name=first,
+                last_name=last,
+                display_name=f"{first} {last}",
+                bio=" ".join(random.sample(WORDS, 3)),
+            ))
+        User.objects.bulk_create(users)
+
+
+def _icontains(queryset, query: str):
+    condition = Q()
+    for word in query.split():
+        condition &= (
+            Q(email__icontains=word) | Q(username__icontains=word) | Q(first_name__icontains=word)
+            | Q(last_name__icontains=word) | Q(bio__icontains=word)
+        )
+    return queryset.filter(condition)
+
+
+def _median_ms(fetch) -> tuple[float, int]:
+    samples, found = [], 0
+    for _ in range(RUNS):
+        with timed() as elapsed:
+            found = len(fetch())
+        samples.append(elapsed.elapsed * 1000)
+    return statistics.median(samples), found
+
+
+def run(size: int, write) -> None:
+    User = get_user_model()
+    _create(size)
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE users")
+
+    write(f"{'query':<20} {'icontains ms':>13} {'rows':>6} {'search ms':>10} {'rows':>6}")
+    for query in QUERIES:
+        scan_ms, scanned = _median_ms(lambda: list(_icontains(User.objects.for_list(), query)[:20]))
+        search_ms, found = _median_ms(lambda: list(User.objects.for_list().search(query)[:20]))
+        write(f"{query:<20} {scan_ms:>13.2f} {scanned:>6} {search_ms:>10.2f} {found:>6}")
@@ -0,0 +1 @@
+"""Cache backends and helpers on top of Django's cache framework."""
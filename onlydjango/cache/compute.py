@@ -0,0 +1,146 @@
+"""Cached computed values without stampedes.
+
+``get_or_compute`` stores a value together with how long it took to compute
+and when it goes stale, and keeps it in the cache for ``stale`` more seconds
+after that. When it goes stale only the worker holding a short lock (a
+``cache.add``, ``SET NX`` on Redis) recomputes it; every other worker keeps
+serving the stale value meanwhile. With nothing cached at all, the others
+wait for the lock holder instead of querying too.
+
+Keys are also refreshed a little early, XFetch-style: each read recomputes
+with a probability that grows as expiry nears and with how slow the
+computation is, so hot keys are usually refreshed before they go stale.
+
+Usage:
+    from onlydjango.cache.compute import get_or_compute
+
+    def top_authors(limit):
+        return list(User.objects.order_by("-post_count")[:limit].values("id", "name"))
+
+    authors = get_or_compute("top-authors:10", top_authors, timeout=300, args=(10,))
+
+With ``background=True`` a stale value is refreshed by the
+``refresh_cached_value`` task from ``apps.core.tasks`` instead of in the
+request; ``compute`` must then be a module-level function and ``args``
+serializable.
+"""
+
+import logging
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+WAIT_INTERVAL = 0.05
+
+
+def _value_key(key: str) -> str:
+    return f"computed:{key}"
+
+
+def _lock_key(key: str) -> str:
+    return f"computed-lock:{key}"
+
+
+def _is_fresh(entry, beta: float, now: float) -> bool:
+    # XFetch: refresh early with probability rising towards expiry,
+    # scaled by the computation time (delta) and beta.
+    value, delta, expires = entry
+    return now - delta * beta * math.log(1.0 - random.random()) < expires
+
+
+def _compute_and_store(cache, key: str, compute, args, timeout: int, stale: int):
+    started = time.monotonic()
+    value = compute(*args)
+    delta = time.monotonic() - started
+    cache.set(_value_key(key), (value, delta, time.time() + timeout), timeout + stale)
+    return value
+
+
+def _release(cache, key: str, token: str) -> None:
+    # Don't drop a lock that expired and was taken by another worker.
+    if cache.get(_lock_key(key)) == token:
+        cache.delete(_lock_key(key))
+
+
+def get_or_compute(key: str, compute, timeout: int = 300, *, args: tuple = (), stale: int | None = None,
+                   beta: float = 1.0, lock_timeout: int = 30, background: bool = False,
+                   using: str = "default"):
+    """Return ``compute(*args)``, cached under ``key`` for ``timeout`` seconds.
+
+    Args:
+        key: Cache key (stored as ``computed:<key>``).
+        compute: Callable producing the value; only one worker runs it per
+            expiry.
+        timeout: Seconds the value is fresh.
+        args: Positional arguments for ``compute``.
+        stale: Seconds a stale value is still served while it is recomputed
+            (defaults to ``timeout``).
+        beta: XFetch eagerness; 0 disables early refresh, above 1 refreshes
+            earlier.
+        lock_timeout: Seconds the recompute lock is held at most. Keep it
+            above the computation's duration.
+        background: Refresh stale values with a task instead of inline.
+        using: Cache alias.
+    """
+    cache = caches[using]
+    stale = timeout if stale is None else stale
+    entry = cache.get(_value_key(key))
+    if entry is not None and _is_fresh(entry, beta, time.time()):
+        return entry[0]
+
+    token = uuid.uuid4().hex
+    if not cache.add(_lock_key(key), token, lock_timeout):
+        if entry is not None:
+            return entry[0]
+        return _wait_for(cache, key, compute, args, timeout, stale, lock_timeout)
+
+    if background and entry is not None:
+        from apps.core.tasks import refresh_cached_value
+
+        try:
+            refresh_cached_value(key=key, compute=f"{compute.__module__}.{compute.__qualname__}",
+                                 args=list(args), ttl=timeout, stale=stale, token=token, using=using)
+        except Exception:
+            _release(cache, key, token)
+            raise
+        return entry[0]
+    try:
+        return _compute_and_store(cache, key, compute, args, timeout, stale)
+    finally:
+        _release(cache, key, token)
+
+
+def _wait_for(cache, key: str, compute, args, timeout: int, stale: int, lock_timeout: int):
+    # Nothing to serve yet: wait for the lock holder rather than compute too,
+    # and compute anyway if it hasn't finished within its lock.
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(_value_key(key))
+        if entry is not None:
+            return entry[0]
+        if cache.get(_lock_key(key)) is None:
+            break
+    logger.warning("Computing %s without the lock: its holder did not finish", key)
+    return _compute_and_store(cache, key, compute, args, timeout, stale)
+
+
+def refresh(key: str, compute: str, args: list, ttl: int, stale: int, token: str,
+            using: str = "default") -> None:
+    """Recompute ``key`` from a task, then release the lock taken for it."""
+    cache = caches[using]
+    try:
+        _compute_and_store(cache, key, import_string(compute), tuple(args), ttl, stale)
+    finally:
+        _release(cache, key, token)
+
+
+def invalidate(key: str, using: str = "default") -> None:
+    """Drop the cached value so the next read recomputes it."""
+    caches[using].delete(_value_key(key))
@@ -0,0 +1,137 @@
+"""Cache dependencies: version cached things by the rows they were built from.
+
+Every model, and every row read through a dependency, has a generation
+counter in the cache. Cached pages, fragments and querysets declare what
+they depend on and put the combined version in their key; any write to a
+dependency bumps (or, for a row, drops) its counter, so the next read
+misses and rebuilds. Nothing has to be deleted,
+so cached values can get long TTLs.
+
+- ``depends_on(User)``: any user (lists, counts, search results).
+- ``depends_on(user)``: that row only (a profile page).
+- ``depends_on("core.User", request.user)``: both.
+
+Only declared models are tracked: those named in a view's
+``cache_dependencies``, ``@cache_response(depends_on=...)``, a
+``depends_on()`` call, or ``settings.CACHE_DEPENDENCY_MODELS`` (for models a
+process writes without importing the views that cache them). Their
+``post_save``, ``post_delete`` and ``m2m_changed`` signals bump the model's
+and the row's generations, once per transaction, after it commits; other
+models keep Django's fast deletes. ``bulk_create``, ``bulk_update`` and
+``update`` send no signals: use ``bulk_update``/``update`` below, or call
+``changed`` yourself, inside ``batch()`` to collect the bumps of a loop.
+
+Usage:
+    deps = depends_on(User)
+    users = cache.get_or_set(deps.key("user-list"), lambda: list(User.objects.for_list()), 86400)
+
+    class UserListView(CacheDependenciesMixin, View):
+        cache_dependencies = ("core.User",)
+
+    {% load cache_dependencies %}
+    {% dependency_version "core.User" as version %}
+    {% cache 86400 user_sidebar version %}...{% endcache %}
+"""
+
+import hashlib
+from itertools import batched
+
+from django.core.cache import cache
+from django.db import models
+
+from .generations import (
+    ROW_GENERATION_TIMEOUT,
+    _generation,
+    _is_row_key,
+    _model,
+    _model_key,
+    _row_key,
+    batch,
+    changed,
+    changed_rows,
+    track,
+)
+
+
+class Dependencies:
+    """The models and rows a cached value was built from."""
+
+    def __init__(self, targets):
+        self.targets = tuple(targets)
+        track(*targets)
+        keys = set()
+        for target in targets:
+            if isinstance(target, models.Model):
+                keys.add(_row_key(type(target), target.pk))
+            else:
+                keys.add(_model_key(_model(target)))
+        self.keys = sorted(keys)
+
+    def version(self) -> str:
+        """A short hash of the current generations; changes on every write."""
+        found = cache.get_many(self.keys)
+        for key in self.keys:
+            if key not in found:
+                # Start unknown (or evicted) counters at a fresh random value,
+                # never at one an older cache entry may have been keyed on.
+                generation = _generation()
+                timeout = ROW_GENERATION_TIMEOUT if _is_row_key(key) else None
+                found[key] = generation if cache.add(key, generation, timeout) else cache.get(key, generation)
+        state = "|".join(f"{key}={found[key]}" for key in self.keys)
+        return hashlib.md5(state.encode(), usedforsecurity=False).hexdigest()[:16]
+
+    def key(self, name: str) -> str:
+        """``name`` versioned by these dependencies, for use as a cache key."""
+        return f"{name}:{self.version()}"
+
+
+def depends_on(*targets) -> Dependencies:
+    """Declare dependencies on models (classes or "app.Model") and rows."""
+    return Dependencies(targets)
+
+
+def bulk_update(objs, fields, batch_size: int = 1000) -> int:
+    """``bulk_update`` that bumps generations once per batch."""
+    updated = 0
+    for chunk in batched(objs, batch_size):
+        model = type(chunk[0])
+        with batch():
+            updated += model._default_manager.bulk_update(chunk, fields)
+            changed(*chunk)
+    return updated
+
+
+def update(queryset, batch_size: int = 1000, **values) -> int:
+    """``queryset.update(**values)`` that bumps generations once per batch.
+
+    Rows are walked in primary-key order, ``batch_size`` at a time.
+    """
+    model = queryset.model
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    updated, last_pk = 0, None
+    while True:
+        page = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+        chunk = list(page[:batch_size])
+        if not chunk:
+            return updated
+        updated += model._default_manager.filter(pk__in=chunk).update(**values)
+        changed_rows(model, chunk, queryset.db)
+        last_pk = chunk[-1]
+
+
+class CacheDependenciesMixin:
+    """Declare a view's cache dependencies as ``cache_dependencies``.
+
+    Override ``get_cache_dependencies`` to add rows known only per request
+    (``self.request``, ``self.kwargs``); ``ResponseCacheMiddleware`` calls it
+    on a set-up instance of the view.
+    """
+
+    cache_dependencies: tuple = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        track(*cls.cache_dependencies)
+
+    def get_cache_dependencies(self) -> Dependencies:
+        return depends_on(*self.cache_dependencies)
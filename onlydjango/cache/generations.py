@@ -0,0 +1,166 @@
+"""Generation counters: the write side of cache dependencies.
+
+Each tracked model, and each of its rows read through a dependency, has a
+counter under ``depgen:<app.model>`` or ``depgen:<app.model>:<pk>``. Writes
+bump them, once per transaction and after it commits; ``batch()`` collects
+the bumps of a loop first. See ``dependencies`` for the read side.
+"""
+
+import threading
+import uuid
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+PREFIX = "depgen"
+# Written on every request or migration; never worth a cache write.
+IGNORED = {"sessions.session", "admin.logentry", "contenttypes.contenttype", "migrations.migration"}
+# Row counters expire so rarely read rows don't keep a key forever; an
+# expired counter only costs the rows' cached values one miss.
+ROW_GENERATION_TIMEOUT = 86400
+
+_pending = threading.local()
+_tracked: set[str] = set()
+
+
+def _model(target) -> type[models.Model]:
+    if isinstance(target, str):
+        return apps.get_model(target)
+    return target if isinstance(target, type) else type(target)
+
+
+def _model_key(model) -> str:
+    return f"{PREFIX}:{model._meta.label_lower}"
+
+
+def _row_key(model, pk) -> str:
+    return f"{PREFIX}:{model._meta.label_lower}:{pk}"
+
+
+def _generation() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def _is_row_key(key: str) -> bool:
+    return len(key.split(":", 2)) == 3
+
+
+def _bump(keys) -> None:
+    # Model counters are few and get a new generation. Row counters are
+    # deleted: the next version() re-seeds them at a random value, and
+    # writing them here would leave a key behind for every row ever saved.
+    row_keys = [key for key in keys if _is_row_key(key)]
+    model_keys = [key for key in keys if not _is_row_key(key)]
+    if model_keys:
+        cache.set_many(dict.fromkeys(model_keys, _generation()), None)
+    if row_keys:
+        cache.delete_many(row_keys)
+
+
+class _Bump:
+    """A transaction's pending bumps, applied by one on_commit hook."""
+
+    def __init__(self):
+        self.keys: set[str] = set()
+        self.done = False
+
+    def __call__(self) -> None:
+        self.done = True
+        _bump(self.keys)
+
+
+def _schedule(keys: set[str], using: str | None) -> None:
+    if getattr(_pending, "keys", None) is not None:
+        _pending.keys.update(keys)
+        return
+    if not keys:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        _bump(keys)
+        return
+    # After commit: a reader must not cache uncommitted-looking data under
+    # the new generation. Rows join the transaction's hook while it is still
+    # queued; a rolled-back savepoint drops it, and the next row adds another.
+    pending = getattr(connection, "cache_dependency_bump", None)
+    queued = pending is not None and not pending.done and any(
+        hook[1] is pending for hook in connection.run_on_commit
+    )
+    if not queued:
+        pending = connection.cache_dependency_bump = _Bump()
+        transaction.on_commit(pending, using=using)
+    pending.keys.update(keys)
+
+
+def changed_rows(model, pks, using: str | None = None) -> None:
+    """Bump ``model`` and its rows ``pks``."""
+    model = _model(model)
+    if model._meta.label_lower in IGNORED:
+        return
+    _schedule({_model_key(model), *(_row_key(model, pk) for pk in pks)}, using)
+
+
+def changed(*targets, using: str | None = None) -> None:
+    """Bump the generations of models and rows written without signals."""
+    for target in targets:
+        if isinstance(target, models.Model):
+            changed_rows(type(target), [target.pk], using)
+        else:
+            changed_rows(target, [], using)
+
+
+@contextmanager
+def batch(using: str | None = None):
+    """Collect every bump made inside and apply them once, on exit."""
+    if getattr(_pending, "keys", None) is not None:
+        yield
+        return
+    _pending.keys = set()
+    try:
+        yield
+    finally:
+        keys, _pending.keys = _pending.keys, None
+        _schedule(keys, using)
+
+
+def _label(target) -> str:
+    if isinstance(target, str):
+        return target.lower()
+    return _model(target)._meta.label_lower
+
+
+def track(*targets) -> None:
+    """Bump generations when rows of these models are saved or deleted."""
+    for label in {_label(target) for target in targets} - _tracked:
+        _tracked.add(label)
+        if label in IGNORED:
+            continue
+        # Lazy senders: views may be declared before the app registry is ready.
+        post_save.connect(_row_changed, sender=label, dispatch_uid=f"{PREFIX}:{label}:save")
+        post_delete.connect(_row_changed, sender=label, dispatch_uid=f"{PREFIX}:{label}:delete")
+        apps.lazy_model_operation(_track_m2m, tuple(label.split(".")))
+
+
+def _track_m2m(model) -> None:
+    for field in model._meta.get_fields():
+        if field.many_to_many:
+            through = getattr(field, "through", None) or field.remote_field.through
+            m2m_changed.connect(_m2m_changed, sender=through,
+                                dispatch_uid=f"{PREFIX}:{through._meta.label_lower}:m2m")
+
+
+def _row_changed(sender, instance, using, **kwargs) -> None:
+    if not kwargs.get("raw"):
+        changed(instance, using=using)
+
+
+def _m2m_changed(sender, instance, action, model, pk_set, using, **kwargs) -> None:
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    with batch(using):
+        changed(instance, sender, using=using)
+        # post_clear doesn't say which rows were on the other side.
+        changed_rows(model, pk_set or [], using)
@@ -0,0 +1,117 @@
+"""Cross-worker invalidation for ``LayeredCache``.
+
+Every write through a layered cache publishes the keys it changed; every
+other worker evicts them from its local tier. With a Redis remote tier the
+messages go over Redis pub/sub, received by one daemon thread per process.
+Other remote backends (locmem in tests, dummy in dev) can't reach other
+processes anyway, so messages are delivered to the layered caches of this
+process only.
+
+A subscriber that isn't connected can't hear about writes, so while it is
+down ``healthy`` is False and the layered cache bypasses its local tier.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+import weakref
+
+logger = logging.getLogger(__name__)
+
+CLEAR = "*"
+RECONNECT_DELAY = 1.0
+
+
+class LocalInvalidator:
+    """Deliver invalidations to the other layered caches in this process."""
+
+    _listeners: dict[str, weakref.WeakSet] = {}
+
+    def __init__(self, channel: str, listener):
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._listeners.setdefault(channel, weakref.WeakSet()).add(listener)
+        self._listener = weakref.ref(listener)
+
+    @property
+    def healthy(self) -> bool:
+        return True
+
+    def publish(self, keys: list[str]) -> None:
+        me = self._listener()
+        for listener in list(self._listeners.get(self.channel, ())):
+            if listener is not me:
+                listener.evict(keys)
+
+
+class RedisInvalidator:
+    """Publish and receive invalidations over Redis pub/sub."""
+
+    def __init__(self, channel: str, listener, get_client):
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._listener = weakref.ref(listener)
+        self._get_client = get_client
+        self._lock = threading.Lock()
+        self._pid = None
+        self._subscribed = threading.Event()
+
+    @property
+    def healthy(self) -> bool:
+        self._ensure_subscriber()
+        return self._subscribed.is_set()
+
+    def publish(self, keys: list[str]) -> None:
+        message = json.dumps({"origin": self.origin, "keys": keys})
+        try:
+            self._get_client().publish(self.channel, message)
+        except Exception:
+            # Other workers keep their copies until LOCAL_TIMEOUT expires them.
+            logger.exception("Could not publish cache invalidation on %s", self.channel)
+
+    def _ensure_subscriber(self) -> None:
+        # One thread per process; a forked worker starts its own.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._subscribed.clear()
+            threading.Thread(target=self._listen, name="layered-cache-invalidation",
+                             daemon=True).start()
+
+    def _listen(self) -> None:
+        pid = os.getpid()
+        while self._pid == pid and self._listener() is not None:
+            pubsub = None
+            try:
+                pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Anything written while we weren't listening may be stale.
+                self._evict([CLEAR])
+                self._subscribed.set()
+                for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    data = json.loads(message["data"])
+                    if data["origin"] != self.origin:
+                        self._evict(data["keys"])
+            except Exception:
+                logger.warning("Cache invalidation subscriber on %s lost, reconnecting", self.channel)
+            finally:
+                self._subscribed.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(RECONNECT_DELAY)
+
+    def _evict(self, keys: list[str]) -> None:
+        listener = self._listener()
+        if listener is not None:
+            listener.evict(keys)
@@ -0,0 +1,198 @@
+"""Two-tier cache: a bounded in-process LRU in front of another cache backend.
+
+Hot keys are answered from the worker's memory instead of a Redis round
+trip. Local entries live at most ``LOCAL_TIMEOUT`` seconds and never past
+the remote key's own expiry (read with ``PTTL`` alongside the value), the
+LRU holds at most ``LOCAL_MAX_ENTRIES`` per process, and every write
+evicts the key from the other workers' local tiers (see ``invalidation``).
+A read racing a write elsewhere can keep the old value locally, but never
+for longer than ``LOCAL_TIMEOUT``.
+
+Settings (per alias; LOCATION, KEY_PREFIX, VERSION, TIMEOUT and the other
+OPTIONS go to the remote tier unchanged):
+    CACHES["default"] = {
+        "BACKEND": "onlydjango.cache.layered.LayeredCache",
+        "LOCATION": [REDIS_URL],
+        "OPTIONS": {
+            "REMOTE_BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCAL_MAX_ENTRIES": 2000,
+            "LOCAL_TIMEOUT": 30,
+        },
+    }
+
+``cache.stats()`` returns this worker's hit/miss counters per tier;
+``manage.py cache_stats`` shows every worker's.
+"""
+
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.redis import RedisCache
+from django.utils.module_loading import import_string
+
+from . import stats  # noqa: F401  (publishes counters on request_finished)
+from .invalidation import CLEAR
+from .local import MISSING, get_tier
+
+
+def _seconds_left(pttl: int) -> float | None:
+    # PTTL: -1 when the key has no expiry, -2 when it expired since the GET.
+    if pttl == -1:
+        return None
+    return max(pttl, 0) / 1000
+
+
+class LayeredCache(BaseCache):
+    def __init__(self, location, params):
+        params = dict(params)
+        options = dict(params.get("OPTIONS", {}))
+        remote_backend = options.pop("REMOTE_BACKEND", "django.core.cache.backends.redis.RedisCache")
+        max_entries = int(options.pop("LOCAL_MAX_ENTRIES", 1000))
+        self.local_timeout = float(options.pop("LOCAL_TIMEOUT", 30))
+        channel = options.pop("CHANNEL", None)
+        params["OPTIONS"] = options
+        super().__init__(params)
+
+        self.remote = import_string(remote_backend)(location, params)
+        get_client = None
+        if isinstance(self.remote, RedisCache):
+            remote = self.remote
+            get_client = lambda: remote._cache.get_client(write=True)  # noqa: E731
+        self.tier = get_tier(channel or f"{self.key_prefix}:layered-cache", max_entries, get_client)
+
+    def _use_local(self) -> bool:
+        return self.tier.invalidator.healthy
+
+    def _key(self, key, version=None) -> str:
+        return str(self.make_and_validate_key(key, version=version))
+
+    def _local_timeout(self, timeout) -> float:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return self.local_timeout if timeout is None else min(timeout, self.local_timeout)
+
+    def _keep(self, full_key: str, value, ttl: float | None) -> None:
+        # Redis expiry publishes nothing, so a copy must not outlive the
+        # remote key: ``ttl`` is what it has left (None: no expiry).
+        if self._use_local():
+            self.tier.lru.set(full_key, value, self.local_timeout if ttl is None else min(ttl, self.local_timeout))
+
+    def _fetch(self, keys: list, version=None) -> dict:
+        """Remote ``{key: (value, seconds left)}`` for the keys found."""
+        full_keys = {key: self._key(key, version) for key in keys}
+        if isinstance(self.remote, RedisCache):
+            # GET and PTTL together, in one round trip.
+            client = self.remote._cache.get_client(None)
+            pipe = client.pipeline(transaction=False)
+            for full_key in full_keys.values():
+                pipe.get(full_key)
+                pipe.pttl(full_key)
+            replies = pipe.execute()
+            loads = self.remote._cache._serializer.loads
+            return {
+                key: (loads(raw), _seconds_left(pttl))
+                for key, raw, pttl in zip(full_keys, replies[::2], replies[1::2])
+                if raw is not None
+            }
+        fetched = self.remote.get_many(keys, version=version)
+        return {key: (value, self._remote_ttl(full_keys[key])) for key, value in fetched.items()}
+
+    def _remote_ttl(self, full_key: str) -> float | None:
+        expires = getattr(self.remote, "_expire_info", {}).get(full_key)  # LocMemCache
+        # Other backends don't expose expiry: LOCAL_TIMEOUT bounds their copies.
+        return None if expires is None else max(expires - time.time(), 0.0)
+
+    # Reads -----------------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        full_key = self._key(key, version)
+        if self._use_local():
+            value = self.tier.lru.get(full_key)
+            if value is not MISSING:
+                self.tier.count("local_hits")
+                return value
+            self.tier.count("local_misses")
+        found = self._fetch([key], version)
+        if key not in found:
+            self.tier.count("remote_misses")
+            return default
+        self.tier.count("remote_hits")
+        value, ttl = found[key]
+        self._keep(full_key, value, ttl)
+        return value
+
+    def get_many(self, keys, version=None):
+        found, remaining = {}, list(keys)
+        if self._use_local():
+            remaining = []
+            for key in keys:
+                value = self.tier.lru.get(self._key(key, version))
+                if value is MISSING:
+                    remaining.append(key)
+                else:
+                    found[key] = value
+            self.tier.count("local_hits", len(found))
+            self.tier.count("local_misses", len(remaining))
+        if remaining:
+            fetched = self._fetch(remaining, version)
+            self.tier.count("remote_hits", len(fetched))
+            self.tier.count("remote_misses", len(remaining) - len(fetched))
+            for key, (value, ttl) in fetched.items():
+                self._keep(self._key(key, version), value, ttl)
+                found[key] = value
+        return found
+
+    def has_key(self, key, version=None):
+        return self.get(key, MISSING, version=version) is not MISSING
+
+    # Writes ----------------------------------------------------------------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self._key(key, version)
+        self.remote.set(key, value, timeout, version=version)
+        self.tier.changed([full_key])
+        self._keep(full_key, value, self._local_timeout(timeout))
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        full_key = self._key(key, version)
+        added = self.remote.add(key, value, timeout, version=version)
+        if added:
+            self.tier.changed([full_key])
+            self._keep(full_key, value, self._local_timeout(timeout))
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.remote.set_many(data, timeout, version=version)
+        self.tier.changed([self._key(key, version) for key in data])
+        return failed
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        touched = self.remote.touch(key, timeout, version=version)
+        self.tier.changed([self._key(key, version)])
+        return touched
+
+    def delete(self, key, version=None):
+        deleted = self.remote.delete(key, version=version)
+        self.tier.changed([self._key(key, version)])
+        return deleted
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self.remote.delete_many(keys, version=version)
+        self.tier.changed([self._key(key, version) for key in keys])
+
+    def incr(self, key, delta=1, version=None):
+        value = self.remote.incr(key, delta, version=version)
+        self.tier.changed([self._key(key, version)])
+        return value
+
+    def clear(self):
+        self.remote.clear()
+        self.tier.changed([CLEAR])
+
+    def close(self, **kwargs):
+        self.remote.close(**kwargs)
+
+    def stats(self) -> dict:
+        """This worker's hit/miss counters per tier and local tier size."""
+        return self.tier.stats()
@@ -0,0 +1,110 @@
+"""The in-process tier of ``LayeredCache``, shared by all threads of a worker.
+
+Django creates one cache backend instance per thread, so the LRU, its
+counters and the invalidation subscriber live in a ``LocalTier`` per channel
+and process instead of on the backend.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from .invalidation import CLEAR, LocalInvalidator, RedisInvalidator
+
+MISSING = object()
+
+_tiers: dict[str, "LocalTier"] = {}
+_tiers_lock = threading.Lock()
+
+
+class LocalLRU:
+    """Thread-safe LRU of pickled values with per-entry expiry.
+
+    Values are pickled like LocMemCache's, so callers mutating what they got
+    back can't change what the next caller gets.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISSING
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return MISSING
+            self._data.move_to_end(key)
+        return pickle.loads(entry[1])
+
+    def set(self, key: str, value, timeout: float) -> None:
+        if timeout <= 0:
+            self.delete(key)
+            return
+        entry = (time.monotonic() + timeout, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class LocalTier:
+    def __init__(self, channel: str, max_entries: int, get_client=None):
+        self.channel = channel
+        self.lru = LocalLRU(max_entries)
+        self.counters = {"local_hits": 0, "local_misses": 0, "remote_hits": 0, "remote_misses": 0}
+        if get_client is None:
+            self.invalidator = LocalInvalidator(channel, self)
+        else:
+            self.invalidator = RedisInvalidator(channel, self, get_client)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        # Unlocked: counters are for dashboards and may drop a rare increment.
+        self.counters[name] += amount
+
+    def evict(self, keys: list[str]) -> None:
+        """Drop ``keys`` (full keys, or ``CLEAR``) from the LRU."""
+        if CLEAR in keys:
+            self.lru.clear()
+            return
+        for key in keys:
+            self.lru.delete(key)
+
+    def changed(self, keys: list[str]) -> None:
+        """Evict ``keys`` here and in every other worker."""
+        self.evict(keys)
+        self.invalidator.publish(keys)
+
+    def stats(self) -> dict:
+        return {**self.counters, "local_entries": len(self.lru)}
+
+
+def get_tier(channel: str, max_entries: int, get_client=None) -> LocalTier:
+    """Return this process's tier for ``channel``, creating it once."""
+    tier = _tiers.get(channel)
+    if tier is None:
+        with _tiers_lock:
+            tier = _tiers.get(channel)
+            if tier is None:
+                tier = _tiers[channel] = LocalTier(channel, max_entries, get_client)
+    return tier
+
+
+def tiers() -> dict[str, LocalTier]:
+    return dict(_tiers)
@@ -0,0 +1,66 @@
+import time
+
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from .responses import cache_key, cacheable, freeze, thaw, validated
+
+
+class ResponseCacheMiddleware:
+    """Serve views marked with ``@cache_response`` from the cache.
+
+    Hits (and 304s) are answered in ``process_view``, before the view runs;
+    misses are stored on the way out. Responses carry ``X-Cache: hit|miss``.
+    """
+
+    alias = "default"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        key = getattr(request, "_response_cache_key", None)
+        if key is None:
+            return response
+        response["X-Cache"] = "miss"
+        if not cacheable(request, response):
+            return response
+
+        entry = freeze(response, time.time())
+        caches[self.alias].set(key, entry, request._response_cache_timeout)
+        return get_conditional_response(
+            request, etag=entry["etag"], last_modified=entry["last_modified"],
+            response=validated(response, entry),
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        policy = getattr(view_func, "response_cache", None) or getattr(view_class, "response_cache", None)
+        if policy is None:
+            return None
+        key = cache_key(request, policy, self.dependencies(view_func, request, view_args, view_kwargs))
+        if key is None:
+            return None
+
+        entry = caches[self.alias].get(key)
+        if entry is None:
+            request._response_cache_key = key
+            request._response_cache_timeout = policy.seconds
+            return None
+        response = thaw(entry, request, HttpResponse)
+        response["X-Cache"] = "hit"
+        return get_conditional_response(
+            request, etag=entry["etag"], last_modified=entry["last_modified"], response=response,
+        )
+
+    @staticmethod
+    def dependencies(view_func, request, view_args, view_kwargs) -> tuple:
+        """The view's dependencies for this request, through its hook if any."""
+        view_class = getattr(view_func, "view_class", None)
+        if not hasattr(view_class, "get_cache_dependencies"):
+            return getattr(view_class, "cache_dependencies", ())
+        view = view_class(**getattr(view_func, "view_initkwargs", {}))
+        view.setup(request, *view_args, **view_kwargs)
+        return view.get_cache_dependencies().targets
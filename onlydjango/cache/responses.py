@@ -0,0 +1,175 @@
+"""Whole-response caching for views that opt in.
+
+Usage:
+    @cache_response(timeout=600, query_params=("page",), depends_on=("core.User",))
+    def user_list(request):
+        ...
+
+    class HomeView(ResponseCacheMixin, View):
+        cache_dependencies = ("core.User",)
+        response_cache_anonymous_only = True
+
+``ResponseCacheMiddleware`` serves marked views from the cache before they
+run. Cached copies are shared per segment (anonymous or authenticated), per
+``HX-Request`` (partial or full page) and per value of the listed query
+parameters; requests carrying any other parameter are not cached. Keys
+include the version of the view's dependencies (see ``dependencies``), so
+writes to them invalidate it and long timeouts are safe.
+
+Bodies are stored gzipped and sent as-is to clients accepting gzip. Every
+cached response has an ``ETag`` and ``Last-Modified``, and conditional
+requests matching them get a 304 without the view running.
+
+Authenticated pages share one copy for every logged-in user: only mark
+views whose content isn't personal. Responses that set cookies, use a CSRF
+token or flash messages, or say ``private``/``no-store`` are never stored.
+"""
+
+import gzip
+import hashlib
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+
+from .dependencies import CacheDependenciesMixin, depends_on, track
+
+VARY = ("Cookie", "HX-Request", "Accept-Encoding")
+# Headers that describe one response to one client, not the page.
+UNCACHED_HEADERS = {"set-cookie", "content-length", "content-encoding", "vary", "x-cache"}
+SHARED_VARY = {"cookie", "accept-encoding", "hx-request"}
+
+
+@dataclass(frozen=True)
+class ResponsePolicy:
+    timeout: int | None = None
+    query_params: tuple[str, ...] = ()
+    depends_on: tuple = ()
+    anonymous_only: bool = False
+
+    @property
+    def seconds(self) -> int:
+        if self.timeout is not None:
+            return self.timeout
+        return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 600)
+
+
+def cache_response(timeout: int | None = None, query_params=(), depends_on=(),
+                   anonymous_only: bool = False):
+    """Cache a view function or class-based view's responses.
+
+    Args:
+        timeout: Seconds a response is kept (default
+            ``settings.RESPONSE_CACHE_TIMEOUT``).
+        query_params: Query parameters the response varies on.
+        depends_on: Models ("app.Model" or classes) whose writes invalidate
+            it; added to a class-based view's ``cache_dependencies``.
+        anonymous_only: Cache anonymous responses only.
+    """
+    policy = ResponsePolicy(timeout, tuple(query_params), tuple(depends_on), anonymous_only)
+    track(*policy.depends_on)
+
+    def decorator(view):
+        view.response_cache = policy
+        return view
+    return decorator
+
+
+class ResponseCacheMixin(CacheDependenciesMixin):
+    """Class-based views' ``@cache_response``, as class attributes."""
+
+    response_cache_timeout: int | None = None
+    response_cache_query_params: tuple[str, ...] = ()
+    response_cache_anonymous_only: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.response_cache = ResponsePolicy(
+            cls.response_cache_timeout, tuple(cls.response_cache_query_params),
+            anonymous_only=cls.response_cache_anonymous_only,
+        )
+
+
+def cache_key(request, policy: ResponsePolicy, dependencies=()) -> str | None:
+    """The request's cache key, or None when it must not be cached."""
+    if request.method not in ("GET", "HEAD"):
+        return None
+    if any(name not in policy.query_params for name in request.GET):
+        return None
+    authenticated = request.user.is_authenticated
+    if authenticated and policy.anonymous_only:
+        return None
+
+    params = "&".join(f"{name}={value}" for name in policy.query_params
+                      for value in request.GET.getlist(name))
+    url = f"{request.get_host()}{request.path}?{params}"
+    segment = "auth" if authenticated else "anon"
+    partial = "hx" if request.headers.get("HX-Request") == "true" else "page"
+    digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+    key = f"response:{segment}:{partial}:{digest}"
+    deps = (*policy.depends_on, *dependencies)
+    return depends_on(*deps).key(key) if deps else key
+
+
+def cacheable(request, response) -> bool:
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+    if request.META.get("CSRF_COOKIE_NEEDS_UPDATE"):
+        return False
+    messages = getattr(request, "_messages", None)
+    if messages is not None and messages.used:
+        return False
+    cache_control = response.get("Cache-Control", "").lower()
+    if "private" in cache_control or "no-store" in cache_control:
+        return False
+    vary = {value.strip().lower() for value in response.get("Vary", "").split(",") if value.strip()}
+    return vary <= SHARED_VARY
+
+
+def freeze(response, now: float) -> dict:
+    """The cache entry for ``response``: headers, gzipped body and validators."""
+    body = response.content
+    return {
+        "headers": [(name, value) for name, value in response.items()
+                    if name.lower() not in UNCACHED_HEADERS],
+        "body": gzip.compress(body, compresslevel=6, mtime=0),
+        "etag": f'W/"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"',
+        "last_modified": int(now),
+    }
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring ``q=0``."""
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights.get("gzip", weights.get("*", 0.0)) > 0
+
+
+def thaw(entry: dict, request, response_class):
+    """A response rebuilt from a cache entry, gzipped if the client accepts it."""
+    if accepts_gzip(request.headers.get("Accept-Encoding", "")):
+        response = response_class(entry["body"])
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = response_class(gzip.decompress(entry["body"]))
+    for name, value in entry["headers"]:
+        response[name] = value
+    return validated(response, entry)
+
+
+def validated(response, entry: dict):
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    patch_vary_headers(response, VARY)
+    return response
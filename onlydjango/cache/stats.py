@@ -0,0 +1,91 @@
+"""Layered cache hit/miss counters across workers.
+
+Every worker publishes the counters of its local tiers (see ``local``) to
+the cache at most every ``PUBLISH_INTERVAL`` seconds, from the end of a
+request; ``collect()`` reads them back for ``manage.py cache_stats``.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from django.core.signals import request_finished
+
+from onlydjango.db.pool import worker_id
+
+from .local import tiers
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_INTERVAL = 10.0
+SNAPSHOT_TTL = 60
+INDEX_KEY = "layered-cache:workers"
+COUNTERS = ("local_hits", "local_misses", "remote_hits", "remote_misses")
+
+_last_publish = 0.0
+
+
+def snapshot() -> dict:
+    """Return this worker's counters for every layered cache channel."""
+    return {
+        "worker": worker_id(),
+        "time": time.time(),
+        "channels": {channel: tier.stats() for channel, tier in tiers().items()},
+    }
+
+
+def publish(force: bool = False) -> None:
+    """Store this worker's snapshot in the cache, at most every few seconds."""
+    global _last_publish
+    now = time.monotonic()
+    if not force and now - _last_publish < PUBLISH_INTERVAL:
+        return
+    _last_publish = now
+
+    data = snapshot()
+    if not data["channels"]:
+        return
+    worker = data["worker"]
+    cache.set(f"layered-cache:{worker}", data, SNAPSHOT_TTL)
+    workers = cache.get(INDEX_KEY) or []
+    if worker not in workers:
+        cache.set(INDEX_KEY, [*workers, worker][-200:], None)
+
+
+def _publish_on_request_finished(sender, **kwargs) -> None:
+    try:
+        publish()
+    except Exception:
+        logger.exception("Could not publish layered cache stats")
+
+
+request_finished.connect(_publish_on_request_finished, dispatch_uid="onlydjango.cache.stats.publish")
+
+
+def collect() -> list[dict]:
+    """Return the latest snapshot of every worker seen in the last minute."""
+    workers = cache.get(INDEX_KEY) or []
+    found = cache.get_many([f"layered-cache:{worker}" for worker in workers])
+    live = [found[key] for key in sorted(found)]
+    if len(live) < len(workers):
+        cache.set(INDEX_KEY, [data["worker"] for data in live], None)
+    return live
+
+
+def aggregate(snapshots: list[dict]) -> dict:
+    """Sum worker counters per channel, with hit rates per tier."""
+    totals: dict[str, dict] = {}
+    for data in snapshots:
+        for channel, stats in data["channels"].items():
+            total = totals.setdefault(channel, {"workers": 0, "local_entries": 0, **dict.fromkeys(COUNTERS, 0)})
+            total["workers"] += 1
+            for key in (*COUNTERS, "local_entries"):
+                total[key] += stats[key]
+    for total in totals.values():
+        total["local_hit_rate"] = _rate(total["local_hits"], total["local_misses"])
+        total["remote_hit_rate"] = _rate(total["remote_hits"], total["remote_misses"])
+    return totals
+
+
+def _rate(hits: int, misses: int) -> float | None:
+    return round(hits / (hits + misses), 3) if hits + misses else None
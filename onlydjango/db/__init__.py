@@ -0,0 +1 @@
+"""Database helpers: read-replica routing."""
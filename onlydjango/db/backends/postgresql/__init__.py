@@ -0,0 +1,5 @@
+"""PostgreSQL backend with connection pool and slow query instrumentation.
+
+Use ``"ENGINE": "onlydjango.db.backends.postgresql"``; see
+``onlydjango.db.pool`` and ``onlydjango.db.slow_queries``.
+"""
@@ -0,0 +1,28 @@
+import time
+
+from django.db.backends.postgresql import base
+
+from onlydjango.db import pool as pool_stats
+from onlydjango.db.slow_queries import record_slow
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """Times pool checkouts, records pooled connection ages and slow queries."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.append(record_slow)
+
+    def get_new_connection(self, conn_params):
+        if not self.pool:
+            return super().get_new_connection(conn_params)
+        started = time.monotonic()
+        connection = super().get_new_connection(conn_params)
+        pool_stats.record_wait(self.alias, self.pool, time.monotonic() - started)
+        return connection
+
+    def _configure_connection(self, connection):
+        # Called by the pool once for every connection it opens.
+        if self.pool:
+            pool_stats.record_opened(self.alias, connection)
+        return super()._configure_connection(connection)
@@ -0,0 +1,96 @@
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .queries import QueryBudget, QueryBudgetExceeded, count_queries
+from .replicas import is_pinned, request_scope
+from .slow_queries import current_view
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "primary_pin"
+
+
+class ReplicaPinningMiddleware:
+    """Keep a client on the primary for a few seconds after it writes.
+
+    A write pins the rest of the request to the primary; a short-lived cookie
+    extends that to the follow-up requests (e.g. the redirect after a POST),
+    so they don't read stale rows from a lagging replica.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_scope(pinned=PIN_COOKIE in request.COOKIES):
+            response = self.get_response(request)
+            if is_pinned() and request.method not in ("GET", "HEAD", "OPTIONS"):
+                response.set_cookie(
+                    PIN_COOKIE, "1",
+                    max_age=getattr(settings, "REPLICA_PIN_SECONDS", 15),
+                    httponly=True, samesite="Lax",
+                )
+        return response
+
+
+class QueryBudgetMiddleware:
+    """Count each request's queries and act when its budget is exceeded.
+
+    The budget comes from the view's ``@query_budget`` or, failing that,
+    ``settings.QUERY_BUDGET``. ``settings.QUERY_BUDGET_ACTIONS`` lists what
+    happens: "log" a warning, add "header"s with the counts to every
+    response, or "raise" ``QueryBudgetExceeded`` (for tests).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.actions = set(getattr(settings, "QUERY_BUDGET_ACTIONS", []))
+        if not self.actions:
+            raise MiddlewareNotUsed
+        self.default = QueryBudget(**getattr(settings, "QUERY_BUDGET", {}))
+
+    def __call__(self, request):
+        request.query_budget = self.default
+        with count_queries() as counter:
+            response = self.get_response(request)
+
+        problems = request.query_budget.violations(counter)
+        if "header" in self.actions:
+            response["X-DB-Queries"] = str(counter.count)
+            response["X-DB-Duplicates"] = str(counter.duplicates)
+            response["X-DB-Time-Ms"] = f"{counter.seconds * 1000:.1f}"
+            if problems:
+                response["X-Query-Budget"] = "exceeded"
+        if problems:
+            message = f"Query budget exceeded for {request.method} {request.path}: {'; '.join(problems)}"
+            if "raise" in self.actions:
+                raise QueryBudgetExceeded(message)
+            if "log" in self.actions:
+                logger.warning(message)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        budget = getattr(view_func, "query_budget", None) or getattr(view_class, "query_budget", None)
+        if budget is not None:
+            request.query_budget = budget
+
+
+class SlowQueryMiddleware:
+    """Tag slow queries with the name of the view that ran them."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = current_view.set(request.path)
+        try:
+            return self.get_response(request)
+        finally:
+            current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        current_view.set(match.view_name or match._func_path if match else request.path)
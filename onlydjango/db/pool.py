@@ -0,0 +1,180 @@
+"""Connection pool statistics per worker process.
+
+The ``onlydjango.db.backends.postgresql`` engine times every pool checkout
+into a wait-time histogram and records when each connection was opened.
+Every worker publishes a snapshot of its pools (psycopg_pool's counters plus
+the histogram and connection ages) to the cache at most every
+``PUBLISH_INTERVAL`` seconds, from the end of a request; ``collect()`` and
+``aggregate()`` read them back for ``manage.py db_pool_stats`` and the
+staff/token-only ``/__dbpool__/`` endpoint.
+
+A checkout slower than ``DB_POOL_WAIT_WARNING_MS`` logs a warning.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connections
+
+from onlydjango.metrics import BUCKETS_MS, bucket, percentile
+
+logger = logging.getLogger(__name__)
+
+PUBLISH_INTERVAL = 10.0
+SNAPSHOT_TTL = 60
+WARNING_INTERVAL = 10.0
+INDEX_KEY = "dbpool:workers"
+
+_lock = threading.Lock()
+_waits: dict[str, list[int]] = {}
+_max_wait: dict[str, float] = {}
+_opened: dict[str, weakref.WeakKeyDictionary] = {}
+_last_warning: dict[str, float] = {}
+_last_publish = 0.0
+
+
+def worker_id() -> str:
+    # Evaluated per call: gunicorn may fork workers after this module loads.
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def record_opened(alias: str, connection) -> None:
+    """Note when the pool opened ``connection``, for connection ages."""
+    with _lock:
+        _opened.setdefault(alias, weakref.WeakKeyDictionary())[connection] = time.monotonic()
+
+
+def record_wait(alias: str, pool, seconds: float) -> None:
+    """Add one checkout's wait to the histogram; warn when it was too slow."""
+    wait_ms = seconds * 1000
+    with _lock:
+        histogram = _waits.setdefault(alias, [0] * (len(BUCKETS_MS) + 1))
+        histogram[bucket(wait_ms)] += 1
+        _max_wait[alias] = max(_max_wait.get(alias, 0.0), wait_ms)
+
+    threshold = getattr(settings, "DB_POOL_WAIT_WARNING_MS", 1000)
+    now = time.monotonic()
+    if wait_ms >= threshold and now - _last_warning.get(alias, 0.0) >= WARNING_INTERVAL:
+        _last_warning[alias] = now
+        stats = pool.get_stats()
+        logger.warning(
+            "Waited %.0fms for a '%s' pool connection (size %s/%s, idle %s, waiting %s)",
+            wait_ms, alias, stats.get("pool_size"), stats.get("pool_max"),
+            stats.get("pool_available"), stats.get("requests_waiting"),
+        )
+
+
+def _connection_ages(alias: str) -> dict:
+    now = time.monotonic()
+    with _lock:
+        opened = list(_opened.get(alias, {}).items())
+    ages = [now - at for connection, at in opened if not connection.closed]
+    return {
+        "count": len(ages),
+        "oldest_s": round(max(ages), 1) if ages else None,
+        "mean_s": round(sum(ages) / len(ages), 1) if ages else None,
+    }
+
+
+def snapshot(pools: dict | None = None) -> dict:
+    """Return this worker's stats for every pooled database alias."""
+    if pools is None:
+        pools = {
+            alias: connections[alias].pool
+            for alias in connections
+            if getattr(connections[alias], "pool", None) is not None
+        }
+    aliases = {}
+    for alias, pool in pools.items():
+        stats = pool.get_stats()
+        with _lock:
+            histogram = list(_waits.get(alias, [0] * (len(BUCKETS_MS) + 1)))
+            max_wait = _max_wait.get(alias, 0.0)
+        aliases[alias] = {
+            "size": stats.get("pool_size", 0),
+            "max": stats.get("pool_max", 0),
+            "idle": stats.get("pool_available", 0),
+            "in_use": stats.get("pool_size", 0) - stats.get("pool_available", 0),
+            "waiting": stats.get("requests_waiting", 0),
+            "requests": stats.get("requests_num", 0),
+            "errors": stats.get("requests_errors", 0),
+            "connections_lost": stats.get("connections_lost", 0),
+            "wait_histogram": histogram,
+            "wait_max_ms": round(max_wait, 1),
+            "connection_age": _connection_ages(alias),
+        }
+    return {"worker": worker_id(), "time": time.time(), "aliases": aliases}
+
+
+def publish(force: bool = False, pools: dict | None = None) -> None:
+    """Store this worker's snapshot in the cache, at most every few seconds."""
+    global _last_publish
+    now = time.monotonic()
+    if not force and now - _last_publish < PUBLISH_INTERVAL:
+        return
+    _last_publish = now
+
+    data = snapshot(pools)
+    if not data["aliases"]:
+        return
+    worker = data["worker"]
+    cache.set(f"dbpool:{worker}", data, SNAPSHOT_TTL)
+    workers = cache.get(INDEX_KEY) or []
+    if worker not in workers:
+        cache.set(INDEX_KEY, [*workers, worker][-200:], None)
+
+
+def _publish_on_request_finished(sender, **kwargs) -> None:
+    try:
+        publish()
+    except Exception:
+        logger.exception("Could not publish database pool stats")
+
+
+request_finished.connect(_publish_on_request_finished, dispatch_uid="onlydjango.db.pool.publish")
+
+
+def collect() -> list[dict]:
+    """Return the latest snapshot of every worker seen in the last minute."""
+    workers = cache.get(INDEX_KEY) or []
+    found = cache.get_many([f"dbpool:{worker}" for worker in workers])
+    live = [found[key] for key in sorted(found)]
+    if len(live) < len(workers):
+        cache.set(INDEX_KEY, [data["worker"] for data in live], None)
+    return live
+
+
+def aggregate(snapshots: list[dict]) -> dict:
+    """Sum worker snapshots per alias, with wait-time percentiles (ms)."""
+    totals: dict[str, dict] = {}
+    for data in snapshots:
+        for alias, stats in data["aliases"].items():
+            total = totals.setdefault(alias, {
+                "workers": 0, "size": 0, "max": 0, "idle": 0, "in_use": 0, "waiting": 0,
+                "requests": 0, "errors": 0, "wait_max_ms": 0.0,
+                "wait_histogram": [0] * (len(BUCKETS_MS) + 1), "oldest_connection_s": None,
+            })
+            total["workers"] += 1
+            for key in ("size", "max", "idle", "in_use", "waiting", "requests", "errors"):
+                total[key] += stats[key]
+            total["wait_max_ms"] = max(total["wait_max_ms"], stats["wait_max_ms"])
+            total["wait_histogram"] = [a + b for a, b in zip(total["wait_histogram"], stats["wait_histogram"])]
+            oldest = stats["connection_age"]["oldest_s"]
+            if oldest is not None:
+                total["oldest_connection_s"] = max(total["oldest_connection_s"] or 0, oldest)
+
+    for total in totals.values():
+        total["wait_ms"] = {q: _bound(percentile(total["wait_histogram"], q / 100)) for q in (50, 95, 99)}
+    return totals
+
+
+def _bound(value: float | None):
+    # JSON has no infinity: waits past the last bucket read ">60000".
+    return f">{BUCKETS_MS[-1]}" if value == float("inf") else value
@@ -0,0 +1,124 @@
+"""Query counting, SQL fingerprints and per-view query budgets.
+
+``count_queries()`` hooks every database connection with
+``connection.execute_wrapper`` and records how many queries ran, how long
+they took and how often each normalized statement repeated. The same
+statement running again and again within one request is the N+1 signature.
+
+Usage:
+    @query_budget(max_queries=10, max_duplicates=2)
+    def user_list(request):
+        ...
+
+``QueryBudgetMiddleware`` checks each request against its view's budget (or
+``settings.QUERY_BUDGET``); ``QueryBudgetMixin.assertQueryBudget`` does the
+same in tests.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+
+from django.db import connections
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize ``sql`` so statements differing only in values compare equal."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class QueryBudgetExceeded(Exception):
+    """Raised when a request runs more (or slower) queries than its budget."""
+
+
+class QueryCounter:
+    """``execute_wrapper`` callable collecting query counts and time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duplicates(self) -> int:
+        """Executions beyond the first of every repeated statement."""
+        return sum(count - 1 for count in self.fingerprints.values())
+
+    def repeated(self, limit: int = 3) -> list[tuple[str, int]]:
+        return [(sql, count) for sql, count in self.fingerprints.most_common(limit) if count > 1]
+
+
+@contextmanager
+def count_queries(using=None):
+    """Count queries on ``using`` (default: every configured database)."""
+    counter = QueryCounter()
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(counter))
+        yield counter
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    max_queries: int | None = None
+    max_duplicates: int | None = None
+    max_time_ms: float | None = None
+
+    def violations(self, counter: QueryCounter) -> list[str]:
+        problems = []
+        if self.max_queries is not None and counter.count > self.max_queries:
+            problems.append(f"{counter.count} queries (budget {self.max_queries})")
+        if self.max_duplicates is not None and counter.duplicates > self.max_duplicates:
+            repeated = "; ".join(f"{count}x {sql[:120]}" for sql, count in counter.repeated())
+            problems.append(
+                f"{counter.duplicates} repeated queries (budget {self.max_duplicates}), "
+                f"likely N+1: {repeated}"
+            )
+        if self.max_time_ms is not None and counter.seconds * 1000 > self.max_time_ms:
+            problems.append(f"{counter.seconds * 1000:.0f}ms in the database (budget {self.max_time_ms}ms)")
+        return problems
+
+
+def query_budget(max_queries: int | None = None, max_duplicates: int | None = None,
+                 max_time_ms: float | None = None):
+    """Set the query budget of a view function or class-based view."""
+    budget = QueryBudget(max_queries, max_duplicates, max_time_ms)
+
+    def decorator(view):
+        view.query_budget = budget
+        return view
+    return decorator
+
+
+class QueryBudgetMixin:
+    """TestCase mixin providing ``assertQueryBudget``."""
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries=None, max_duplicates=None, max_time_ms=None,
+                          using=None):
+        with count_queries(using) as counter:
+            yield counter
+        problems = QueryBudget(max_queries, max_duplicates, max_time_ms).violations(counter)
+        if problems:
+            self.fail("Query budget exceeded: " + "; ".join(problems))
@@ -0,0 +1,94 @@
+"""Slow query log kept in a bounded ring buffer per worker.
+
+The ``onlydjango.db.backends.postgresql`` engine runs every query through
+``record_slow``. Queries taking ``SLOW_QUERY_MS`` or longer (including ones
+cancelled by ``statement_timeout``) are logged and kept, with their duration,
+view name and the app frames of the stack, in the last ``SLOW_QUERY_BUFFER``
+entries of the worker. Each worker mirrors its buffer to the cache so
+``manage.py slow_queries`` can show all of them.
+"""
+
+import logging
+import time
+import traceback
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .pool import worker_id
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "slowq:workers"
+BUFFER_TTL = 7 * 24 * 3600
+MAX_SQL_LENGTH = 2000
+STACK_DEPTH = 8
+_SKIP_FRAMES = ("/django/", "/site-packages/", "/onlydjango/db/")
+
+current_view: ContextVar[str] = ContextVar("current_view", default="-")
+_buffer: deque = deque(maxlen=100)
+
+
+def _app_stack() -> list[str]:
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if not any(part in frame.filename for part in _SKIP_FRAMES)
+    ]
+    return [f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in frames[-STACK_DEPTH:]]
+
+
+def record_slow(execute, sql, params, many, context):
+    """``execute_wrapper`` recording queries above ``SLOW_QUERY_MS``."""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= getattr(settings, "SLOW_QUERY_MS", 500):
+            _record(sql, duration_ms, context["connection"].alias)
+
+
+def _record(sql: str, duration_ms: float, alias: str) -> None:
+    entry = {
+        "time": time.time(),
+        "duration_ms": round(duration_ms, 1),
+        "alias": alias,
+        "view": current_view.get(),
+        "sql": sql[:MAX_SQL_LENGTH],
+        "stack": _app_stack(),
+        "worker": worker_id(),
+    }
+    logger.warning("Slow query (%.0fms) in %s: %s", duration_ms, entry["view"], sql[:200])
+
+    size = getattr(settings, "SLOW_QUERY_BUFFER", 100)
+    global _buffer
+    if _buffer.maxlen != size:
+        _buffer = deque(_buffer, maxlen=size)
+    _buffer.append(entry)
+    try:
+        cache.set(f"slowq:{entry['worker']}", list(_buffer), BUFFER_TTL)
+        workers = cache.get(INDEX_KEY) or []
+        if entry["worker"] not in workers:
+            cache.set(INDEX_KEY, [*workers, entry["worker"]][-200:], BUFFER_TTL)
+    except Exception:
+        logger.exception("Could not store slow query")
+
+
+def collect(limit: int | None = None) -> list[dict]:
+    """Return recorded slow queries of all workers, newest first."""
+    workers = cache.get(INDEX_KEY) or []
+    buffers = cache.get_many([f"slowq:{worker}" for worker in workers])
+    entries = sorted(
+        (entry for buffer in buffers.values() for entry in buffer),
+        key=lambda entry: entry["time"],
+        reverse=True,
+    )
+    return entries[:limit] if limit else entries
+
+
+def clear() -> None:
+    workers = cache.get(INDEX_KEY) or []
+    cache.delete_many([f"slowq:{worker}" for worker in workers] + [INDEX_KEY])
+    _buffer.clear()
@@ -0,0 +1,72 @@
+"""Per-view PostgreSQL statement timeouts.
+
+Connections start with ``DB_STATEMENT_TIMEOUT_MS`` (see settings/prod.py).
+Views that legitimately run longer queries, or should give up sooner,
+override it:
+
+    @statement_timeout(120_000)
+    def export_users(request):
+        ...
+
+    with statement_timeout(2_000):
+        results = User.objects.search(query)
+
+Outside a transaction the timeout is set for the session and the previous
+value restored on exit, so pooled connections go back with their default.
+Inside a transaction it is ``SET LOCAL`` and lasts until the transaction
+ends. Other databases ignore it.
+
+``statement_timeout(0)`` lifts the limit: long management commands use it,
+and ``migrate`` lifts it for its whole run, so table rewrites and index
+builds aren't cancelled halfway through a deploy.
+"""
+
+from contextlib import ContextDecorator
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import pre_migrate
+from django.dispatch import receiver
+
+
+class statement_timeout(ContextDecorator):
+    def __init__(self, milliseconds: int, using: str = DEFAULT_DB_ALIAS):
+        self.milliseconds = int(milliseconds)
+        self.using = using
+        self._previous = []
+
+    def _recreate_cm(self):
+        # Each decorated call gets its own instance: concurrent requests
+        # must not share the stack of previous values.
+        return type(self)(self.milliseconds, self.using)
+
+    def __enter__(self):
+        connection = connections[self.using]
+        if connection.vendor != "postgresql":
+            self._previous.append(None)
+            return self
+        local = connection.in_atomic_block
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT current_setting('statement_timeout'), "
+                "set_config('statement_timeout', %s, %s)",
+                [str(self.milliseconds), local],
+            )
+            previous = cursor.fetchone()[0]
+        self._previous.append(None if local else previous)
+        return self
+
+    def __exit__(self, *exc_info):
+        previous = self._previous.pop()
+        if previous is not None:
+            with connections[self.using].cursor() as cursor:
+                cursor.execute("SELECT set_config('statement_timeout', %s, false)", [previous])
+        return False
+
+
+@receiver(pre_migrate, dispatch_uid="onlydjango.db.timeouts.no_timeout_for_migrate")
+def _no_timeout_for_migrate(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Lift the statement timeout for the rest of the ``migrate`` run."""
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SET statement_timeout = 0")
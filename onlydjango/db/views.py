@@ -0,0 +1,23 @@
+import secrets
+
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.views.decorators.cache import never_cache
+
+from . import pool
+
+
+def _has_token(request) -> bool:
+    token = getattr(settings, "DB_POOL_STATS_TOKEN", "")
+    sent = request.headers.get("X-Pool-Stats-Token", "")
+    return bool(token) and secrets.compare_digest(sent.encode(), token.encode())
+
+
+@never_cache
+def pool_stats(request):
+    """Aggregated database pool stats of all workers, for staff or monitors holding the token."""
+    staff = getattr(request, "user", None) and request.user.is_staff
+    if not (staff or _has_token(request)):
+        raise Http404
+    snapshots = pool.collect()
+    return JsonResponse({"aggregate": pool.aggregate(snapshots), "workers": snapshots})
@@ -1,38 +1,88 @@
 from django.conf import settings
+from django.core.checks import Error, Tags, register
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import lazy
+
+PROCESSOR = "onlydjango.helpers.onlydjango_globals.global_settings"
+
+# map of required setting names → context key names
+REQUIRED_SETTINGS = {
+    'SITE_NAME': 'site_name',
+    'SITE_AUTHOR': 'author',
+    'SITE_KEYWORDS': 'keywords',
+    'SITE_DESCRIPTION': 'description',
+    'OG_TYPE': 'og_type',
+    'OG_TITLE': 'og_title',
+    'OG_DESCRIPTION': 'og_description',
+    'OG_IMAGE': 'og_image',
+    'TWITTER_CARD': 'twitter_card',
+    'TWITTER_TITLE': 'twitter_title',
+    'TWITTER_DESCRIPTION': 'twitter_description',
+    'TWITTER_IMAGE': 'twitter_image',
+}
+
+_static_context: dict | None = None
+# Built once: lazy() creates a proxy class per call.
+_absolute_uri = lazy(lambda request: request.build_absolute_uri(), str)
+
+
+def _missing_settings() -> list[str]:
+    return [name for name in REQUIRED_SETTINGS if not hasattr(settings, name)]
+
+
+def _build_static_context() -> dict:
+    missing = _missing_settings()
+    if missing:
+        raise ImproperlyConfigured(
+            f"Missing setting `{missing[0]}` required by global_settings. "
+            f"Add, for example, in settings.py:\n"
+            f"    {missing[0]} = 'Your value here'"
+        )
+    return {key: getattr(settings, name) for name, key in REQUIRED_SETTINGS.items()}
+
 
 def global_settings(request):
     """
     Context processor to inject global variables for templates.
-    Raises ImproperlyConfigured if any required SITE_/OG_/TWITTER_ setting is missing.
+
+    The SITE_/OG_/TWITTER_ settings are read once per process (the
+    ``onlydjango.E001`` check reports missing ones at startup); only og_url
+    is per request, and it is built only if a template renders it.
     """
-    # map of required setting names → context key names
-    required = {
-        'SITE_NAME': 'site_name',
-        'SITE_AUTHOR': 'author',
-        'SITE_KEYWORDS': 'keywords',
-        'SITE_DESCRIPTION': 'description',
-        'OG_TYPE': 'og_type',
-        'OG_TITLE': 'og_title',
-        'OG_DESCRIPTION': 'og_description',
-        'OG_IMAGE': 'og_image',
-        'TWITTER_CARD': 'twitter_card',
-        'TWITTER_TITLE': 'twitter_title',
-        'TWITTER_DESCRIPTION': 'twitter_description',
-        'TWITTER_IMAGE': 'twitter_image',
-    }
-
-    context = {}
-    for setting_name, key in required.items():
-        if not hasattr(settings, setting_name):
-            raise ImproperlyConfigured(
-                f"Missing setting `{setting_name}` required by global_settings. "
-                f"Add, for example, in settings.py:\n"
-                f"    {setting_name} = 'Your value here'"
-            )
-        context[key] = getattr(settings, setting_name)
+    global _static_context
+    if _static_context is None:
+        _static_context = _build_static_context()
 
+    context = _static_context.copy()
     # OG URL comes from the request itself
-    context['og_url'] = request.build_absolute_uri()
-
+    context['og_url'] = _absolute_uri(request)
     return context
+
+
+@receiver(setting_changed)
+def _reset_static_context(setting, **kwargs):
+    global _static_context
+    if setting in REQUIRED_SETTINGS:
+        _static_context = None
+
+
+@register(Tags.templates)
+def check_global_settings(app_configs, **kwargs):
+    """Report SITE_/OG_/TWITTER_ settings missing for global_settings."""
+    processors = [
+        processor
+        for engine in settings.TEMPLATES
+        for processor in engine.get("OPTIONS", {}).get("context_processors", [])
+    ]
+    if PROCESSOR not in processors:
+        return []
+    return [
+        Error(
+            f"Missing setting `{name}` required by global_settings.",
+            hint=f"Add, for example, in settings.py: {name} = 'Your value here'",
+            id="onlydjango.E001",
+        )
+        for name in _missing_settings()
+    ]
@@ -0,0 +1,167 @@
+"""Keyset (cursor) pagination for large listings.
+
+Django's ``Paginator`` runs ``COUNT(*)`` and ``OFFSET n`` on every page, and
+both get slower as the table grows: page 1000 reads and throws away 20,000
+rows first. ``CursorPaginator`` instead remembers the ordering values of the
+last row it returned and asks for the rows after them, which an index on the
+ordering answers in the same time on every page.
+
+Usage:
+    class UserList(View):
+        def get(self, request):
+            page = paginate(request, User.objects.all(), per_page=20, ordering=("-date_joined",))
+            template = page_template(request, "users/list.html", "users/_rows.html")
+            return render(request, template, {"page": page})
+
+Render ``<c-load-more :page="page" />`` after the rows. With HTMX it fetches
+the next page and replaces itself with the returned rows (and the next
+button); without it, it is a plain link to ``?cursor=...``.
+
+The ordering should match an index and name the model's own non-null
+columns (no ``author__name``); the primary key is appended to break ties.
+Cursor values are written with each field's ``value_to_string`` and read
+back with ``to_python``, so dates, decimals and foreign keys round-trip.
+Cursors are signed, so clients can't craft them, and opaque, so the
+ordering can change without breaking URLs beyond an "invalid cursor" 404.
+"""
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.http import Http404, QueryDict
+from django.utils.functional import cached_property
+
+CURSOR_PARAM = "cursor"
+_SALT = "onlydjango.helpers.pagination"
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class CursorPage:
+    def __init__(self, object_list, paginator, cursor, next_values):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.cursor = cursor
+        self._next_values = next_values
+        self.query = None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return f"<CursorPage {len(self)} rows>"
+
+    def has_next(self) -> bool:
+        return self._next_values is not None
+
+    def has_previous(self) -> bool:
+        return self.cursor is not None
+
+    @cached_property
+    def next_cursor(self) -> str | None:
+        if self._next_values is None:
+            return None
+        return self.paginator.encode(self._next_values)
+
+    @property
+    def next_query(self) -> str:
+        """``?cursor=...`` for the next page, keeping the request's other parameters."""
+        query = self.query.copy() if self.query is not None else QueryDict(mutable=True)
+        query[CURSOR_PARAM] = self.next_cursor or ""
+        return f"?{query.urlencode()}"
+
+
+class CursorPaginator:
+    """Paginate ``queryset`` by ``ordering`` using opaque cursor tokens.
+
+    ``count`` is only queried when accessed, so a "load more" listing never
+    pays for ``COUNT(*)``.
+    """
+
+    def __init__(self, queryset, per_page: int, ordering=("pk",)):
+        self.per_page = int(per_page)
+        opts = queryset.model._meta
+        self.fields = []
+        for name in ordering:
+            descending = name.startswith("-")
+            field = self._field(opts, name.lstrip("-"))
+            if field not in (known for known, _ in self.fields):
+                self.fields.append((field, descending))
+        if opts.pk not in (known for known, _ in self.fields):
+            self.fields.append((opts.pk, self.fields[-1][1] if self.fields else False))
+        self.queryset = queryset.order_by(
+            *(f"-{field.name}" if descending else field.name for field, descending in self.fields)
+        )
+
+    @staticmethod
+    def _field(opts, name: str):
+        """The model column ``name`` orders by; cursors can't follow relations."""
+        try:
+            field = opts.pk if name == "pk" else opts.get_field(name)
+        except FieldDoesNotExist:
+            field = None
+        if field is None or not field.concrete or field.many_to_many:
+            raise ValueError(f"Cursor pagination can't order by {name!r}: use a column of {opts.label}")
+        return field
+
+    @cached_property
+    def count(self) -> int:
+        return self.queryset.count()
+
+    def values_of(self, obj) -> list[str]:
+        """``obj``'s ordering values, as stored in a cursor."""
+        return [field.value_to_string(obj) for field, _ in self.fields]
+
+    def encode(self, values: list) -> str:
+        return signing.dumps(values, salt=_SALT, compress=True)
+
+    def decode(self, cursor: str) -> list:
+        try:
+            raw = signing.loads(cursor, salt=_SALT)
+            if not isinstance(raw, list) or len(raw) != len(self.fields):
+                raise ValueError(cursor)
+            return [field.to_python(value) for (field, _), value in zip(self.fields, raw)]
+        except (signing.BadSignature, ValidationError, ValueError, TypeError) as exc:
+            raise InvalidCursor("Invalid cursor") from exc
+
+    def _after(self, values: list) -> Q:
+        # (a, b) after (x, y): a > x OR (a = x AND b > y), flipped for descending fields.
+        condition = Q()
+        for index, (field, descending) in enumerate(self.fields):
+            equal = {prior.name: value for (prior, _), value in zip(self.fields[:index], values)}
+            lookup = "lt" if descending else "gt"
+            condition |= Q(**equal, **{f"{field.name}__{lookup}": values[index]})
+        return condition
+
+    def page(self, cursor: str | None = None) -> CursorPage:
+        queryset = self.queryset
+        if cursor:
+            queryset = queryset.filter(self._after(self.decode(cursor)))
+        rows = list(queryset[:self.per_page + 1])
+        next_values = None
+        if len(rows) > self.per_page:
+            rows = rows[:self.per_page]
+            next_values = self.values_of(rows[-1])
+        return CursorPage(rows, self, cursor or None, next_values)
+
+
+def paginate(request, queryset, per_page: int = 20, ordering=("pk",)) -> CursorPage:
+    """Return the page for ``request``'s cursor, 404ing on invalid cursors."""
+    paginator = CursorPaginator(queryset, per_page, ordering)
+    try:
+        page = paginator.page(request.GET.get(CURSOR_PARAM))
+    except InvalidCursor:
+        raise Http404("Invalid cursor")
+    page.query = request.GET
+    return page
+
+
+def page_template(request, template: str, partial: str) -> str:
+    """Pick ``partial`` for HTMX "load more" requests and ``template`` otherwise."""
+    return partial if request.headers.get("HX-Request") == "true" else template
@@ -0,0 +1,50 @@
+"""Hash many passwords at once on a process pool.
+
+A single PBKDF2 or Argon2 hash takes tens to hundreds of milliseconds of CPU
+by design, so hashing is what bounds a bulk import. ``ParallelHasher``
+spreads ``make_password`` across processes. Workers are spawned rather than
+forked (a fork would copy open database connections) and set Django up
+themselves; this module imports no models so they can unpickle its functions
+before that.
+
+Usage:
+    with ParallelHasher(workers=8) as hasher:
+        hashes = hasher.hash_many(passwords)
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+
+
+def _init_worker() -> None:
+    django.setup()
+
+
+class ParallelHasher:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._pool = None
+
+    def __enter__(self):
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def hash_many(self, passwords: list[str]) -> list[str]:
+        """Return ``make_password(p)`` for each password, in order."""
+        if self._pool is None or len(passwords) < 2:
+            return [make_password(password) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._pool.map(make_password, passwords, chunksize=chunksize))
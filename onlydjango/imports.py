@@ -0,0 +1,76 @@
+"""Stream rows out of CSV or NDJSON files, the counterpart of ``exports``.
+
+Rows are read lazily as dicts, so files of any size can be validated and
+inserted batch by batch (``itertools.batched(read_rows(...), 1000)``).
+Gzipped files (``.gz``) are decompressed on the fly.
+
+Usage:
+    with open_input("users.ndjson.gz") as file:
+        for batch in batched(read_rows(file, detect_format("users.ndjson.gz")), 1000):
+            ...
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+from contextlib import contextmanager
+
+FORMATS = ("csv", "ndjson")
+
+
+class RowError(ValueError):
+    """A row that can't be parsed; carries its line number."""
+
+    def __init__(self, line: int, message: str):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+def detect_format(path: str, default: str = "csv") -> str:
+    """Guess the format from ``path``'s extension, ignoring ``.gz``."""
+    name = path.removesuffix(".gz").lower()
+    if name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+@contextmanager
+def open_input(path: str):
+    """Open ``path`` (``-`` for stdin) as text, decompressing ``.gz`` files."""
+    if path == "-":
+        yield sys.stdin
+    elif path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8", newline="") as file:
+            yield file
+    else:
+        with io.open(path, encoding="utf-8-sig", newline="") as file:
+            yield file
+
+
+def read_rows(file, format: str = "csv"):
+    """Yield each row of ``file`` as a dict.
+
+    Raises ``RowError`` for a row that isn't valid JSON (NDJSON) or a JSON
+    value that isn't an object.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format {format!r}. Choose from: {', '.join(FORMATS)}")
+    if format == "csv":
+        for row in csv.DictReader(file):
+            yield {key.strip(): (value or "").strip() for key, value in row.items() if key}
+        return
+
+    for line_number, line in enumerate(file, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise RowError(line_number, str(exc)) from exc
+        if not isinstance(row, dict):
+            raise RowError(line_number, "expected a JSON object")
+        yield row
@@ -0,0 +1,26 @@
+"""Bulk email sending over pooled SMTP connections.
+
+Usage:
+    from onlydjango.mail import send_bulk
+
+    messages = [EmailMessage(subject, body, to=[user.email]) for user in users]
+    sent = send_bulk(messages)
+
+With ``EMAIL_BACKEND = "onlydjango.mail.backends.PooledEmailBackend"`` every
+batch reuses the worker's open SMTP connection instead of reconnecting.
+"""
+
+from django.core.mail import get_connection
+
+from .backends import close_connections
+
+__all__ = ["close_connections", "send_bulk"]
+
+
+def send_bulk(messages, batch_size: int = 100, fail_silently: bool = False) -> int:
+    """Send ``messages`` over one connection in batches; return how many were sent."""
+    connection = get_connection(fail_silently=fail_silently)
+    sent = 0
+    for start in range(0, len(messages), batch_size):
+        sent += connection.send_messages(messages[start:start + batch_size])
+    return sent
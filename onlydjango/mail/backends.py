@@ -0,0 +1,127 @@
+"""SMTP backend that keeps one connection open per worker thread.
+
+Django's SMTP backend opens (and TLS-handshakes) a new connection for every
+``send_mail`` call. ``PooledEmailBackend`` parks the connection after each
+send and reuses it for the next one in the same thread, checking it with
+NOOP after ``EMAIL_POOL_MAX_IDLE`` seconds of idleness, replacing it after
+``EMAIL_POOL_MAX_MESSAGES`` messages, and reconnecting once when the server
+has dropped it mid-send.
+
+Settings:
+    EMAIL_BACKEND = "onlydjango.mail.backends.PooledEmailBackend"
+"""
+
+import atexit
+import smtplib
+import ssl
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail.backends.smtp import EmailBackend
+
+_local = threading.local()
+
+# Errors meaning the server closed the session; the message can be retried
+# on a fresh connection.
+DISCONNECTED = (smtplib.SMTPServerDisconnected, ConnectionError, ssl.SSLError)
+
+
+class _Pooled:
+    def __init__(self, connection):
+        self.connection = connection
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+def _pool() -> dict:
+    if not hasattr(_local, "pool"):
+        _local.pool = {}
+    return _local.pool
+
+
+def close_connections() -> None:
+    """Quit the pooled SMTP connections of the current thread."""
+    pool = _pool()
+    while pool:
+        _, pooled = pool.popitem()
+        try:
+            pooled.connection.quit()
+        except (smtplib.SMTPException, OSError):
+            pooled.connection.close()
+
+
+atexit.register(close_connections)
+
+
+class PooledEmailBackend(EmailBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_idle = getattr(settings, "EMAIL_POOL_MAX_IDLE", 30)
+        self.max_messages = getattr(settings, "EMAIL_POOL_MAX_MESSAGES", 500)
+        self.key = (self.host, self.port, self.username, self.use_tls, self.use_ssl)
+
+    def open(self):
+        """Attach the thread's pooled connection, opening one if needed.
+
+        Always reports an existing connection (False) so ``send_messages``
+        leaves it open for the next caller.
+        """
+        pooled = _pool().get(self.key)
+        if pooled is not None and self._usable(pooled):
+            self.connection = pooled.connection
+            return False
+        self._discard()
+
+        if super().open() is None:
+            return None
+        _pool()[self.key] = _Pooled(self.connection)
+        return False
+
+    def close(self):
+        """Detach from the pooled connection without quitting it."""
+        self.connection = None
+
+    def _usable(self, pooled: _Pooled) -> bool:
+        if pooled.sent >= self.max_messages:
+            return False
+        if time.monotonic() - pooled.last_used < self.max_idle:
+            return True
+        try:
+            return pooled.connection.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _discard(self) -> None:
+        pooled = _pool().pop(self.key, None)
+        self.connection = None
+        if pooled is not None:
+            try:
+                self._close_connection(pooled.connection)
+            except (smtplib.SMTPException, OSError):
+                pooled.connection.close()
+
+    def _send(self, email_message):
+        fail_silently, self.fail_silently = self.fail_silently, False
+        try:
+            sent = self._send_or_reconnect(email_message)
+        except smtplib.SMTPException:
+            if not fail_silently:
+                raise
+            sent = False
+        finally:
+            self.fail_silently = fail_silently
+
+        pooled = _pool().get(self.key)
+        if pooled is not None:
+            pooled.sent += 1
+            pooled.last_used = time.monotonic()
+        return sent
+
+    def _send_or_reconnect(self, email_message):
+        try:
+            return super()._send(email_message)
+        except DISCONNECTED:
+            self._discard()
+            self.open()
+            return super()._send(email_message)
@@ -0,0 +1,125 @@
+"""Batched, time-boxed maintenance steps run by ``daily_cleanup``.
+
+Apps register steps in a ``maintenance.py`` module. A step is a generator
+that does one bounded batch of work per iteration and yields how many rows
+(or files) it handled; the runner pauses between batches and stops once the
+wall-clock budget is spent, so no step holds locks for long.
+
+Usage (apps/<app>/maintenance.py):
+    from onlydjango.maintenance import delete_in_batches, step
+
+    @step("orders.abandoned_carts")
+    def abandoned_carts(batch_size):
+        yield from delete_in_batches(Cart.objects.filter(...), batch_size)
+
+Run them with ``python manage.py maintenance`` or the ``daily_cleanup`` task.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.utils.module_loading import autodiscover_modules
+
+from onlydjango.cache import dependencies
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+BUDGET_SECONDS = 600
+PAUSE_SECONDS = 0.05
+
+_steps: dict = {}
+
+
+def step(name: str):
+    """Register a maintenance step under ``name``."""
+    def decorator(func):
+        _steps[name] = func
+        return func
+    return decorator
+
+
+def get_steps() -> dict:
+    """Return registered steps, importing every app's ``maintenance`` module."""
+    autodiscover_modules("maintenance")
+    return dict(_steps)
+
+
+def delete_in_batches(queryset, batch_size: int = BATCH_SIZE):
+    """Delete ``queryset`` rows ``batch_size`` at a time, yielding rows deleted.
+
+    Each batch selects primary keys first and deletes them in its own short
+    transaction, so a cleanup never holds locks across the whole table.
+    """
+    model = queryset.model
+    while True:
+        pks = list(queryset.order_by().values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return
+        # One cache dependency bump per batch, not one per deleted row.
+        with transaction.atomic(using=queryset.db), dependencies.batch(queryset.db):
+            deleted, _ = model._base_manager.using(queryset.db).filter(pk__in=pks).delete()
+        yield deleted
+        if len(pks) < batch_size:
+            return
+
+
+@dataclass
+class StepReport:
+    name: str
+    rows: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    complete: bool = False
+    error: str = ""
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def run(names=None, budget: float = BUDGET_SECONDS, batch_size: int = BATCH_SIZE,
+        pause: float = PAUSE_SECONDS) -> list[StepReport]:
+    """Run maintenance steps in order until done or ``budget`` seconds pass.
+
+    Args:
+        names: Step names to run (default: all registered steps).
+        budget: Wall-clock seconds shared by all steps.
+        batch_size: Rows per batch passed to each step.
+        pause: Seconds to sleep between batches, letting other queries in.
+    """
+    steps = get_steps()
+    deadline = time.monotonic() + budget
+    reports = []
+    for name in names or steps:
+        report = StepReport(name)
+        reports.append(report)
+        if time.monotonic() >= deadline:
+            continue
+
+        started = time.monotonic()
+        batches = steps[name](batch_size)
+        try:
+            for rows in batches:
+                report.rows += rows
+                report.batches += 1
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(pause)
+            else:
+                report.complete = True
+        except Exception as exc:
+            logger.exception("Maintenance step %s failed", name)
+            report.error = str(exc)
+        finally:
+            batches.close()
+            report.seconds = time.monotonic() - started
+
+        logger.info(
+            "Maintenance step %s: %d rows in %.1fs (%.0f rows/s)%s",
+            name, report.rows, report.seconds, report.rows_per_second,
+            "" if report.complete else " - stopped early",
+        )
+    return reports
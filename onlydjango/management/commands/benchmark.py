@@ -0,0 +1,40 @@
+"""Run a named benchmark from ``onlydjango.benchmarks``.
+
+Usage:
+    python manage.py benchmark task_batching --size 20000
+
+Generated rows are rolled back unless --keep is passed.
+"""
+
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from onlydjango.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = "Run a named benchmark against the configured database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(BENCHMARKS), help="Benchmark to run")
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=10_000,
+            help="Number of rows to generate (default: 10000)",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep generated rows instead of rolling them back",
+        )
+
+    def handle(self, *args, **options):
+        module = import_module(BENCHMARKS[options["name"]])
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Benchmark: {options['name']}"))
+        with transaction.atomic():
+            module.run(options["size"], self.stdout.write)
+            if not options["keep"]:
+                transaction.set_rollback(True)
@@ -0,0 +1,63 @@
+"""Show layered cache hit rates across all web workers.
+
+Each worker publishes the hit/miss counters of its local (in-process) and
+remote (Redis) tiers at most every 10 seconds while serving requests. A low
+local hit rate with a high remote one means LOCAL_MAX_ENTRIES or
+LOCAL_TIMEOUT is too small for the hot set.
+
+Usage:
+    python manage.py cache_stats
+    python manage.py cache_stats --workers
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from onlydjango.cache import stats
+
+
+def _rate(value) -> str:
+    return "-" if value is None else f"{value:.1%}"
+
+
+class Command(BaseCommand):
+    help = "Show layered cache hit rates across all web workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", action="store_true", help="Also list each worker")
+        parser.add_argument("--json", action="store_true", help="Print raw JSON")
+
+    def handle(self, *args, **options):
+        snapshots = stats.collect()
+        totals = stats.aggregate(snapshots)
+        if options["json"]:
+            self.stdout.write(json.dumps({"aggregate": totals, "workers": snapshots}, indent=2))
+            return
+        if not totals:
+            self.stdout.write("No layered cache stats published in the last minute")
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Layered caches, {len(snapshots)} workers"))
+        self.stdout.write(
+            f"  {'channel':<32} {'local hits':>11} {'misses':>9} {'rate':>7}"
+            f" {'remote hits':>12} {'misses':>9} {'rate':>7} {'entries':>8}"
+        )
+        for channel, total in totals.items():
+            self.stdout.write(
+                f"  {channel:<32} {total['local_hits']:>11} {total['local_misses']:>9}"
+                f" {_rate(total['local_hit_rate']):>7} {total['remote_hits']:>12}"
+                f" {total['remote_misses']:>9} {_rate(total['remote_hit_rate']):>7}"
+                f" {total['local_entries']:>8}"
+            )
+
+        if options["workers"]:
+            self.stdout.write(self.style.MIGRATE_HEADING("Workers"))
+            for data in snapshots:
+                for channel, counters in data["channels"].items():
+                    self.stdout.write(
+                        f"  {data['worker']:<30} {channel:<32}"
+                        f" local {counters['local_hits']}/{counters['local_misses']}"
+                        f"  remote {counters['remote_hits']}/{counters['remote_misses']}"
+                        f"  entries {counters['local_entries']}"
+                    )
@@ -0,0 +1,62 @@
+"""Show database connection pool stats across all web workers.
+
+Each worker publishes its pool stats (in use, idle, waiting, checkout wait
+histogram, connection age) at most every 10 seconds while serving requests.
+High waits with every connection in use mean the pool (DB_POOL_MAX_SIZE) or
+the database's max_connections is too small for the load.
+
+Usage:
+    python manage.py db_pool_stats
+    python manage.py db_pool_stats --workers
+"""
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from onlydjango.db import pool
+
+
+def _ms(value) -> str:
+    return "-" if value is None else str(value)
+
+
+class Command(BaseCommand):
+    help = "Show database connection pool stats across all web workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", action="store_true", help="Also list each worker")
+        parser.add_argument("--json", action="store_true", help="Print raw JSON")
+
+    def handle(self, *args, **options):
+        snapshots = pool.collect()
+        totals = pool.aggregate(snapshots)
+        if options["json"]:
+            self.stdout.write(json.dumps({"aggregate": totals, "workers": snapshots}, indent=2))
+            return
+        if not totals:
+            self.stdout.write("No pool stats published in the last minute")
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Connection pools, {len(snapshots)} workers"))
+        self.stdout.write(
+            f"  {'alias':<12} {'in use':>7} {'idle':>6} {'max':>6} {'waiting':>8}"
+            f" {'wait p50':>9} {'p95':>9} {'p99':>9} {'max ms':>9} {'oldest s':>9}"
+        )
+        for alias, total in totals.items():
+            wait = total["wait_ms"]
+            self.stdout.write(
+                f"  {alias:<12} {total['in_use']:>7} {total['idle']:>6} {total['max']:>6}"
+                f" {total['waiting']:>8} {_ms(wait[50]):>9} {_ms(wait[95]):>9}"
+                f" {_ms(wait[99]):>9} {total['wait_max_ms']:>9} {_ms(total['oldest_connection_s']):>9}"
+            )
+
+        if options["workers"]:
+            self.stdout.write(self.style.MIGRATE_HEADING("Workers"))
+            for data in snapshots:
+                for alias, stats in data["aliases"].items():
+                    self.stdout.write(
+                        f"  {data['worker']:<30} {alias:<12} in use {stats['in_use']:>4}"
+                        f"  idle {stats['idle']:>4}  waiting {stats['waiting']:>4}"
+                        f"  max wait {stats['wait_max_ms']}ms"
+                    )
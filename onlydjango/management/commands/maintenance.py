@@ -0,0 +1,66 @@
+"""Run registered maintenance steps (what ``daily_cleanup`` runs nightly).
+
+Prints rows handled and rows/sec per step. Steps stop at the time budget
+and resume from where they left off on the next run.
+
+Usage:
+    python manage.py maintenance
+    python manage.py maintenance --list
+    python manage.py maintenance --step sessions.expired --budget 60
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from onlydjango import maintenance
+from onlydjango.db.timeouts import statement_timeout
+
+
+class Command(BaseCommand):
+    help = "Run registered maintenance steps in batches within a time budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--step",
+            action="append",
+            dest="steps",
+            help="Step to run; repeat for several (default: all)",
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=maintenance.BUDGET_SECONDS,
+            help=f"Wall-clock seconds for all steps (default: {maintenance.BUDGET_SECONDS})",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=maintenance.BATCH_SIZE,
+            help=f"Rows per delete statement (default: {maintenance.BATCH_SIZE})",
+        )
+        parser.add_argument("--list", action="store_true", help="List registered steps and exit")
+
+    # Manual runs may be given budgets longer than the request timeout.
+    @statement_timeout(0)
+    def handle(self, *args, **options):
+        steps = maintenance.get_steps()
+        if options["list"]:
+            for name, func in steps.items():
+                self.stdout.write(f"  {name:<40} {(func.__doc__ or '').strip()}")
+            return
+
+        unknown = set(options["steps"] or []) - set(steps)
+        if unknown:
+            raise CommandError(f"Unknown steps: {', '.join(sorted(unknown))}")
+
+        reports = maintenance.run(
+            options["steps"], budget=options["budget"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(self.style.MIGRATE_HEADING("Maintenance"))
+        self.stdout.write(f"  {'step':<40} {'rows':>10} {'rows/s':>10} {'seconds':>8}  status")
+        for report in reports:
+            status = report.error or ("done" if report.complete else "stopped at budget")
+            self.stdout.write(
+                f"  {report.name:<40} {report.rows:>10} {report.rows_per_second:>10,.0f}"
+                f" {report.seconds:>8.1f}  {status}"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Removed {sum(r.rows for r in reports)} items"))
@@ -0,0 +1,46 @@
+"""Show the slow query log of all workers, newest first.
+
+Queries slower than SLOW_QUERY_MS are kept per worker in a ring buffer of
+SLOW_QUERY_BUFFER entries, with the view that ran them and the app stack.
+
+Usage:
+    python manage.py slow_queries
+    python manage.py slow_queries --limit 50 --stack
+    python manage.py slow_queries --clear
+"""
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from onlydjango.db import slow_queries
+
+
+class Command(BaseCommand):
+    help = "Show the slow query log of all workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Entries to show (default: 20)")
+        parser.add_argument("--stack", action="store_true", help="Show the app stack of each query")
+        parser.add_argument("--clear", action="store_true", help="Empty the log")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            slow_queries.clear()
+            self.stdout.write(self.style.SUCCESS("Slow query log cleared"))
+            return
+
+        entries = slow_queries.collect(options["limit"])
+        if not entries:
+            self.stdout.write("No slow queries recorded")
+            return
+
+        for entry in entries:
+            when = datetime.fromtimestamp(entry["time"]).strftime("%Y-%m-%d %H:%M:%S")
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{when}  {entry['duration_ms']:,.0f}ms  {entry['view']}  [{entry['alias']}, {entry['worker']}]"
+            ))
+            self.stdout.write(f"  {entry['sql']}")
+            if options["stack"]:
+                for frame in entry["stack"]:
+                    self.stdout.write(f"    {frame}")
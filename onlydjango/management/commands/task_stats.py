@@ -0,0 +1,73 @@
+"""Show per-task queue statistics.
+
+Prints throughput, outcomes and p50/p95/p99 queue wait and run time per task
+over a rolling window, plus suppressed duplicate enqueues. Use it to size
+``run_huey`` worker counts: high wait with low run time means too few workers.
+
+Usage:
+    python manage.py task_stats
+    python manage.py task_stats --minutes 15
+"""
+
+from django.core.management.base import BaseCommand
+
+from onlydjango.tasks import get_huey, suppressed_counts, task_metrics
+from onlydjango.tasks.metrics import WINDOW_MINUTES
+
+
+def _ms(value: float | None) -> str:
+    if value is None:
+        return "-"
+    if value == float("inf"):
+        return f">{60_000}"
+    return f"<={value:,.0f}"
+
+
+class Command(BaseCommand):
+    help = "Show per-task queue statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--minutes",
+            type=int,
+            default=WINDOW_MINUTES,
+            help=f"Rolling window in minutes (default: {WINDOW_MINUTES})",
+        )
+
+    def handle(self, *args, **options):
+        huey = get_huey()
+        self.stdout.write(f"Pending: {huey.pending_count()}  Scheduled: {huey.scheduled_count()}")
+        self.show_metrics(huey, min(options["minutes"], WINDOW_MINUTES))
+        self.show_suppressed(huey)
+
+    def show_metrics(self, huey, minutes: int) -> None:
+        metrics = task_metrics(huey, minutes)
+        if not metrics:
+            self.stdout.write(f"No task runs recorded in the last {minutes} minutes")
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Task runs, last {minutes} minutes (ms)"))
+        self.stdout.write(
+            f"  {'task':<30} {'runs':>7} {'/min':>7} {'err':>5} {'retry':>5} {'thr':>5}"
+            f" {'wait p50':>9} {'p95':>9} {'p99':>9} {'run p50':>9} {'p95':>9} {'p99':>9}"
+        )
+        for name, stats in metrics.items():
+            outcomes = stats["outcomes"]
+            wait, run = stats["wait"], stats["run"]
+            self.stdout.write(
+                f"  {name:<30} {stats['runs']:>7} {stats['per_minute']:>7.1f}"
+                f" {outcomes.get('error', 0):>5} {outcomes.get('retry', 0):>5}"
+                f" {outcomes.get('throttled', 0):>5}"
+                f" {_ms(wait[50]):>9} {_ms(wait[95]):>9} {_ms(wait[99]):>9}"
+                f" {_ms(run[50]):>9} {_ms(run[95]):>9} {_ms(run[99]):>9}"
+            )
+
+    def show_suppressed(self, huey) -> None:
+        counts = suppressed_counts(huey)
+        if not counts:
+            self.stdout.write("No suppressed duplicate enqueues recorded")
+            return
+
+        self.stdout.write(self.style.MIGRATE_HEADING("Suppressed duplicate enqueues"))
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f"  {name:<40} {count:>10}")
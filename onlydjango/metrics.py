@@ -0,0 +1,25 @@
+"""Latency histogram helpers shared by task metrics and database pool stats."""
+
+import bisect
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is unbounded.
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1_000, 2_000, 5_000, 10_000, 30_000, 60_000)
+
+
+def bucket(ms: float) -> int:
+    """Return the histogram index for a duration in milliseconds."""
+    return bisect.bisect_left(BUCKETS_MS, ms)
+
+
+def percentile(histogram: list[int], q: float) -> float | None:
+    """Return the bucket upper bound (ms) holding the ``q`` quantile."""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= rank:
+            return BUCKETS_MS[index] if index < len(BUCKETS_MS) else float("inf")
+    return float("inf")
@@ -59,20 +59,42 @@ INSTALLED_APPS = DJANGO_APPS + ALL_AUTH_APPS + THIRD_PARTY_APPS + FIRST_PARTY_AP
 SITE_ID = 1
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "onlydjango.db.middleware.QueryBudgetMiddleware",
+    "onlydjango.db.middleware.SlowQueryMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "onlydjango.cache.middleware.ResponseCacheMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "allauth.account.middleware.AccountMiddleware",
     "django_browser_reload.middleware.BrowserReloadMiddleware",
 ]
 
+# Per-request query budget; views override it with @query_budget
+# (onlydjango.db.queries). Actions: "log", "header" and/or "raise".
+QUERY_BUDGET = {"max_queries": 50, "max_duplicates": 10}
+QUERY_BUDGET_ACTIONS = ["log"]
+
+# Default lifetime of responses cached with @cache_response
+# (onlydjango.cache.responses); dependencies invalidate them earlier.
+RESPONSE_CACHE_TIMEOUT = 600
+
+# Models whose writes bump cache dependencies even in processes that never
+# import the views caching them (workers, commands). Views' own
+# cache_dependencies are tracked when they are defined.
+CACHE_DEPENDENCY_MODELS = ["core.User"]
+
+# Queries at least this slow are logged and kept for manage.py slow_queries
+# (PostgreSQL engine onlydjango.db.backends.postgresql)
+SLOW_QUERY_MS = 500
+SLOW_QUERY_BUFFER = 100
+
 AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
-    "allauth.account.auth_backends.AuthenticationBackend",
+    "apps.core.backends.EmailAuthenticationBackend",
 ]
 
 INTERNAL_IPS = ["127.0.0.1"]
@@ -166,6 +188,16 @@ STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [PROJECT_DIR / "static"]
 
+# =============================================================================
+# BACKGROUND TASKS (from constants)
+# =============================================================================
+# "inline" runs tasks immediately, "threaded" runs them on an in-process
+# thread pool, "huey" queues them to Redis for run_huey workers.
+TASKS_MODE = env.TASKS_MODE
+TASKS_THREADS = env.TASKS_THREADS
+TASKS_QUEUE_DEPTH = env.TASKS_QUEUE_DEPTH
+TASKS_PERIODIC = env.TASKS_PERIODIC
+
 # =============================================================================
 # SITE INFO (from constants)
 # =============================================================================
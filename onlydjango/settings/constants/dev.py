@@ -25,6 +25,13 @@ DB_POOL_TIMEOUT = 10
 # =============================================================================
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
 
+# Background tasks: "inline", "threaded" or "huey"
+TASKS_MODE = os.environ.get("TASKS_MODE", "inline")
+TASKS_THREADS = int(os.environ.get("TASKS_THREADS", "4"))
+TASKS_QUEUE_DEPTH = int(os.environ.get("TASKS_QUEUE_DEPTH", "1000"))
+# Threaded mode: set in exactly one process, which runs the periodic tasks.
+TASKS_PERIODIC = os.environ.get("TASKS_PERIODIC", "true").lower() == "true"
+
 # =============================================================================
 # DJANGO CORE
 # =============================================================================
@@ -19,11 +19,35 @@ PGPORT = os.environ["PGPORT"]
 DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "5"))
 DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "100"))
 DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", "500"))
+# Log a warning when a request waits longer than this for a pooled connection
+DB_POOL_WAIT_WARNING_MS = int(os.environ.get("DB_POOL_WAIT_WARNING_MS", "1000"))
+# Shared token for /__dbpool__/ monitoring (X-Pool-Stats-Token header); empty disables
+DB_POOL_STATS_TOKEN = os.environ.get("DB_POOL_STATS_TOKEN", "")
+# Server-side limits per connection (0 disables); views can override the
+# statement timeout with onlydjango.db.timeouts.statement_timeout
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "30000"))
+DB_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(os.environ.get("DB_IDLE_IN_TRANSACTION_TIMEOUT_MS", "60000"))
+
+# Read replicas: comma-separated postgres:// URLs; reads fall back to the
+# primary when a replica lags more than DB_REPLICA_MAX_LAG seconds
+DB_REPLICA_URLS = [url for url in os.environ.get("DB_REPLICA_URLS", "").split(",") if url]
+DB_REPLICA_MAX_LAG = float(os.environ.get("DB_REPLICA_MAX_LAG", "5"))
 
 # =============================================================================
 # REDIS (Railway private network)
 # =============================================================================
 REDIS_URL = os.environ["REDIS_URL"]
+# Per-worker in-process cache tier in front of Redis (entries, seconds)
+CACHE_LOCAL_MAX_ENTRIES = int(os.environ.get("CACHE_LOCAL_MAX_ENTRIES", "2000"))
+CACHE_LOCAL_TIMEOUT = int(os.environ.get("CACHE_LOCAL_TIMEOUT", "30"))
+
+# Background tasks: "inline", "threaded" or "huey"
+TASKS_MODE = os.environ.get("TASKS_MODE", "huey")
+TASKS_THREADS = int(os.environ.get("TASKS_THREADS", "4"))
+TASKS_QUEUE_DEPTH = int(os.environ.get("TASKS_QUEUE_DEPTH", "1000"))
+# Threaded mode: set in exactly one process, which runs the periodic tasks.
+TASKS_PERIODIC = os.environ.get("TASKS_PERIODIC", "false").lower() == "true"
+TASKS_RESULT_TTL = int(os.environ.get("TASKS_RESULT_TTL", "86400"))
 
 # =============================================================================
 # DJANGO CORE
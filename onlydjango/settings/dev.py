@@ -12,6 +12,9 @@ SECRET_KEY = env.SECRET_KEY
 ALLOWED_HOSTS = env.ALLOWED_HOSTS
 CSRF_TRUSTED_ORIGINS = ["https://onlydjango.com", "https://www.onlydjango.com"]
 
+# Query counts in response headers (X-DB-Queries, ...) while developing
+QUERY_BUDGET_ACTIONS = ["log", "header"]
+
 # =============================================================================
 # STORAGE
 # =============================================================================
@@ -1,9 +1,8 @@
 """Production settings."""
 
-from huey import PriorityRedisHuey
-
 from .base import *
 from .constants import prod as env
+from onlydjango.db.replicas import replica_database
 from onlydjango.helpers.host_utils import normalize_host
 
 # =============================================================================
@@ -29,7 +28,8 @@ ACCOUNT_DEFAULT_HTTP_PROTOCOL = "https"
 # =============================================================================
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        # Django's PostgreSQL backend plus pool stats (manage.py db_pool_stats)
+        "ENGINE": "onlydjango.db.backends.postgresql",
         "NAME": env.PGDATABASE,
         "USER": env.PGUSER,
         "PASSWORD": env.PGPASSWORD,
@@ -40,19 +40,47 @@ DATABASES = {
                 "min_size": env.DB_POOL_MIN_SIZE,
                 "max_size": env.DB_POOL_MAX_SIZE,
                 "timeout": env.DB_POOL_TIMEOUT,
-            }
+            },
+            # Bound runaway queries and abandoned transactions server-side
+            "options": (
+                f"-c statement_timeout={env.DB_STATEMENT_TIMEOUT_MS}"
+                f" -c idle_in_transaction_session_timeout={env.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS}"
+            ),
         },
     }
 }
 
+DB_POOL_WAIT_WARNING_MS = env.DB_POOL_WAIT_WARNING_MS
+DB_POOL_STATS_TOKEN = env.DB_POOL_STATS_TOKEN
+
+# Read replicas: reads go to a replica under the lag threshold, writes and
+# everything after a write in the same request go to the primary
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.DB_REPLICA_URLS, start=1):
+    DATABASES[f"replica{index}"] = replica_database(DATABASES["default"], url)
+    DATABASE_REPLICAS.append(f"replica{index}")
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["onlydjango.db.replicas.ReplicaRouter"]
+    MIDDLEWARE = ["onlydjango.db.middleware.ReplicaPinningMiddleware", *MIDDLEWARE]
+REPLICA_MAX_LAG = env.DB_REPLICA_MAX_LAG
+REPLICA_PIN_SECONDS = 15
+
 # =============================================================================
 # CACHE
 # =============================================================================
 CACHES = {
     "default": {
-        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        # Hot keys are served from each worker's memory; writes evict them
+        # everywhere over Redis pub/sub (see onlydjango.cache.layered)
+        "BACKEND": "onlydjango.cache.layered.LayeredCache",
         "LOCATION": [env.REDIS_URL],
         "KEY_PREFIX": env.SITE_NAME,
+        "OPTIONS": {
+            "REMOTE_BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCAL_MAX_ENTRIES": env.CACHE_LOCAL_MAX_ENTRIES,
+            "LOCAL_TIMEOUT": env.CACHE_LOCAL_TIMEOUT,
+        },
     }
 }
 
@@ -61,12 +89,16 @@ CACHES = {
 # =============================================================================
 ADMINS = [("Admin", env.ADMIN_EMAIL)]
 
-EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+# Keeps one SMTP connection open per worker thread instead of one per email
+EMAIL_BACKEND = "onlydjango.mail.backends.PooledEmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
 EMAIL_HOST_USER = env.EMAIL_HOST_USER
 EMAIL_HOST_PASSWORD = env.EMAIL_HOST_PASSWORD
+EMAIL_TIMEOUT = 30
+EMAIL_POOL_MAX_IDLE = 30  # seconds idle before a NOOP check on reuse
+EMAIL_POOL_MAX_MESSAGES = 500  # messages before reconnecting
 
 # =============================================================================
 # LOGGING
@@ -100,5 +132,14 @@ LOGGING = {
 # =============================================================================
 # HUEY (Background Tasks)
 # =============================================================================
-HUEY = PriorityRedisHuey("huey", url=env.REDIS_URL)
-HUEY.periodic_task_check_frequency = 1
+# Results expire (per task via @task(result_ttl=...)) and plain values are
+# stored compactly; see onlydjango.tasks.results. Dict form because settings
+# cannot import the tasks package.
+HUEY = {
+    "huey_class": "onlydjango.tasks.results.ResultHuey",
+    "name": "huey",
+    "immediate": False,
+    "url": env.REDIS_URL,
+    "expire_time": env.TASKS_RESULT_TTL,
+    "periodic_task_check_frequency": 1,
+}
@@ -8,6 +8,8 @@ Or set in pyproject.toml:
     DJANGO_SETTINGS_MODULE = "onlydjango.settings.tests"
 """
 
+from huey import MemoryHuey
+
 from .base import *
 
 DEBUG = False
@@ -20,7 +22,12 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
-    }
+    },
+    # Stand-in read replica for router tests (only tests that list it use it)
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+    },
 }
 
 # =============================================================================
@@ -65,14 +72,19 @@ INSTALLED_APPS = [app for app in INSTALLED_APPS if app != "debug_toolbar"]
 # MIDDLEWARE - Remove unnecessary middleware for tests
 # =============================================================================
 MIDDLEWARE = [
+    "onlydjango.db.middleware.QueryBudgetMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "onlydjango.cache.middleware.ResponseCacheMiddleware",
     "allauth.account.middleware.AccountMiddleware",
 ]
 
+# Views over their query budget fail the test
+QUERY_BUDGET_ACTIONS = ["raise"]
+
 # =============================================================================
 # LOGGING - Disable logging during tests
 # =============================================================================
@@ -99,4 +111,5 @@ for template in TEMPLATES:
 # =============================================================================
 # CELERY/HUEY - Run tasks synchronously
 # =============================================================================
-HUEY = None  # Disable Huey in tests
+TASKS_MODE = "inline"
+HUEY = MemoryHuey("tests", immediate=True)
@@ -0,0 +1,57 @@
+"""Task infrastructure shared by every app's ``tasks.py``.
+
+Usage:
+    from onlydjango.tasks import task, periodic_task
+
+    @task()
+    def rebuild_thumbnails(image_id: int) -> None:
+        ...
+
+    @task(batch=500)
+    def send_digest(calls: list[dict]) -> None:
+        user_ids = [call["user_id"] for call in calls]
+        ...
+
+    @task(dedup=True)
+    def reindex_user(user_id: int) -> None:
+        ...  # identical calls still pending are dropped
+
+    @task(on_commit=True)
+    def index_order(order_id: int) -> None:
+        ...  # enqueued only once the caller's transaction commits
+
+    @task(rate=5, max_concurrency=2)
+    def sync_to_crm(user_id: int) -> None:
+        ...  # at most 5 runs/s and 2 at a time, over-limit runs rescheduled
+
+    @task(result_ttl=600)
+    def score_user(user_id: int) -> dict:
+        ...  # read back with get_results(huey, [result, ...]) within 10 minutes
+
+``settings.TASKS_MODE`` picks where tasks run: "inline" (immediately, the
+dev default), "threaded" (in-process thread pool, no Redis needed) or "huey"
+(queued to Redis and processed by Huey workers, the production default).
+"""
+
+from .batching import BatchedTask, flush_batches
+from .dedup import suppressed_counts
+from .decorators import get_huey, periodic_task, task
+from .metrics import task_metrics
+from .pipeline import enqueue_many
+from .ratelimit import Throttled
+from .results import get_results
+from .threaded import ThreadedHuey
+
+__all__ = [
+    "BatchedTask",
+    "enqueue_many",
+    "flush_batches",
+    "get_huey",
+    "get_results",
+    "periodic_task",
+    "suppressed_counts",
+    "task",
+    "task_metrics",
+    "ThreadedHuey",
+    "Throttled",
+]
@@ -0,0 +1,83 @@
+"""Coalesce task calls into batched messages.
+
+A batched task buffers each call's keyword arguments and enqueues one message
+per ``size`` calls. Buffers are flushed when full, when the oldest buffered
+call is older than ``window`` seconds, at the end of every request, after each
+Huey task execution and at interpreter exit.
+"""
+
+import atexit
+import threading
+import time
+import weakref
+
+from django.core.signals import request_finished
+
+from .pipeline import enqueue_many
+from .proxy import TaskProxy
+
+_batched_tasks: weakref.WeakSet = weakref.WeakSet()
+
+
+class BatchedTask(TaskProxy):
+    """Wrap a Huey task so calls are buffered and sent as lists."""
+
+    def __init__(self, wrapper, size: int, window: float = 1.0):
+        super().__init__(wrapper)
+        self.size = size
+        self.window = window
+        self._calls: list[dict] = []
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+        _batched_tasks.add(self)
+        self.huey.post_execute(name="flush_batches")(_flush_after_task)
+
+    def prepare(self, args: tuple, kwargs: dict) -> None:
+        if args:
+            raise TypeError(f"{self.__name__}() is batched and only takes keyword arguments")
+        with self._lock:
+            if not self._calls:
+                self._opened_at = time.monotonic()
+            self._calls.append(kwargs)
+            due = (
+                len(self._calls) >= self.size
+                or time.monotonic() - self._opened_at >= self.window
+            )
+        if due:
+            self.flush()
+        return None
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered calls not yet enqueued."""
+        return len(self._calls)
+
+    def call_local(self, calls: list[dict]):
+        """Run the task body directly with a list of calls."""
+        return self.wrapper.call_local(calls)
+
+    def flush(self) -> int:
+        """Enqueue buffered calls. Returns the number of messages sent."""
+        with self._lock:
+            calls, self._calls = self._calls, []
+        if not calls:
+            return 0
+        tasks = [
+            self.wrapper.s(calls[i:i + self.size])
+            for i in range(0, len(calls), self.size)
+        ]
+        enqueue_many(self.huey, tasks)
+        return len(tasks)
+
+
+def flush_batches(**kwargs) -> int:
+    """Flush every batched task. Returns the number of messages sent."""
+    return sum(batched.flush() for batched in list(_batched_tasks))
+
+
+def _flush_after_task(task, task_value, exception) -> None:
+    flush_batches()
+
+
+request_finished.connect(flush_batches, dispatch_uid="onlydjango.tasks.flush_batches")
+atexit.register(flush_batches)
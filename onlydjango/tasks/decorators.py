@@ -0,0 +1,138 @@
+"""Task decorators that follow ``settings.TASKS_MODE``.
+
+- ``"inline"``: tasks run immediately (synchronously) on an in-memory Huey.
+- ``"threaded"``: tasks run on an in-process thread pool (``ThreadedHuey``)
+  sized by ``TASKS_THREADS`` and ``TASKS_QUEUE_DEPTH``. Periodic tasks run
+  only in the process started with ``TASKS_PERIODIC``.
+- ``"huey"``: tasks are queued to Redis via ``settings.HUEY`` and processed
+  by ``run_huey`` workers.
+
+When ``TASKS_MODE`` is unset, DEBUG runs inline and production uses Huey.
+"""
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from huey import MemoryHuey
+
+from onlydjango.db.replicas import install_task_scope
+
+from . import metrics
+from .batching import BatchedTask
+from .dedup import DedupTask, Deduplicator
+from .deferred import OnCommitTask
+from .ratelimit import RateLimiter
+from .results import discard_result as discard
+from .threaded import ThreadedHuey
+
+_local_hueys: dict[str, MemoryHuey] = {}
+
+
+def get_huey():
+    """Return the Huey instance tasks are registered on."""
+    mode = getattr(settings, "TASKS_MODE", "inline" if settings.DEBUG else "huey")
+    if mode == "huey":
+        from huey.contrib.djhuey import HUEY
+
+        return HUEY
+
+    if mode not in _local_hueys:
+        if mode == "inline":
+            _local_hueys[mode] = MemoryHuey("inline", immediate=True)
+        elif mode == "threaded":
+            _local_hueys[mode] = ThreadedHuey(
+                "threaded",
+                workers=getattr(settings, "TASKS_THREADS", 4),
+                queue_depth=getattr(settings, "TASKS_QUEUE_DEPTH", 1000),
+                periodic=getattr(settings, "TASKS_PERIODIC", False),
+            )
+        else:
+            raise ImproperlyConfigured(
+                f"TASKS_MODE must be 'inline', 'threaded' or 'huey', not {mode!r}"
+            )
+    return _local_hueys[mode]
+
+
+def _close_db(func):
+    # Imported lazily: djhuey reads settings.HUEY on import, and that setting
+    # may name a Huey class from this package (see .results).
+    from huey.contrib.djhuey import close_db
+
+    return close_db(func)
+
+
+def task(batch: int | None = None, batch_window: float = 1.0, dedup=False,
+         dedup_ttl: int = 3600, on_commit: bool = False, rate: float | None = None,
+         burst: float | None = None, max_concurrency: int | None = None,
+         result_ttl: int | None = None, discard_result: bool = False, **options):
+    """Register a task.
+
+    Args:
+        batch: Coalesce calls into messages of up to this many calls. The task
+            body then receives a list of each call's keyword arguments.
+        batch_window: Seconds a partial batch may wait before it is flushed.
+        dedup: ``True`` to suppress calls identical to one still pending, or a
+            callable returning the dedup key from the task's arguments.
+        dedup_ttl: Seconds a pending call's key is held at most.
+        on_commit: Hold calls made inside a transaction until it commits,
+            then enqueue them together; a rollback enqueues nothing.
+        rate: Runs allowed per second across all workers; runs over the
+            limit are rescheduled with backoff. Not enforced inline.
+        burst: Runs allowed back to back before ``rate`` applies.
+        max_concurrency: Runs allowed at the same time across all workers.
+        result_ttl: Seconds the task's result is kept (``ResultHuey`` only;
+            defaults to its ``expire_time``).
+        discard_result: Store no result at all; ``call_local`` still returns it.
+        **options: Passed through to ``huey.task`` (retries, priority, ...).
+    """
+    def decorator(func):
+        huey = get_huey()
+        body = _close_db(func)
+        if discard_result:
+            body = discard(body)
+        deduplicator = None
+        if dedup:
+            deduplicator = Deduplicator(
+                huey, func, key=dedup, ttl=dedup_ttl,
+                name=options.get("name"), batched=bool(batch),
+            )
+            body = deduplicator.release_on_run(body)
+        if rate or max_concurrency:
+            limiter = RateLimiter(
+                huey, options.get("name") or func.__name__,
+                rate=rate, burst=burst, max_concurrency=max_concurrency,
+            )
+            body = limiter.guard(body)
+
+        metrics.install(huey)
+        install_task_scope(huey)
+        options.setdefault("create_id", metrics.timed_task_id)
+        if result_ttl:
+            options["result_ttl"] = result_ttl
+        wrapper = huey.task(**options)(body)
+        wrapper.call_local = func
+        if batch:
+            wrapper = BatchedTask(wrapper, size=batch, window=batch_window)
+        if deduplicator:
+            wrapper = DedupTask(wrapper, deduplicator)
+        if on_commit:
+            wrapper = OnCommitTask(wrapper)
+        return wrapper
+    return decorator
+
+
+def periodic_task(cron, **options):
+    """Register a periodic task.
+
+    Periodic tasks run on schedule in the "threaded" and "huey" modes. In
+    "inline" mode trigger them manually via management commands
+    (``my_task.call_local()``).
+    """
+    def decorator(func):
+        huey = get_huey()
+        metrics.install(huey)
+        install_task_scope(huey)
+        options.setdefault("create_id", metrics.timed_task_id)
+        wrapper = huey.periodic_task(cron, **options)(_close_db(func))
+        wrapper.call_local = func
+        return wrapper
+    return decorator
@@ -0,0 +1,200 @@
+"""Collapse duplicate enqueues of a task into one execution.
+
+A deduplicated task claims a key derived from its arguments before it is
+enqueued. While the key is held, identical calls are suppressed and counted.
+The key is released when the task starts running, or after ``ttl`` seconds if
+it never does. The key holds the pending task's id, so a suppressed call
+returns a ``Result`` for that task; results of deduplicated tasks are shared,
+so reading them doesn't consume them (they expire with the result TTL).
+Redis-backed Hueys keep keys in Redis; DEBUG (immediate mode) and other
+storages use an in-process store.
+"""
+
+import hashlib
+import inspect
+import json
+import threading
+import time
+import weakref
+from collections import Counter
+from functools import wraps
+
+from huey.api import Result
+
+from .pipeline import redis_connection
+from .proxy import TaskProxy
+
+
+class LocalDedupStore:
+    """In-process key store for DEBUG and non-Redis Hueys."""
+
+    def __init__(self):
+        self._keys: dict[str, tuple[float, str]] = {}
+        self._suppressed: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, ttl: int, value: str = "1") -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._keys.get(key, (0, ""))[0] > now:
+                return False
+            self._keys[key] = (now + ttl, value)
+            return True
+
+    def holder(self, key: str) -> str | None:
+        with self._lock:
+            expires, value = self._keys.get(key, (0, ""))
+            return value if expires > time.monotonic() else None
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._keys.pop(key, None)
+
+    def incr_suppressed(self, name: str) -> None:
+        with self._lock:
+            self._suppressed[name] += 1
+
+    def suppressed(self) -> dict[str, int]:
+        return dict(self._suppressed)
+
+
+class RedisDedupStore:
+    """Redis key store shared by every process enqueueing on the same Huey."""
+
+    def __init__(self, conn, name: str):
+        self.conn = conn
+        self.prefix = f"huey.dedup.{name}."
+        self.counter_key = f"huey.dedup.{name}:suppressed"
+
+    def claim(self, key: str, ttl: int, value: str = "1") -> bool:
+        return bool(self.conn.set(self.prefix + key, value, nx=True, ex=ttl))
+
+    def holder(self, key: str) -> str | None:
+        value = self.conn.get(self.prefix + key)
+        return None if value is None else value.decode()
+
+    def release(self, key: str) -> None:
+        self.conn.delete(self.prefix + key)
+
+    def incr_suppressed(self, name: str) -> None:
+        self.conn.hincrby(self.counter_key, name, 1)
+
+    def suppressed(self) -> dict[str, int]:
+        counts = self.conn.hgetall(self.counter_key)
+        return {name.decode(): int(count) for name, count in counts.items()}
+
+
+_stores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_store(huey):
+    """Return the dedup store for ``huey``, creating it on first use."""
+    if huey not in _stores:
+        conn = redis_connection(huey)
+        if conn is not None:
+            _stores[huey] = RedisDedupStore(conn, huey.storage.name)
+        else:
+            _stores[huey] = LocalDedupStore()
+    return _stores[huey]
+
+
+def suppressed_counts(huey) -> dict[str, int]:
+    """Return suppressed enqueue counts per task name."""
+    return get_store(huey).suppressed()
+
+
+class Deduplicator:
+    """Claims a key per distinct call and releases it when the task runs.
+
+    Args:
+        func: The task function, used to normalise positional/keyword calls.
+        key: ``True`` to hash all arguments, or a callable taking the task's
+            arguments and returning the key.
+        ttl: Seconds a claimed key lives if the task never runs.
+        batched: The task is batched, so calls are keyword dicts and the body
+            receives a list of them.
+    """
+
+    def __init__(self, huey, func, key=True, ttl: int = 3600, name: str | None = None,
+                 batched: bool = False):
+        self.huey = huey
+        self.name = name or func.__name__
+        self.signature = inspect.signature(func)
+        self.key_func = key if callable(key) else None
+        self.ttl = ttl
+        self.batched = batched
+
+    def key(self, args: tuple = (), kwargs: dict | None = None) -> str:
+        kwargs = kwargs or {}
+        if self.key_func is not None:
+            raw = str(self.key_func(*args, **kwargs))
+        elif self.batched:
+            raw = json.dumps(kwargs, sort_keys=True, default=str)
+        else:
+            bound = self.signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            raw = json.dumps(bound.arguments, sort_keys=True, default=str)
+        return f"{self.name}.{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    def claim(self, args: tuple = (), kwargs: dict | None = None, task_id: str = "1") -> bool:
+        """Claim the call's key for ``task_id``, counting it as suppressed if already held."""
+        store = get_store(self.huey)
+        if store.claim(self.key(args, kwargs), self.ttl, task_id):
+            return True
+        store.incr_suppressed(self.name)
+        return False
+
+    def pending_id(self, args: tuple = (), kwargs: dict | None = None) -> str | None:
+        """Id of the pending task holding the call's key, if any."""
+        return get_store(self.huey).holder(self.key(args, kwargs))
+
+    def release_on_run(self, body):
+        """Wrap a task body so it releases its key(s) before running."""
+        @wraps(body)
+        def inner(*args, **kwargs):
+            store = get_store(self.huey)
+            if self.batched:
+                for call in args[0]:
+                    store.release(self.key(kwargs=call))
+            else:
+                store.release(self.key(args, kwargs))
+            return body(*args, **kwargs)
+        return inner
+
+
+class SharedResult(Result):
+    """A ``Result`` several callers may read: ``get`` leaves the value stored."""
+
+    def get(self, blocking=False, timeout=None, backoff=1.15, max_delay=1.0,
+            revoke_on_timeout=False, preserve=True):
+        return super().get(blocking, timeout, backoff, max_delay, revoke_on_timeout, preserve)
+
+
+class DedupTask(TaskProxy):
+    """Proxy a task so duplicate pending calls return the pending task's result."""
+
+    def __init__(self, wrapper, deduplicator: Deduplicator):
+        super().__init__(wrapper)
+        self.deduplicator = deduplicator
+
+    def __call__(self, *args, **kwargs):
+        result = super().__call__(*args, **kwargs)
+        if result is None or isinstance(result, SharedResult):
+            return result
+        return SharedResult(self.huey, result.task)
+
+    def prepare(self, args: tuple, kwargs: dict):
+        if self.deduplicator.batched:
+            # Batched calls have no task of their own until the batch flushes.
+            if self.deduplicator.claim(args, kwargs):
+                return super().prepare(args, kwargs)
+            return None
+        task = super().prepare(args, kwargs)
+        if task is None or self.deduplicator.claim(args, kwargs, task.id):
+            return task
+        pending_id = self.deduplicator.pending_id(args, kwargs)
+        if pending_id is None:
+            # The pending task started running in between: this call is new work.
+            return task
+        task.id = pending_id
+        return SharedResult(self.huey, task)
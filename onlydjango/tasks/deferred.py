@@ -0,0 +1,73 @@
+"""Hold task submissions until the surrounding transaction commits.
+
+Every call made inside ``transaction.atomic()`` registers an ``on_commit``
+marker, so calls made in a savepoint that rolls back are discarded along with
+it. A single flush callback, kept at the end of the connection's commit hooks,
+then turns the surviving calls into Huey tasks and enqueues them in one Redis
+pipeline per Huey instance. A transaction that rolls back enqueues nothing.
+"""
+
+from collections import defaultdict
+from functools import partial
+
+from django.db import transaction
+from huey.api import Result
+
+from .pipeline import enqueue_many
+from .proxy import TaskProxy
+
+
+class _CommitFlush:
+    """Commit hook that enqueues every call held during one transaction."""
+
+    def __init__(self):
+        self.held: list[tuple[TaskProxy, tuple, dict]] = []
+
+    def __call__(self) -> None:
+        held, self.held = self.held, []
+        tasks = defaultdict(list)
+        for proxy, args, kwargs in held:
+            task = proxy.prepare(args, kwargs)
+            if task is not None and not isinstance(task, Result):
+                tasks[proxy.huey].append(task)
+        for huey, huey_tasks in tasks.items():
+            enqueue_many(huey, huey_tasks)
+
+
+def _take_flush(connection) -> _CommitFlush:
+    """Remove and return this transaction's flush hook, or a new one."""
+    hooks = connection.run_on_commit
+    if hooks and isinstance(hooks[-1][1], _CommitFlush):
+        return hooks.pop()[1]
+    for index, (_, func, _) in enumerate(hooks):
+        if isinstance(func, _CommitFlush):
+            return hooks.pop(index)[1]
+    return _CommitFlush()
+
+
+def hold(proxy: TaskProxy, args: tuple, kwargs: dict, using: str | None = None) -> None:
+    """Submit ``proxy(*args, **kwargs)`` once the current transaction commits."""
+    connection = transaction.get_connection(using)
+    flush = _take_flush(connection)
+    transaction.on_commit(partial(flush.held.append, (proxy, args, kwargs)), using=using)
+    # Re-append with no savepoint ids: savepoint rollbacks drop the markers of
+    # the calls they cover, never the flush itself, and it always runs last.
+    connection.run_on_commit.append((set(), flush, False))
+
+
+class OnCommitTask(TaskProxy):
+    """Proxy a task so calls inside a transaction wait for its commit.
+
+    Outside a transaction calls are submitted immediately. Held calls return
+    ``None`` as no Huey task exists until the commit.
+    """
+
+    def __init__(self, wrapper, using: str | None = None):
+        super().__init__(wrapper)
+        self.using = using
+
+    def __call__(self, *args, **kwargs):
+        if not transaction.get_connection(self.using).in_atomic_block:
+            return super().__call__(*args, **kwargs)
+        hold(self, args, kwargs, self.using)
+        return None
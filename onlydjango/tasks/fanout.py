@@ -0,0 +1,80 @@
+"""Run a task over every row of a queryset in resumable keyset chunks.
+
+The queryset is walked in primary-key order, ``chunk_size`` ids at a time
+(``pk > last ORDER BY pk LIMIT n``), and each chunk is enqueued as one task
+call receiving the list of ids. At most ``max_in_flight`` chunks are queued
+or running at once. After each chunk finishes, in order, the highest finished
+pk is stored as a checkpoint in Huey's key/value storage, so an interrupted
+fan-out started again under the same name resumes after it. Chunks that were
+in flight when it stopped run again (at-least-once).
+
+Memory stays flat: only one chunk of ids and ``max_in_flight`` result handles
+are held at a time.
+"""
+
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def _checkpoint_key(name: str) -> str:
+    return f"fanout:{name}"
+
+
+def get_checkpoint(huey, name: str):
+    """Return the last pk a fan-out fully processed, or ``None``."""
+    return huey.get(_checkpoint_key(name), peek=True)
+
+
+def fan_out(queryset, task, name: str, chunk_size: int = 1000, max_in_flight: int = 8,
+            restart: bool = False, timeout: float | None = None, **kwargs) -> int:
+    """Call ``task(ids, **kwargs)`` for every ``chunk_size`` rows of ``queryset``.
+
+    Args:
+        queryset: Rows to walk; ordered by pk regardless of its own ordering.
+        task: A task whose first argument is a list of pks. It must return a
+            non-None value so its completion can be observed.
+        name: Identifies the fan-out's checkpoint; reuse it to resume.
+        restart: Ignore any checkpoint and start from the first row.
+        timeout: Seconds to wait for a single chunk before giving up.
+        **kwargs: Extra keyword arguments passed to every chunk.
+
+    Returns:
+        Number of rows dispatched by this run.
+    """
+    huey = task.huey
+    key = _checkpoint_key(name)
+    last_pk = None if restart else huey.get(key, peek=True)
+    if last_pk is not None:
+        logger.info(f"Fan-out {name} resuming after pk {last_pk}")
+
+    in_flight: deque = deque()
+    dispatched = 0
+
+    def wait_oldest() -> None:
+        chunk_last_pk, result = in_flight.popleft()
+        if result is not None:
+            result.get(blocking=True, timeout=timeout)
+        huey.put(key, chunk_last_pk)
+
+    while True:
+        rows = queryset.order_by("pk")
+        if last_pk is not None:
+            rows = rows.filter(pk__gt=last_pk)
+        ids = list(rows.values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            break
+
+        if len(in_flight) >= max_in_flight:
+            wait_oldest()
+        result = huey.enqueue(task.s(ids, **kwargs))
+        in_flight.append((ids[-1], result))
+        last_pk = ids[-1]
+        dispatched += len(ids)
+
+    while in_flight:
+        wait_oldest()
+    huey.delete(key)
+    logger.info(f"Fan-out {name} completed: {dispatched} rows dispatched")
+    return dispatched
@@ -0,0 +1,165 @@
+"""Per-task queue wait, run time and outcome metrics.
+
+Task ids created by ``task()``/``periodic_task()`` start with their creation
+time, so queue wait is measured at execution without storing anything at
+enqueue time. Huey pre/post execute hooks record each run into one-minute
+buckets of a latency histogram, kept for ``WINDOW_MINUTES``. Redis-backed
+Hueys keep buckets in Redis so every worker contributes; inline and threaded
+modes keep them in-process.
+"""
+
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter, defaultdict
+from datetime import timezone
+
+from onlydjango.metrics import BUCKETS_MS, bucket, percentile
+
+from .pipeline import redis_connection
+from .ratelimit import Throttled
+
+WINDOW_MINUTES = 60
+
+
+def timed_task_id(task) -> str:
+    """Task id prefixed with the creation time in hex nanoseconds."""
+    return f"{time.time_ns():016x}-{uuid.uuid4().hex[:16]}"
+
+
+def enqueued_at(task) -> float | None:
+    """Return the epoch seconds a task was created at, if its id carries it."""
+    stamp, sep, _ = task.id.partition("-")
+    if not sep or len(stamp) != 16:
+        return None
+    try:
+        return int(stamp, 16) / 1e9
+    except ValueError:
+        return None
+
+
+class LocalMetricsStore:
+    def __init__(self):
+        self._minutes: dict[int, Counter] = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def record(self, minute: int, fields: list[str]) -> None:
+        with self._lock:
+            self._minutes[minute].update(fields)
+            for old in [m for m in self._minutes if m <= minute - WINDOW_MINUTES]:
+                del self._minutes[old]
+
+    def read(self, minutes: list[int]) -> Counter:
+        with self._lock:
+            total = Counter()
+            for minute in minutes:
+                total.update(self._minutes.get(minute, {}))
+            return total
+
+
+class RedisMetricsStore:
+    def __init__(self, conn, name: str):
+        self.conn = conn
+        self.prefix = f"huey.metrics.{name}."
+
+    def record(self, minute: int, fields: list[str]) -> None:
+        key = f"{self.prefix}{minute}"
+        pipe = self.conn.pipeline(transaction=False)
+        for field in fields:
+            pipe.hincrby(key, field, 1)
+        pipe.expire(key, WINDOW_MINUTES * 60 + 120)
+        pipe.execute()
+
+    def read(self, minutes: list[int]) -> Counter:
+        pipe = self.conn.pipeline(transaction=False)
+        for minute in minutes:
+            pipe.hgetall(f"{self.prefix}{minute}")
+        total = Counter()
+        for counts in pipe.execute():
+            total.update({field.decode(): int(count) for field, count in counts.items()})
+        return total
+
+
+_stores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_store(huey):
+    if huey not in _stores:
+        conn = redis_connection(huey)
+        if conn is not None:
+            _stores[huey] = RedisMetricsStore(conn, huey.storage.name)
+        else:
+            _stores[huey] = LocalMetricsStore()
+    return _stores[huey]
+
+
+def install(huey) -> None:
+    """Register the metrics hooks on ``huey`` (idempotent)."""
+    huey.pre_execute(name="task_metrics")(_before_run)
+    huey.post_execute(name="task_metrics")(_after_run_hook(huey))
+
+
+def _before_run(task) -> None:
+    task._metrics_started = time.time()
+
+
+def _after_run_hook(huey):
+    def after_run(task, task_value, exception) -> None:
+        started = getattr(task, "_metrics_started", None)
+        if started is None:
+            return
+        now = time.time()
+        fields = [f"{task.name}|run|{bucket((now - started) * 1000)}"]
+
+        created = enqueued_at(task)
+        first_attempt = task.retries == task.default_retries
+        if created is not None and first_attempt:
+            ready = created
+            if task.eta is not None:
+                ready = max(created, task.eta.replace(tzinfo=timezone.utc).timestamp())
+            fields.append(f"{task.name}|wait|{bucket(max(started - ready, 0) * 1000)}")
+
+        if exception is None:
+            outcome = "success"
+        elif isinstance(exception, Throttled):
+            outcome = "throttled"
+        elif task.retries:
+            outcome = "retry"
+        else:
+            outcome = "error"
+        fields.append(f"{task.name}|outcome|{outcome}")
+        get_store(huey).record(int(now // 60), fields)
+    return after_run
+
+
+def task_metrics(huey, minutes: int = WINDOW_MINUTES) -> dict[str, dict]:
+    """Summarise the last ``minutes`` of metrics per task name.
+
+    Returns ``{name: {"runs", "per_minute", "outcomes", "wait", "run"}}``
+    where ``wait`` and ``run`` map ``p50``/``p95``/``p99`` to milliseconds.
+    """
+    current = int(time.time() // 60)
+    counts = get_store(huey).read(list(range(current - minutes + 1, current + 1)))
+
+    histograms = defaultdict(lambda: {"wait": [0] * (len(BUCKETS_MS) + 1),
+                                      "run": [0] * (len(BUCKETS_MS) + 1),
+                                      "outcomes": Counter()})
+    for field, count in counts.items():
+        name, kind, value = field.rsplit("|", 2)
+        if kind == "outcome":
+            histograms[name]["outcomes"][value] += count
+        else:
+            histograms[name][kind][int(value)] += count
+
+    summary = {}
+    for name, data in sorted(histograms.items()):
+        runs = sum(data["outcomes"].values())
+        summary[name] = {
+            "runs": runs,
+            "per_minute": runs / minutes,
+            "outcomes": dict(data["outcomes"]),
+            "wait": {q: percentile(data["wait"], q / 100) for q in (50, 95, 99)},
+            "run": {q: percentile(data["run"], q / 100) for q in (50, 95, 99)},
+        }
+    return summary
@@ -0,0 +1,46 @@
+"""Enqueue many tasks in one Redis round-trip."""
+
+import struct
+import time
+
+from huey.signals import SIGNAL_ENQUEUED
+from huey.storage import RedisStorage
+
+
+def redis_connection(huey):
+    """Return the Redis client behind ``huey``, or ``None`` if it has none.
+
+    Immediate-mode Hueys run on memory storage and count as having none.
+    """
+    if huey.immediate or not isinstance(huey.storage, RedisStorage):
+        return None
+    return huey.storage.conn
+
+
+def enqueue_many(huey, tasks) -> None:
+    """Enqueue ``tasks`` on ``huey`` using a single Redis pipeline.
+
+    Mirrors ``Huey.enqueue`` for each task (expiry resolution, the
+    ``enqueued`` signal) but writes every message in one round-trip. Storages
+    other than Redis, and immediate mode, fall back to one enqueue per task.
+    """
+    conn = redis_connection(huey)
+    if conn is None:
+        for task in tasks:
+            huey.enqueue(task)
+        return
+
+    storage = huey.storage
+    pipe = conn.pipeline(transaction=False)
+    for task in tasks:
+        if task.expires:
+            task.resolve_expires(huey.utc)
+        huey._emit(SIGNAL_ENQUEUED, task)
+        data = huey.serialize_task(task)
+        if storage.priority:
+            # Same message layout as RedisPriorityQueue.enqueue.
+            prefix = struct.pack(">Q", int(time.time() * 1e6))
+            pipe.zadd(storage.queue_key, {prefix + data: -(task.priority or 0)})
+        else:
+            pipe.lpush(storage.queue_key, data)
+    pipe.execute()
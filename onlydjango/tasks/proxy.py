@@ -0,0 +1,39 @@
+"""Base class for the layers the ``task()`` decorator stacks on a Huey task."""
+
+from huey.api import Result
+
+
+class TaskProxy:
+    """Wrap a Huey ``TaskWrapper`` (or another proxy).
+
+    Calling a proxy runs ``prepare`` down the stack to build the Huey task to
+    enqueue. A layer may return ``None`` from ``prepare`` to consume the call
+    (buffer it, ...), or a ``Result`` when a task already enqueued answers it
+    (a duplicate). Unknown attributes are looked up
+    on the wrapped task, so ``.s()``, ``.schedule()``, ``.call_local()`` and
+    friends keep working.
+    """
+
+    def __init__(self, wrapper):
+        self.wrapper = wrapper
+        self.huey = wrapper.huey
+        self.__name__ = getattr(wrapper, "__name__", None) or wrapper.func.__name__
+        self.__doc__ = wrapper.__doc__
+
+    def prepare(self, args: tuple, kwargs: dict):
+        """Return the Huey task for this call, ``None`` if it was consumed, or
+        the ``Result`` of the task already answering it."""
+        if isinstance(self.wrapper, TaskProxy):
+            return self.wrapper.prepare(args, kwargs)
+        return self.wrapper.s(*args, **kwargs)
+
+    def __call__(self, *args, **kwargs):
+        task = self.prepare(args, kwargs)
+        if task is None or isinstance(task, Result):
+            return task
+        return self.huey.enqueue(task)
+
+    def __getattr__(self, name):
+        if name == "wrapper":
+            raise AttributeError(name)
+        return getattr(self.wrapper, name)
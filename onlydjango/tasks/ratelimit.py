@@ -0,0 +1,203 @@
+"""Per-task rate limits and concurrency caps.
+
+A rate-limited task takes a token from a bucket refilled at ``rate`` tokens
+per second (holding at most ``burst``) before it runs. A concurrency-capped
+task holds one of ``max_concurrency`` slots while it runs. When either is
+unavailable the run raises ``Throttled``, a Huey ``RetryTask``, so it is
+rescheduled without using up its retries. The delay grows with the number of
+throttled runs still waiting, spreading them out at the configured rate
+instead of retrying them all at once.
+
+Buckets and slots live in Redis when the Huey storage is Redis, so limits
+hold across every worker. Threaded mode keeps them in-process; inline mode
+does not enforce limits, as there is nothing to reschedule onto.
+"""
+
+import random
+import threading
+import time
+import uuid
+import weakref
+from functools import wraps
+
+from huey.exceptions import RetryTask
+
+from .pipeline import redis_connection
+
+TOKEN_BUCKET_LUA = """
+local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens, ts = tonumber(state[1]) or burst, tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return tostring(wait)
+"""
+
+DRAINED_LUA = """
+if tonumber(redis.call('GET', KEYS[1]) or '0') > 0 then return redis.call('DECR', KEYS[1]) end
+return 0
+"""
+
+ACQUIRE_SLOT_LUA = """
+local limit, lease, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - lease)
+if redis.call('ZCARD', KEYS[1]) >= limit then return 0 end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('EXPIRE', KEYS[1], lease)
+return 1
+"""
+
+
+class Throttled(RetryTask):
+    """Raised when a task run is over its rate limit or concurrency cap."""
+
+
+class LocalLimiterStore:
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._slots: dict[str, set[str]] = {}
+        self._throttled: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def take_token(self, key: str, rate: float, burst: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - ts) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            return wait
+
+    def acquire_slot(self, key: str, limit: int, lease: int, token: str) -> bool:
+        with self._lock:
+            slots = self._slots.setdefault(key, set())
+            if len(slots) >= limit:
+                return False
+            slots.add(token)
+            return True
+
+    def release_slot(self, key: str, token: str) -> None:
+        with self._lock:
+            self._slots.get(key, set()).discard(token)
+
+    def throttled(self, key: str) -> int:
+        with self._lock:
+            self._throttled[key] = self._throttled.get(key, 0) + 1
+            return self._throttled[key]
+
+    def drained(self, key: str) -> None:
+        with self._lock:
+            if self._throttled.get(key, 0) > 0:
+                self._throttled[key] -= 1
+
+
+class RedisLimiterStore:
+    def __init__(self, conn, name: str):
+        self.conn = conn
+        self.prefix = f"huey.limits.{name}."
+        self._take_token = conn.register_script(TOKEN_BUCKET_LUA)
+        self._acquire_slot = conn.register_script(ACQUIRE_SLOT_LUA)
+        self._drained = conn.register_script(DRAINED_LUA)
+
+    def take_token(self, key: str, rate: float, burst: float) -> float:
+        wait = self._take_token(keys=[f"{self.prefix}{key}.bucket"], args=[rate, burst, time.time()])
+        return float(wait)
+
+    def acquire_slot(self, key: str, limit: int, lease: int, token: str) -> bool:
+        args = [limit, lease, time.time(), token]
+        return bool(self._acquire_slot(keys=[f"{self.prefix}{key}.slots"], args=args))
+
+    def release_slot(self, key: str, token: str) -> None:
+        self.conn.zrem(f"{self.prefix}{key}.slots", token)
+
+    def throttled(self, key: str) -> int:
+        throttled_key = f"{self.prefix}{key}.throttled"
+        pipe = self.conn.pipeline()
+        pipe.incr(throttled_key)
+        pipe.expire(throttled_key, 3600)
+        return pipe.execute()[0]
+
+    def drained(self, key: str) -> None:
+        self._drained(keys=[f"{self.prefix}{key}.throttled"])
+
+
+_stores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_store(huey):
+    if huey not in _stores:
+        conn = redis_connection(huey)
+        if conn is not None:
+            _stores[huey] = RedisLimiterStore(conn, huey.storage.name)
+        else:
+            _stores[huey] = LocalLimiterStore()
+    return _stores[huey]
+
+
+class RateLimiter:
+    """Guards a task body with a token bucket and/or a concurrency cap.
+
+    Args:
+        rate: Runs allowed per second.
+        burst: Bucket size, i.e. runs allowed back to back (default: ``rate``,
+            at least 1).
+        max_concurrency: Runs allowed at the same time across all workers.
+        lease: Seconds after which a slot held by a crashed worker is freed.
+        backoff: Minimum reschedule delay in seconds.
+        max_backoff: Maximum reschedule delay in seconds.
+    """
+
+    def __init__(self, huey, name: str, rate: float | None = None, burst: float | None = None,
+                 max_concurrency: int | None = None, lease: int = 3600,
+                 backoff: float = 1.0, max_backoff: float = 300.0):
+        self.huey = huey
+        self.name = name
+        self.rate = rate
+        self.burst = burst or max(rate or 1, 1)
+        self.max_concurrency = max_concurrency
+        self.lease = lease
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def guard(self, body):
+        """Wrap a task body so throttled runs are rescheduled."""
+        @wraps(body)
+        def inner(*args, **kwargs):
+            if self.huey.immediate:
+                return body(*args, **kwargs)
+
+            store = get_store(self.huey)
+            token = uuid.uuid4().hex
+            if self.max_concurrency and not store.acquire_slot(
+                self.name, self.max_concurrency, self.lease, token
+            ):
+                raise self._throttled(store, 0.0, "max concurrency reached")
+            try:
+                if self.rate:
+                    wait = store.take_token(self.name, self.rate, self.burst)
+                    if wait > 0:
+                        raise self._throttled(store, wait, "rate limit exceeded")
+                store.drained(self.name)
+                return body(*args, **kwargs)
+            finally:
+                if self.max_concurrency:
+                    store.release_slot(self.name, token)
+        return inner
+
+    def _throttled(self, store, wait: float, reason: str) -> Throttled:
+        # Queue behind the runs already throttled: the n-th waiting run is
+        # pushed back by n rate intervals (or n / max_concurrency backoffs).
+        waiting = store.throttled(self.name) - 1
+        if self.rate:
+            spread = waiting / self.rate
+        else:
+            spread = self.backoff * waiting / self.max_concurrency
+        delay = min(max(wait, self.backoff) + spread, self.max_backoff)
+        return Throttled(f"{self.name}: {reason}", delay=delay * random.uniform(1.0, 1.1))
@@ -0,0 +1,151 @@
+"""Compact, expiring task results.
+
+Huey pickles every result into one Redis hash that never expires.
+``ResultHuey`` stores each result under its own key with a TTL (per task via
+``@task(result_ttl=...)``, ``expire_time`` otherwise) and serializes plain
+values (dicts, lists, strings, numbers) with msgpack. Without msgpack (a
+declared dependency) they are written as compact JSON and a warning is
+logged at import; msgpack results then can't be read back. Task messages
+and other objects are still pickled.
+
+Tasks whose return value nobody reads can skip the write altogether with
+``@task(discard_result=True)``. ``get_results`` reads many results in one
+round trip (one MGET).
+
+Settings (djhuey dict form, as settings cannot import task modules):
+    HUEY = {
+        "huey_class": "onlydjango.tasks.results.ResultHuey",
+        "name": "huey",
+        "url": REDIS_URL,
+        "expire_time": 86400,
+        "periodic_task_check_frequency": 1,
+    }
+"""
+
+import json
+import logging
+import threading
+from functools import wraps
+
+from huey import PriorityRedisExpireHuey
+from huey.constants import EmptyData
+from huey.exceptions import TaskException
+from huey.serializer import Serializer
+from huey.storage import PriorityRedisExpireStorage
+from huey.utils import Error
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+    logger.warning("msgpack is not installed: task results are stored as JSON")
+
+MSGPACK = b"\x01"
+JSON = b"\x02"
+
+_running = threading.local()
+
+
+def _plain(value) -> bool:
+    if value is None or type(value) in (bool, int, float, str):
+        return True
+    if type(value) is list:
+        return all(_plain(item) for item in value)
+    if type(value) is dict:
+        return all(type(key) is str and _plain(item) for key, item in value.items())
+    return False
+
+
+class CompactSerializer(Serializer):
+    """Serializes plain values compactly and falls back to pickle."""
+
+    def _serialize(self, data):
+        if _plain(data):
+            if msgpack is not None:
+                try:
+                    return MSGPACK + msgpack.packb(data)
+                except OverflowError:  # ints beyond 64 bits
+                    return super()._serialize(data)
+            return JSON + json.dumps(data, separators=(",", ":")).encode()
+        return super()._serialize(data)
+
+    def _deserialize(self, data):
+        marker = data[:1]
+        if marker == MSGPACK:
+            if msgpack is None:
+                raise RuntimeError("Task result was stored with msgpack, which is not installed")
+            return msgpack.unpackb(data[1:])
+        if marker == JSON:
+            return json.loads(data[1:])
+        return super()._deserialize(data)
+
+
+class ResultStorage(PriorityRedisExpireStorage):
+    """Expiring result storage honouring the running task's ``result_ttl``."""
+
+    def put_data(self, key, value, is_result=False):
+        ttl = getattr(_running, "result_ttl", None) if is_result else None
+        if ttl is None:
+            return super().put_data(key, value, is_result)
+        self.conn.set(self.result_key(key), value, ex=ttl)
+        if self.notify_result:
+            self._notify(key)
+
+
+class ResultHuey(PriorityRedisExpireHuey):
+    storage_class = ResultStorage
+
+    def __init__(self, *args, periodic_task_check_frequency=None, **kwargs):
+        kwargs.setdefault("serializer", CompactSerializer())
+        super().__init__(*args, **kwargs)
+        # Settable here because the dict form can't set attributes afterwards.
+        if periodic_task_check_frequency is not None:
+            self.periodic_task_check_frequency = periodic_task_check_frequency
+        self.pre_execute(name="result_ttl")(_set_result_ttl)
+        self.post_execute(name="result_ttl")(_clear_result_ttl)
+
+
+def _set_result_ttl(task) -> None:
+    _running.result_ttl = getattr(task, "result_ttl", None)
+
+
+def _clear_result_ttl(task, task_value, exception) -> None:
+    _running.result_ttl = None
+
+
+def discard_result(body):
+    """Wrap a task body so workers store no result for it."""
+    @wraps(body)
+    def inner(*args, **kwargs):
+        body(*args, **kwargs)
+    return inner
+
+
+def get_results(huey, results) -> list:
+    """Read several task results in one round trip, without consuming them.
+
+    Args:
+        results: ``Result`` handles or task ids.
+
+    Returns:
+        Values in the same order, ``None`` for results not (yet) stored.
+
+    Raises:
+        TaskException: If one of the tasks failed.
+    """
+    ids = [getattr(result, "id", result) for result in results]
+    try:
+        found = huey.storage.peek_many(ids)
+    except NotImplementedError:
+        found = {task_id: huey.storage.peek_data(task_id) for task_id in ids}
+
+    values = []
+    for task_id in ids:
+        data = found.get(task_id, EmptyData)
+        value = None if data is EmptyData else huey.serializer.deserialize(data)
+        if isinstance(value, Error):
+            raise TaskException(value.metadata)
+        values.append(value)
+    return values
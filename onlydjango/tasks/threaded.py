@@ -0,0 +1,135 @@
+"""In-process threaded task execution (``TASKS_MODE = "threaded"``).
+
+Tasks are serialized exactly as they would be for Redis, then executed by a
+bounded thread pool in the web process. A scheduler thread runs delayed
+tasks and retries, and periodic tasks in the one process with
+``TASKS_PERIODIC`` set, so small deployments get asynchronous behaviour
+without Redis and dev latency matches production.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from huey import MemoryHuey
+from huey.storage import MemoryStorage
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadPoolStorage(MemoryStorage):
+    """Memory storage whose queue is a bounded thread pool.
+
+    At most ``workers + queue_depth`` tasks may be in flight. Further
+    enqueues block until a slot frees up, except from a worker thread, where
+    blocking could deadlock the pool and the task runs inline instead.
+    """
+
+    def __init__(self, name, huey, workers: int = 4, queue_depth: int = 1000, **kwargs):
+        super().__init__(name, **kwargs)
+        self.huey = huey
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"huey-{name}")
+        self.slots = threading.BoundedSemaphore(workers + queue_depth)
+        self.in_flight = 0
+        self._local = threading.local()
+
+    def enqueue(self, data, priority=None):
+        in_worker = getattr(self._local, "worker", False)
+        if not self.slots.acquire(blocking=not in_worker):
+            self._execute(data)
+            return
+        with self._lock:
+            self.in_flight += 1
+        try:
+            self.executor.submit(self._run, data)
+        except RuntimeError:
+            # Interpreter shutdown: the pool no longer accepts work.
+            self._release()
+            self._execute(data)
+
+    def queue_size(self):
+        return self.in_flight
+
+    def _run(self, data) -> None:
+        self._local.worker = True
+        try:
+            self._execute(data)
+        finally:
+            connections.close_all()
+            self._release()
+
+    def _execute(self, data) -> None:
+        try:
+            self.huey.execute(self.huey.deserialize_task(data))
+        except Exception:
+            logger.exception("Threaded task failed")
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self.slots.release()
+
+
+class ThreadedHuey(MemoryHuey):
+    """Huey that executes tasks on an in-process thread pool.
+
+    Every process has its own in-memory schedule, so each starts a scheduler
+    thread the first time it schedules a task (a delay or a retry). Periodic
+    tasks would run once per process, so only the process created with
+    ``periodic=True`` (``TASKS_PERIODIC``) starts its scheduler up front and
+    enqueues them.
+    """
+
+    poll_interval = 1.0
+
+    def __init__(self, name="threaded", workers: int = 4, queue_depth: int = 1000,
+                 periodic: bool = False, **kwargs):
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.periodic = periodic
+        super().__init__(name, **kwargs)
+        self._last_periodic_check = None
+        self._scheduler = None
+        self._scheduler_lock = threading.Lock()
+        if periodic:
+            self.start_scheduler()
+
+    def start_scheduler(self) -> None:
+        """Start the scheduler thread, once."""
+        with self._scheduler_lock:
+            if self._scheduler is None:
+                self._scheduler = threading.Thread(
+                    target=self._schedule_loop, name=f"huey-{self.name}-scheduler", daemon=True,
+                )
+                self._scheduler.start()
+
+    def add_schedule(self, task):
+        super().add_schedule(task)
+        self.start_scheduler()
+
+    def get_storage(self, **kwargs):
+        return ThreadPoolStorage(self.name, huey=self, workers=self.workers,
+                                 queue_depth=self.queue_depth)
+
+    def run_scheduler_once(self, now=None) -> None:
+        """Enqueue due scheduled tasks, and periodic tasks once per minute if enabled."""
+        now = now or self._get_timestamp()
+        for task in self.read_schedule(now):
+            self.enqueue(task)
+
+        minute = now.replace(second=0, microsecond=0)
+        if self.periodic and minute != self._last_periodic_check:
+            self._last_periodic_check = minute
+            for task in self.read_periodic(minute):
+                logger.info("Enqueueing periodic task %s", task)
+                self.enqueue(task)
+
+    def _schedule_loop(self) -> None:
+        while True:
+            try:
+                self.run_scheduler_once()
+            except Exception:
+                logger.exception("Threaded task scheduler failed")
+            time.sleep(self.poll_interval)
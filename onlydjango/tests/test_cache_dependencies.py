@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from django.template import engines
+from django.test import TestCase
+
+from apps.core.models import User
+from onlydjango.cache import dependencies, generations
+from onlydjango.cache.dependencies import depends_on
+from onlydjango.maintenance import delete_in_batches
+
+
+class DependenciesTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.alice = User.objects.create_user("alice", "alice@example.com")
+            self.bob = User.objects.create_user("bob", "bob@example.com")
+
+    def test_versions_are_stable_until_a_write(self):
+        model, row = depends_on(User), depends_on(self.alice)
+        self.assertEqual(model.version(), depends_on("core.User").version())
+        before = (model.version(), row.version(), depends_on(self.bob).version())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.alice.first_name = "Alice"
+            self.alice.save()
+        after = (model.version(), row.version(), depends_on(self.bob).version())
+        self.assertNotEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+        self.assertEqual(after[2], before[2])
+
+    def test_bump_waits_for_commit(self):
+        version = depends_on(self.alice).version()
+        with self.captureOnCommitCallbacks() as callbacks:
+            User.objects.get(pk=self.alice.pk).delete()
+        self.assertEqual(depends_on(self.alice).version(), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(depends_on(self.alice).version(), version)
+
+    def test_m2m_changes_bump_both_sides(self):
+        group = Group.objects.create(name="staff")
+        group_version, user_version = depends_on(group).version(), depends_on(self.bob).version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bob.groups.add(group)
+        self.assertNotEqual(depends_on(group).version(), group_version)
+        self.assertNotEqual(depends_on(self.bob).version(), user_version)
+
+    def test_evicted_generation_never_repeats(self):
+        deps = depends_on(User)
+        version = deps.version()
+        cache.delete("depgen:core.user")
+        self.assertNotEqual(deps.version(), version)
+
+    def test_one_bump_per_transaction(self):
+        with (mock.patch.object(generations, "_bump", wraps=generations._bump) as bump,
+              self.captureOnCommitCallbacks(execute=True) as callbacks):
+            users = [User.objects.create_user(f"user{n}") for n in range(5)]
+            users[0].delete()
+        self.assertEqual((len(callbacks), bump.call_count), (1, 1))
+
+    def test_untracked_models_send_no_bumps(self):
+        content_type = ContentType.objects.get_for_model(User)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Permission.objects.create(codename="untracked", name="Untracked", content_type=content_type).delete()
+        self.assertEqual(callbacks, [])
+        # No post_delete receiver, so deletes keep Django's fast path.
+        self.assertFalse(post_delete.has_listeners(Permission))
+
+    def test_maintenance_deletes_share_bumps(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for n in range(5):
+                User.objects.create_user(f"user{n}")
+        with mock.patch.object(generations, "_bump") as bump, self.captureOnCommitCallbacks(execute=True):
+            deleted = list(delete_in_batches(User.objects.filter(username__startswith="user"), 2))
+        self.assertEqual(deleted, [2, 2, 1])
+        # The batches commit inside the test's transaction, so they share one bump.
+        self.assertEqual(bump.call_count, 1)
+        self.assertEqual(len(bump.call_args.args[0]), 6)
+
+    def test_bulk_helpers_bump_once_per_transaction(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            users = [User.objects.create_user(f"user{n}") for n in range(5)]
+        versions = [depends_on(user).version() for user in users]
+        for user in users:
+            user.bio = "imported"
+        with mock.patch.object(cache, "set_many", wraps=cache.set_many) as set_many:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(dependencies.bulk_update(users, ["bio"], batch_size=2), 5)
+        self.assertEqual(set_many.call_count, 1)
+        # Row counters are dropped, not rewritten, so writes leave no keys behind.
+        self.assertFalse(cache.get_many([f"depgen:core.user:{user.pk}" for user in users]))
+        self.assertTrue(all(depends_on(user).version() != v for user, v in zip(users, versions)))
+
+        version = depends_on(self.alice).version()
+        with mock.patch.object(cache, "set_many", wraps=cache.set_many) as set_many:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(dependencies.update(User.objects.all(), bio="cleared"), 7)
+        self.assertEqual(set_many.call_count, 1)
+        self.assertNotEqual(depends_on(self.alice).version(), version)
+
+    def test_fragment_version_tag(self):
+        template = engines["django"].from_string(
+            '{% load cache_dependencies %}{% dependency_version "core.User" user as v %}{{ v }}'
+        )
+        rendered = template.render({"user": self.alice})
+        self.assertEqual(rendered, depends_on(User, self.alice).version())
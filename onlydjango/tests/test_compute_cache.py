@@ -0,0 +1,88 @@
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from onlydjango.cache import compute
+from onlydjango.cache.compute import get_or_compute
+
+calls = []
+
+
+def slow_square(n):
+    calls.append(n)
+    time.sleep(0.2)
+    return n * n
+
+
+class GetOrComputeTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        calls.clear()
+
+    def run_concurrently(self, workers=8, **kwargs):
+        barrier = threading.Barrier(workers)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(get_or_compute("square", slow_square, 60, args=(3,), **kwargs))
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def expire(self):
+        value, delta, expires = cache.get("computed:square")
+        cache.set("computed:square", (value, delta, time.time() - 1), 60)
+
+    def test_value_is_cached(self):
+        self.assertEqual(get_or_compute("square", slow_square, 60, args=(3,)), 9)
+        self.assertEqual(get_or_compute("square", slow_square, 60, args=(3,), beta=0), 9)
+        self.assertEqual(calls, [3])
+        compute.invalidate("square")
+        get_or_compute("square", slow_square, 60, args=(3,))
+        self.assertEqual(calls, [3, 3])
+
+    def test_cold_key_is_computed_once(self):
+        self.assertEqual(self.run_concurrently(), [9] * 8)
+        self.assertEqual(calls, [3])
+
+    def test_stale_key_is_recomputed_once_while_others_serve_it(self):
+        cache.set("computed:square", ("stale", 0.2, time.time() - 1), 60)
+        results = self.run_concurrently()
+        self.assertEqual(calls, [3])
+        self.assertEqual(sorted(results, key=str), [9] + ["stale"] * 7)
+        self.assertEqual(get_or_compute("square", slow_square, 60, args=(3,), beta=0), 9)
+        self.assertIsNone(cache.get("computed-lock:square"))
+
+    def test_refresh_starts_early_near_expiry(self):
+        cache.set("computed:square", ("old", 1.0, time.time() + 0.5), 60)
+        with mock.patch("onlydjango.cache.compute.random.random", return_value=0.9):
+            self.assertEqual(get_or_compute("square", slow_square, 60, args=(3,)), 9)
+        cache.set("computed:square", ("old", 1.0, time.time() + 50), 60)
+        with mock.patch("onlydjango.cache.compute.random.random", return_value=0.9):
+            self.assertEqual(get_or_compute("square", slow_square, 60, args=(3,)), "old")
+
+    def test_background_refresh_runs_as_a_task(self):
+        get_or_compute("square", slow_square, 60, args=(3,))
+        self.expire()
+        with mock.patch("apps.core.tasks.refresh_cached_value") as refresh:
+            self.assertEqual(get_or_compute("square", slow_square, 60, args=(3,), background=True), 9)
+        refresh.assert_called_once()
+        self.assertEqual(refresh.call_args.kwargs["compute"], f"{__name__}.slow_square")
+
+        compute.refresh(**refresh.call_args.kwargs)
+        self.assertEqual(calls, [3, 3])
+        self.assertIsNone(cache.get("computed-lock:square"))
+
+        # Inline tasks recompute before the stale value is returned.
+        self.expire()
+        get_or_compute("square", slow_square, 60, args=(3,), background=True)
+        self.assertEqual(calls, [3, 3, 3])
+        self.assertIsNone(cache.get("computed-lock:square"))
@@ -0,0 +1,69 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from onlydjango.db import pool
+
+
+class FakePool:
+    def __init__(self, size=10, available=2, waiting=3):
+        self.stats = {"pool_size": size, "pool_max": 10, "pool_available": available,
+                      "requests_waiting": waiting, "requests_num": 100}
+
+    def get_stats(self):
+        return self.stats
+
+
+class PoolStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        pool._waits.clear()
+        pool._max_wait.clear()
+        pool._last_warning.clear()
+
+    @override_settings(DB_POOL_WAIT_WARNING_MS=500)
+    def test_slow_checkout_is_recorded_and_logged(self):
+        fake = FakePool()
+        pool.record_wait("default", fake, 0.001)
+        with self.assertLogs("onlydjango.db.pool", "WARNING") as logs:
+            pool.record_wait("default", fake, 0.8)
+        self.assertIn("Waited 800ms", logs.output[0])
+
+        stats = pool.snapshot({"default": fake})["aliases"]["default"]
+        self.assertEqual((stats["in_use"], stats["idle"], stats["waiting"]), (8, 2, 3))
+        self.assertEqual(sum(stats["wait_histogram"]), 2)
+        self.assertEqual(stats["wait_max_ms"], 800.0)
+
+    def test_workers_are_aggregated(self):
+        pool.record_wait("default", FakePool(), 0.004)
+        for worker in ("web:1", "web:2"):
+            with mock.patch.object(pool, "worker_id", return_value=worker):
+                pool.publish(force=True, pools={"default": FakePool()})
+
+        snapshots = pool.collect()
+        self.assertEqual([data["worker"] for data in snapshots], ["web:1", "web:2"])
+        total = pool.aggregate(snapshots)["default"]
+        self.assertEqual((total["workers"], total["in_use"], total["waiting"]), (2, 16, 6))
+        self.assertEqual(total["wait_ms"][99], 5)
+
+        out = StringIO()
+        call_command("db_pool_stats", stdout=out)
+        self.assertIn("2 workers", out.getvalue())
+
+    def test_endpoint_is_staff_only(self):
+        # INTERNAL_IPS is no proof behind a proxy: every request comes from it.
+        self.assertEqual(self.client.get("/__dbpool__/", REMOTE_ADDR="127.0.0.1").status_code, 404)
+        staff = get_user_model().objects.create_user("staff", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get("/__dbpool__/")
+        self.assertEqual(response.json(), {"aggregate": {}, "workers": []})
+
+    @override_settings(DB_POOL_STATS_TOKEN="s3cret")
+    def test_endpoint_accepts_the_shared_token(self):
+        self.assertEqual(self.client.get("/__dbpool__/", HTTP_X_POOL_STATS_TOKEN="wrong").status_code, 404)
+        response = self.client.get("/__dbpool__/", HTTP_X_POOL_STATS_TOKEN="s3cret")
+        self.assertEqual(response.status_code, 200)
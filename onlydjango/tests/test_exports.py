@@ -0,0 +1,66 @@
+import csv
+import gzip
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from onlydjango.exports import export, select_fields, streaming_response
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            User(username=f"user-{i}", email=f"user-{i}@example.com", first_name="Zoë, \"Z\"")
+            for i in range(25)
+        )
+
+    def setUp(self):
+        self.queryset = User.objects.order_by("pk")
+
+    def test_csv_streams_in_chunks(self):
+        chunks = list(export(self.queryset, ["username", "first_name"], "csv", chunk_size=10))
+        self.assertGreater(len(chunks), 1)
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(rows[0], ["username", "first_name"])
+        self.assertEqual(rows[1], ["user-0", "Zoë, \"Z\""])
+        self.assertEqual(len(rows), 26)
+
+    def test_csv_neutralises_formulas(self):
+        User.objects.filter(username="user-0").update(first_name="=HYPERLINK(\"x\")", last_name="-1+2")
+        User.objects.filter(username="user-1").update(first_name="@SUM(A1)", last_name="\tx")
+        rows = list(csv.reader(io.StringIO(b"".join(
+            export(self.queryset, ["id", "first_name", "last_name"], "csv")).decode())))
+        self.assertEqual(rows[1][1:], ["'=HYPERLINK(\"x\")", "'-1+2"])
+        self.assertEqual(rows[2][1:], ["'@SUM(A1)", "'\tx"])
+        self.assertEqual(rows[3][1:], ["Zoë, \"Z\"", ""])
+        line = b"".join(export(self.queryset, ["first_name"], "ndjson")).splitlines()[0]
+        self.assertEqual(json.loads(line)["first_name"], "=HYPERLINK(\"x\")")
+
+    def test_ndjson_encodes_dates(self):
+        lines = b"".join(export(self.queryset, ["id", "date_joined"], "ndjson")).splitlines()
+        self.assertEqual(len(lines), 25)
+        self.assertIsInstance(json.loads(lines[0])["date_joined"], str)
+
+    def test_gzip_roundtrip(self):
+        plain = b"".join(export(self.queryset, ["email"], "csv"))
+        compressed = b"".join(export(self.queryset, ["email"], "csv", compress=True))
+        self.assertEqual(gzip.decompress(compressed), plain)
+        self.assertLess(len(compressed), len(plain))
+
+    def test_unknown_fields_and_formats_are_rejected(self):
+        self.assertEqual(select_fields("", ("id", "email")), ["id", "email"])
+        self.assertEqual(select_fields("email, id", ("id", "email")), ["email", "id"])
+        with self.assertRaisesMessage(ValueError, "password"):
+            select_fields("id,password", ("id", "email"))
+        with self.assertRaises(ValueError):
+            export(self.queryset, ["id"], "xml")
+
+    def test_streaming_response_headers(self):
+        response = streaming_response(iter([b"a"]), "ndjson", "users", compress=True)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('filename="users.ndjson.gz"', response["Content-Disposition"])
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from onlydjango.helpers.onlydjango_globals import check_global_settings, global_settings
+
+
+class GlobalSettingsTests(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/page/?q=1")
+
+    def test_static_settings_and_og_url(self):
+        context = global_settings(self.request)
+        self.assertEqual(context["site_name"], settings.SITE_NAME)
+        self.assertEqual(str(context["og_url"]), "http://testserver/page/?q=1")
+        self.assertEqual(Template("{{ og_url }}").render(Context(context)), "http://testserver/page/?q=1")
+
+    def test_og_url_is_built_only_when_rendered(self):
+        request = RequestFactory().get("/", HTTP_HOST="not-allowed.example")
+        context = global_settings(request)
+        self.assertEqual(Template("{{ site_name }}").render(Context(context)), settings.SITE_NAME)
+
+    def test_frozen_context_follows_setting_changes(self):
+        global_settings(self.request)
+        with override_settings(SITE_NAME="Other"):
+            self.assertEqual(global_settings(self.request)["site_name"], "Other")
+        self.assertEqual(global_settings(self.request)["site_name"], settings.SITE_NAME)
+
+    def test_system_check_reports_missing_settings(self):
+        self.assertEqual(check_global_settings(None), [])
+        with override_settings():
+            del settings.OG_IMAGE
+            errors = check_global_settings(None)
+        self.assertEqual([error.id for error in errors], ["onlydjango.E001"])
+        self.assertIn("OG_IMAGE", errors[0].msg)
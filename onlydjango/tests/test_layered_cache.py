@@ -0,0 +1,147 @@
+import time
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from onlydjango.cache import local, stats
+from onlydjango.cache.layered import LayeredCache
+from onlydjango.cache.local import MISSING, LocalLRU, LocalTier
+
+
+def layered(channel="test", **options):
+    return LayeredCache("layered-tests", {
+        "KEY_PREFIX": "t",
+        "OPTIONS": {
+            "REMOTE_BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "CHANNEL": channel,
+            **options,
+        },
+    })
+
+
+class LocalLRUTests(SimpleTestCase):
+    def test_least_recently_used_entry_is_dropped(self):
+        lru = LocalLRU(2)
+        lru.set("a", 1, 10)
+        lru.set("b", 2, 10)
+        lru.get("a")
+        lru.set("c", 3, 10)
+        self.assertEqual((lru.get("a"), lru.get("b"), lru.get("c")), (1, MISSING, 3))
+
+    def test_entries_expire(self):
+        lru = LocalLRU(10)
+        lru.set("a", 1, 10)
+        with mock.patch("onlydjango.cache.local.time.monotonic", return_value=time.monotonic() + 11):
+            self.assertIs(lru.get("a"), MISSING)
+        self.assertEqual(len(lru), 0)
+
+    def test_values_are_copies(self):
+        lru = LocalLRU(10)
+        lru.set("a", [1], 10)
+        lru.get("a").append(2)
+        self.assertEqual(lru.get("a"), [1])
+
+
+class LayeredCacheTests(SimpleTestCase):
+    def setUp(self):
+        local._tiers.clear()
+        self.cache = layered()
+        self.cache.clear()
+
+    def tearDown(self):
+        local._tiers.clear()
+
+    def test_reads_are_served_locally_after_the_first(self):
+        self.cache.remote.set("k", "v")
+        self.assertEqual(self.cache.get("k"), "v")
+        with mock.patch.object(self.cache.remote, "get_many") as fetch:
+            self.assertEqual(self.cache.get("k"), "v")
+        fetch.assert_not_called()
+        self.assertIsNone(self.cache.get("missing"))
+
+        counters = self.cache.stats()
+        self.assertEqual((counters["local_hits"], counters["local_misses"]), (1, 2))
+        self.assertEqual((counters["remote_hits"], counters["remote_misses"]), (1, 1))
+
+    def test_local_tier_is_shared_between_threads(self):
+        self.cache.set("k", "v")
+        other_thread = layered()
+        self.assertIs(other_thread.tier, self.cache.tier)
+        with mock.patch.object(other_thread.remote, "get_many") as fetch:
+            self.assertEqual(other_thread.get("k"), "v")
+        fetch.assert_not_called()
+
+    def test_writes_evict_other_workers(self):
+        other_worker = layered()
+        other_worker.tier = LocalTier("test", 100)
+        self.cache.set("k", "old")
+        self.assertEqual(other_worker.get("k"), "old")
+
+        self.cache.set("k", "new")
+        self.assertEqual(other_worker.get("k"), "new")
+        self.cache.delete("k")
+        self.assertIsNone(other_worker.get("k"))
+
+        self.cache.set_many({"a": 1, "b": 2})
+        self.assertEqual(other_worker.get_many(["a", "b", "c"]), {"a": 1, "b": 2})
+        self.cache.incr("a")
+        self.cache.clear()
+        self.assertEqual(other_worker.get_many(["a", "b"]), {})
+
+    def test_local_copies_never_outlive_their_timeout(self):
+        cache = layered(LOCAL_TIMEOUT=30)
+        self.assertEqual(cache._local_timeout(5), 5)
+        self.assertEqual(cache._local_timeout(None), 30)
+        cache.set("k", "v", timeout=5)
+        with mock.patch("onlydjango.cache.local.time.monotonic", return_value=time.monotonic() + 6):
+            self.assertIs(cache.tier.lru.get(cache.make_key("k")), MISSING)
+
+    def test_local_copies_never_outlive_the_remote_key(self):
+        # Written by another worker: only the remote TTL tells when it expires.
+        self.cache.remote.set("k", "v", timeout=5)
+        self.assertEqual(self.cache.get("k"), "v")
+        with mock.patch("onlydjango.cache.local.time.monotonic", return_value=time.monotonic() + 6):
+            self.assertIs(self.cache.tier.lru.get(self.cache.make_key("k")), MISSING)
+
+    def test_redis_ttl_is_read_with_the_value(self):
+        cache = LayeredCache("redis://localhost:6379", {"KEY_PREFIX": "t", "OPTIONS": {"CHANNEL": "redis"}})
+        cache.tier.invalidator = local.LocalInvalidator("redis", cache.tier)
+        pipeline = mock.Mock()
+        pipeline.execute.return_value = [cache.remote._cache._serializer.dumps("v"), 4000, None, -2]
+        with mock.patch.object(cache.remote._cache, "get_client") as get_client:
+            get_client.return_value.pipeline.return_value = pipeline
+            self.assertEqual(cache.get_many(["k", "gone"]), {"k": "v"})
+        pipeline.pttl.assert_any_call(cache.make_key("k"))
+        with mock.patch("onlydjango.cache.local.time.monotonic", return_value=time.monotonic() + 5):
+            self.assertIs(cache.tier.lru.get(cache.make_key("k")), MISSING)
+
+    def test_local_tier_is_bounded(self):
+        cache = layered(channel="small", LOCAL_MAX_ENTRIES=3)
+        cache.set_many({f"k{n}": n for n in range(10)})
+        for n in range(10):
+            cache.get(f"k{n}")
+        self.assertEqual(cache.stats()["local_entries"], 3)
+
+    def test_unhealthy_subscriber_bypasses_local_tier(self):
+        self.cache.set("k", "v")
+        with mock.patch.object(type(self.cache.tier.invalidator), "healthy", False):
+            with mock.patch.object(self.cache.remote, "get_many", return_value={"k": "remote"}) as fetch:
+                self.assertEqual(self.cache.get("k"), "remote")
+        fetch.assert_called_once()
+
+    def test_stats_are_published_per_worker(self):
+        cache.clear()
+        self.cache.get("k")
+        for worker in ("web:1", "web:2"):
+            with mock.patch.object(stats, "worker_id", return_value=worker):
+                stats.publish(force=True)
+        total = stats.aggregate(stats.collect())["test"]
+        self.assertEqual((total["workers"], total["local_misses"], total["remote_misses"]), (2, 2, 2))
+        self.assertEqual(total["local_hit_rate"], 0.0)
+
+        out = StringIO()
+        call_command("cache_stats", stdout=out)
+        self.assertIn("2 workers", out.getvalue())
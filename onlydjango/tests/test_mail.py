@@ -0,0 +1,71 @@
+import time
+
+from django.core.mail import EmailMessage
+from django.core.mail.backends.smtp import EmailBackend
+from django.test import SimpleTestCase, override_settings
+
+from onlydjango.benchmarks.smtp import LocalSMTPServer
+from onlydjango.mail import close_connections, send_bulk
+from onlydjango.mail.backends import PooledEmailBackend, _pool
+
+
+def _messages(count):
+    return [EmailMessage("Hi", "Body", "from@example.com", [f"u{i}@example.com"]) for i in range(count)]
+
+
+class PooledEmailBackendTests(SimpleTestCase):
+    def setUp(self):
+        self.server = LocalSMTPServer().__enter__()
+        self.addCleanup(self.server.__exit__, None, None, None)
+        self.addCleanup(close_connections)
+
+    def backend(self):
+        return PooledEmailBackend(host=self.server.host, port=self.server.port)
+
+    def test_reuses_connection_across_sends_and_instances(self):
+        self.assertEqual(self.backend().send_messages(_messages(3)), 3)
+        self.assertEqual(self.backend().send_messages(_messages(2)), 2)
+        self.assertEqual((self.server.connections, self.server.messages), (1, 5))
+
+    @override_settings(EMAIL_POOL_MAX_MESSAGES=2)
+    def test_replaces_connection_after_max_messages(self):
+        backend = self.backend()
+        for _ in range(3):
+            backend.send_messages(_messages(2))
+        self.assertEqual(self.server.connections, 3)
+
+    def test_reconnects_when_server_dropped_connection(self):
+        backend = self.backend()
+        backend.send_messages(_messages(1))
+        [pooled] = _pool().values()
+        pooled.connection.close()  # as if the server had hung up
+
+        self.assertEqual(backend.send_messages(_messages(2)), 2)
+        self.assertEqual((self.server.connections, self.server.messages), (2, 3))
+
+    def test_send_bulk_uses_configured_backend_in_batches(self):
+        backend = "onlydjango.mail.backends.PooledEmailBackend"
+        with self.settings(EMAIL_BACKEND=backend, EMAIL_HOST=self.server.host,
+                           EMAIL_PORT=self.server.port):
+            self.assertEqual(send_bulk(_messages(25), batch_size=10), 25)
+        self.assertEqual(self.server.connections, 1)
+
+
+class EmailThroughputBenchmark(SimpleTestCase):
+    """Pooled sending beats a connection per message once connects cost 20ms."""
+
+    def test_pooled_backend_is_faster_than_connection_per_message(self):
+        count = 20
+        with LocalSMTPServer(connect_delay=0.02) as server:
+            start = time.perf_counter()
+            for message in _messages(count):
+                EmailBackend(host=server.host, port=server.port).send_messages([message])
+            per_message = time.perf_counter() - start
+
+            start = time.perf_counter()
+            PooledEmailBackend(host=server.host, port=server.port).send_messages(_messages(count))
+            pooled = time.perf_counter() - start
+            close_connections()
+
+        self.assertEqual(server.messages, count * 2)
+        self.assertLess(pooled * 3, per_message)
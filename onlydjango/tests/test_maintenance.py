@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.test import TestCase
+from django.utils import timezone
+
+from onlydjango import maintenance
+
+
+class DeleteInBatchesTests(TestCase):
+    def test_deletes_in_bounded_batches(self):
+        expired = timezone.now() - timezone.timedelta(days=1)
+        Session.objects.bulk_create(
+            Session(session_key=f"s{i}", session_data="", expire_date=expired) for i in range(5)
+        )
+        batches = list(maintenance.delete_in_batches(Session.objects.all(), batch_size=2))
+        self.assertEqual(batches, [2, 2, 1])
+        self.assertFalse(Session.objects.exists())
+
+
+class RunTests(TestCase):
+    def setUp(self):
+        def endless(batch_size):
+            while True:
+                yield batch_size
+
+        def short(batch_size):
+            yield 3
+
+        steps = {"test.endless": endless, "test.short": short}
+        patcher = mock.patch.object(maintenance, "get_steps", return_value=steps)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reports_rows_per_step(self):
+        [report] = maintenance.run(["test.short"], pause=0)
+        self.assertEqual((report.rows, report.batches, report.complete), (3, 1, True))
+        self.assertGreater(report.rows_per_second, 0)
+
+    def test_stops_at_budget(self):
+        endless, short = maintenance.run(["test.endless", "test.short"], budget=0.05,
+                                         batch_size=10, pause=0.01)
+        self.assertFalse(endless.complete)
+        self.assertGreater(endless.rows, 0)
+        self.assertEqual((short.rows, short.complete), (0, False))
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.http import Http404, QueryDict
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from django.utils.html import escape
+
+from onlydjango.helpers.pagination import (
+    CursorPaginator, InvalidCursor, page_template, paginate,
+)
+
+User = get_user_model()
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        joined = timezone.now()
+        User.objects.bulk_create(
+            # Pairs share date_joined so the pk tiebreaker matters.
+            User(username=f"user-{i:02}", date_joined=joined - timedelta(minutes=i // 2))
+            for i in range(25)
+        )
+
+    def walk(self, paginator):
+        pages, cursor = [], None
+        while True:
+            page = paginator.page(cursor)
+            pages.append([user.username for user in page])
+            if not page.has_next():
+                return pages
+            cursor = page.next_cursor
+
+    def test_pages_cover_every_row_once_in_order(self):
+        pages = self.walk(CursorPaginator(User.objects.all(), 10))
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(sum(pages, []), [f"user-{i:02}" for i in range(25)])
+
+    def test_descending_ordering_with_ties(self):
+        paginator = CursorPaginator(User.objects.all(), 4, ordering=("-date_joined",))
+        expected = list(User.objects.order_by("-date_joined", "-pk").values_list("username", flat=True))
+        self.assertEqual(sum(self.walk(paginator), []), expected)
+
+    def test_cursor_values_round_trip_exactly(self):
+        paginator = CursorPaginator(User.objects.all(), 10, ordering=("-date_joined",))
+        last = list(paginator.page())[-1]
+        self.assertEqual(paginator.decode(paginator.page().next_cursor), [last.date_joined, last.pk])
+
+    def test_unsupported_ordering_is_rejected(self):
+        for ordering in (("groups",), ("groups__name",), ("nope",)):
+            with self.subTest(ordering=ordering), self.assertRaises(ValueError):
+                CursorPaginator(User.objects.all(), 10, ordering=ordering)
+
+    def test_count_is_lazy(self):
+        paginator = CursorPaginator(User.objects.all(), 10)
+        with self.assertNumQueries(1):
+            paginator.page()
+        self.assertEqual(paginator.count, 25)
+
+    def test_tampered_cursor_is_rejected(self):
+        paginator = CursorPaginator(User.objects.all(), 10)
+        cursor = paginator.page().next_cursor
+        with self.assertRaises(InvalidCursor):
+            paginator.page(cursor[:-2] + "xx")
+        with self.assertRaises(InvalidCursor):
+            CursorPaginator(User.objects.all(), 10, ordering=("-date_joined",)).page(cursor)
+
+
+class LoadMoreTests(TestCase):
+    def setUp(self):
+        User.objects.bulk_create(User(username=f"user-{i}") for i in range(3))
+        self.factory = RequestFactory()
+
+    def test_paginate_keeps_query_and_404s_on_bad_cursor(self):
+        page = paginate(self.factory.get("/users/", {"q": "user"}), User.objects.all(), per_page=2)
+        query = QueryDict(page.next_query.lstrip("?"))
+        self.assertEqual(query["q"], "user")
+        self.assertEqual(query["cursor"], page.next_cursor)
+        with self.assertRaises(Http404):
+            paginate(self.factory.get("/users/", {"cursor": "nope"}), User.objects.all())
+
+    def test_page_template_for_htmx(self):
+        htmx = self.factory.get("/users/", HTTP_HX_REQUEST="true")
+        self.assertEqual(page_template(htmx, "list.html", "_rows.html"), "_rows.html")
+        self.assertEqual(page_template(self.factory.get("/users/"), "list.html", "_rows.html"), "list.html")
+
+    def test_load_more_component(self):
+        first = paginate(self.factory.get("/users/"), User.objects.all(), per_page=2)
+        html = render_to_string("cotton/load_more.html", {"page": first})
+        self.assertIn(f'hx-get="{escape(first.next_query)}"', html)
+
+        last = paginate(self.factory.get("/users/", {"cursor": first.next_cursor}),
+                        User.objects.all(), per_page=2)
+        self.assertEqual(len(last), 1)
+        self.assertNotIn("hx-get", render_to_string("cotton/load_more.html", {"page": last}))
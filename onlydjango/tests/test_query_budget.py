@@ -0,0 +1,69 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from onlydjango.db.middleware import QueryBudgetMiddleware
+from onlydjango.db.queries import QueryBudgetExceeded, QueryBudgetMixin, fingerprint, query_budget
+
+User = get_user_model()
+
+
+def n_plus_one(request):
+    for user in User.objects.all():
+        User.objects.filter(pk=user.pk).exists()
+    return HttpResponse()
+
+
+class FingerprintTests(TestCase):
+    def test_values_and_in_lists_are_normalized(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM users WHERE id = 1 AND name = 'o''brien'"),
+            fingerprint("SELECT *  FROM users WHERE id = 22 AND name = 'x'"),
+        )
+        self.assertEqual(fingerprint('SELECT 1 FROM "t" WHERE "id" IN (%s, %s, %s)'),
+                         'SELECT ? FROM "t" WHERE "id" IN (...)')
+
+
+@override_settings(QUERY_BUDGET={"max_queries": 20, "max_duplicates": 2})
+class QueryBudgetMiddlewareTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        User.objects.bulk_create(User(username=f"user-{i}") for i in range(5))
+        self.request = RequestFactory().get("/users/")
+
+    def run_view(self, view):
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = QueryBudgetMiddleware(get_response)
+        return middleware(self.request)
+
+    def test_raises_on_repeated_queries(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, "likely N+1"):
+            self.run_view(n_plus_one)
+
+    @override_settings(QUERY_BUDGET_ACTIONS=["header"])
+    def test_reports_counts_in_headers(self):
+        response = self.run_view(n_plus_one)
+        self.assertEqual(response["X-DB-Queries"], "6")
+        self.assertEqual(response["X-DB-Duplicates"], "4")
+        self.assertEqual(response["X-Query-Budget"], "exceeded")
+
+    @override_settings(QUERY_BUDGET_ACTIONS=["log"])
+    def test_logs_when_exceeded(self):
+        with self.assertLogs("onlydjango.db.middleware", "WARNING"):
+            self.run_view(n_plus_one)
+
+    def test_view_budget_overrides_default(self):
+        @query_budget(max_duplicates=10)
+        def tolerant(request):
+            return n_plus_one(request)
+
+        self.assertEqual(self.run_view(tolerant).status_code, 200)
+
+    def test_assert_query_budget(self):
+        with self.assertQueryBudget(max_queries=1):
+            list(User.objects.all())
+        with self.assertRaises(AssertionError):
+            with self.assertQueryBudget(max_duplicates=0):
+                n_plus_one(self.request)
@@ -0,0 +1,147 @@
+import gzip
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.test import TestCase, override_settings
+from django.urls import path
+from django.views import View
+
+from apps.core.models import User
+from onlydjango.cache.dependencies import depends_on
+from onlydjango.cache.responses import ResponseCacheMixin, cache_response
+
+renders = []
+
+
+@cache_response(query_params=("page",), depends_on=("core.User",))
+def user_count(request):
+    renders.append(request.path)
+    partial = request.headers.get("HX-Request") == "true"
+    page = request.GET.get("page", "1")
+    return HttpResponse(f"{'partial' if partial else 'page'} {page}: {User.objects.count()} users")
+
+
+class HomeView(ResponseCacheMixin, View):
+    cache_dependencies = ("core.User",)
+    response_cache_anonymous_only = True
+
+    def get(self, request):
+        renders.append(request.path)
+        if "flash" in request.COOKIES:
+            messages.info(request, "Welcome back")
+            return HttpResponse(" ".join(str(m) for m in messages.get_messages(request)))
+        return HttpResponse("home")
+
+
+class ProfileView(ResponseCacheMixin, View):
+    def get_cache_dependencies(self):
+        return depends_on(User(pk=self.kwargs["pk"]))
+
+    def get(self, request, pk):
+        renders.append(request.path)
+        return HttpResponse(User.objects.get(pk=pk).bio)
+
+
+@cache_response()
+def form(request):
+    renders.append(request.path)
+    return HttpResponse(get_token(request))
+
+
+urlpatterns = [
+    path("users/", user_count),
+    path("", HomeView.as_view()),
+    path("form/", form),
+    path("users/<int:pk>/", ProfileView.as_view()),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ResponseCacheMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        renders.clear()
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get("/users/")
+        second = self.client.get("/users/")
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), ("miss", "hit"))
+        self.assertEqual(second.content, b"page 1: 0 users")
+        self.assertEqual(first["ETag"], second["ETag"])
+        self.assertIn("HX-Request", second["Vary"])
+        self.assertEqual(len(renders), 1)
+
+    def test_keys_vary_on_segment_htmx_and_params(self):
+        self.client.get("/users/")
+        self.assertEqual(self.client.get("/users/", headers={"HX-Request": "true"}).content,
+                         b"partial 1: 0 users")
+        self.assertEqual(self.client.get("/users/", {"page": 2}).content, b"page 2: 0 users")
+        self.client.force_login(User.objects.create_user("member"))
+        self.assertEqual(self.client.get("/users/").content, b"page 1: 1 users")
+        self.assertEqual(len(renders), 4)
+
+        # Unlisted parameters bypass the cache entirely.
+        self.assertNotIn("X-Cache", self.client.get("/users/", {"sort": "name"}))
+
+    def test_writes_to_dependencies_invalidate(self):
+        self.client.get("/users/")
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user("new")
+        response = self.client.get("/users/")
+        self.assertEqual((response["X-Cache"], response.content), ("miss", b"page 1: 1 users"))
+
+    def test_conditional_requests_get_304_without_rendering(self):
+        response = self.client.get("/users/")
+        by_etag = self.client.get("/users/", headers={"If-None-Match": response["ETag"]})
+        by_date = self.client.get("/users/", headers={"If-Modified-Since": response["Last-Modified"]})
+        self.assertEqual((by_etag.status_code, by_date.status_code), (304, 304))
+        self.assertEqual(len(renders), 1)
+
+    def test_gzip_clients_get_the_stored_body(self):
+        self.client.get("/users/")
+        response = self.client.get("/users/", headers={"Accept-Encoding": "gzip, br"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), b"page 1: 0 users")
+
+    def test_gzip_refused_by_q_values_gets_the_plain_body(self):
+        self.client.get("/users/")
+        for accept in ("gzip;q=0, br", "identity", "*;q=0", "br, *;q=0.5, gzip; q=0"):
+            response = self.client.get("/users/", headers={"Accept-Encoding": accept})
+            self.assertNotIn("Content-Encoding", response, accept)
+            self.assertEqual(response.content, b"page 1: 0 users")
+        response = self.client.get("/users/", headers={"Accept-Encoding": "br;q=1.0, *;q=0.1"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_class_based_view_dependencies_and_anonymous_only(self):
+        self.client.get("/")
+        self.assertEqual(self.client.get("/")["X-Cache"], "hit")
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user("new")
+        self.assertEqual(self.client.get("/")["X-Cache"], "miss")
+
+        self.client.force_login(user)
+        self.assertNotIn("X-Cache", self.client.get("/"))
+
+    def test_row_dependencies_from_the_view_hook_invalidate(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            alice, bob = User.objects.create_user("alice"), User.objects.create_user("bob")
+        self.client.get(f"/users/{alice.pk}/")
+        self.client.get(f"/users/{bob.pk}/")
+        with self.captureOnCommitCallbacks(execute=True):
+            alice.bio = "updated"
+            alice.save()
+
+        response = self.client.get(f"/users/{alice.pk}/")
+        self.assertEqual((response["X-Cache"], response.content), ("miss", b"updated"))
+        self.assertEqual(self.client.get(f"/users/{bob.pk}/")["X-Cache"], "hit")
+
+    def test_personal_responses_are_not_stored(self):
+        self.client.get("/form/")
+        self.assertEqual(self.client.get("/form/")["X-Cache"], "miss")
+        self.client.cookies["flash"] = "1"
+        self.client.get("/")
+        del self.client.cookies["flash"]
+        self.assertEqual(self.client.get("/").content, b"home")
+        self.assertEqual(len(renders), 4)
@@ -0,0 +1,99 @@
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from onlydjango.db import slow_queries
+from onlydjango.db.timeouts import _no_timeout_for_migrate, statement_timeout
+
+
+@override_settings(SLOW_QUERY_MS=0, SLOW_QUERY_BUFFER=3)
+class SlowQueryLogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        slow_queries.clear()
+
+    def run_queries(self, count):
+        with connection.execute_wrapper(slow_queries.record_slow):
+            for _ in range(count):
+                get_user_model().objects.filter(username="x").exists()
+
+    def test_keeps_last_entries_with_view_and_stack(self):
+        token = slow_queries.current_view.set("users:list")
+        self.addCleanup(slow_queries.current_view.reset, token)
+        with self.assertLogs("onlydjango.db.slow_queries", "WARNING"):
+            self.run_queries(5)
+
+        entries = slow_queries.collect()
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(entries[0]["view"], "users:list")
+        self.assertIn('FROM "users"', entries[0]["sql"])
+        self.assertTrue(any("test_slow_queries.py" in frame for frame in entries[0]["stack"]))
+
+    @override_settings(SLOW_QUERY_MS=60_000)
+    def test_fast_queries_are_ignored(self):
+        self.run_queries(2)
+        self.assertEqual(slow_queries.collect(), [])
+
+    def test_command_dumps_and_clears(self):
+        with self.assertLogs("onlydjango.db.slow_queries", "WARNING"):
+            self.run_queries(1)
+        out = StringIO()
+        call_command("slow_queries", "--stack", stdout=out)
+        self.assertIn('FROM "users"', out.getvalue())
+
+        call_command("slow_queries", "--clear", stdout=StringIO())
+        self.assertEqual(slow_queries.collect(), [])
+
+
+class StatementTimeoutTests(TestCase):
+    def test_is_a_no_op_outside_postgresql(self):
+        @statement_timeout(1000)
+        def view():
+            return get_user_model().objects.count()
+
+        self.assertEqual(view(), 0)
+
+    def test_each_decorated_call_gets_its_own_instance(self):
+        # Concurrent requests through one decorated view must not share the
+        # stack of previous timeouts.
+        decorator = statement_timeout(1000)
+        entered = []
+        original = statement_timeout.__enter__
+
+        def enter(cm):
+            entered.append(cm)
+            return original(cm)
+
+        view = decorator(lambda: None)
+        with mock.patch.object(statement_timeout, "__enter__", enter):
+            view()
+            view()
+        self.assertEqual(len({id(cm) for cm in entered}), 2)
+        self.assertNotIn(decorator, entered)
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL only")
+class PostgresStatementTimeoutTests(TransactionTestCase):
+    def current(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            return cursor.fetchone()[0]
+
+    def test_restores_previous_timeout_outside_transactions(self):
+        before = self.current()
+        with statement_timeout(1234):
+            self.assertEqual(self.current(), "1234ms")
+            with statement_timeout(50):
+                self.assertEqual(self.current(), "50ms")
+            self.assertEqual(self.current(), "1234ms")
+        self.assertEqual(self.current(), before)
+
+    def test_migrate_runs_without_timeout(self):
+        with statement_timeout(1234):
+            _no_timeout_for_migrate(sender=None, using="default")
+            self.assertEqual(self.current(), "0")
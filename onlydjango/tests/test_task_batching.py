@@ -0,0 +1,64 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.test import SimpleTestCase, TestCase
+from huey import MemoryHuey
+
+from onlydjango.tasks import BatchedTask
+
+
+class BatchedTaskTests(SimpleTestCase):
+    def setUp(self):
+        self.huey = MemoryHuey("batching")
+        self.received = []
+
+        @self.huey.task()
+        def collect(calls):
+            self.received.append(calls)
+
+        self.batched = BatchedTask(collect, size=3, window=3600)
+
+    def drain(self):
+        while (message := self.huey.dequeue()) is not None:
+            self.huey.execute(message)
+
+    def test_full_batches_are_enqueued_as_one_message(self):
+        for user_id in range(7):
+            self.batched(user_id=user_id)
+
+        self.assertEqual(self.huey.pending_count(), 2)
+        self.assertEqual(self.batched.pending, 1)
+
+        self.batched.flush()
+        self.drain()
+        self.assertEqual([len(calls) for calls in self.received], [3, 3, 1])
+        self.assertEqual(self.received[2], [{"user_id": 6}])
+
+    def test_window_flushes_partial_batch(self):
+        self.batched.window = 0
+        self.batched(user_id=1)
+        self.assertEqual(self.huey.pending_count(), 1)
+
+    def test_request_finished_flushes_buffers(self):
+        self.batched(user_id=1)
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(self.huey.pending_count(), 1)
+        self.assertEqual(self.batched.pending, 0)
+
+    def test_immediate_mode_runs_batch_on_flush(self):
+        self.huey.immediate = True
+        self.batched(user_id=1)
+        self.batched(user_id=2)
+        self.assertEqual(self.received, [])
+
+        self.batched.flush()
+        self.assertEqual(self.received, [[{"user_id": 1}, {"user_id": 2}]])
+
+
+class TaskBatchingBenchmarkTests(TestCase):
+    def test_reports_both_variants(self):
+        out = StringIO()
+        call_command("benchmark", "task_batching", size=20, stdout=out)
+        self.assertIn("per-call", out.getvalue())
+        self.assertIn("batched", out.getvalue())
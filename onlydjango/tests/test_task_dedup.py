@@ -0,0 +1,78 @@
+from django.test import SimpleTestCase
+from huey import MemoryHuey
+
+from onlydjango.tasks import BatchedTask, suppressed_counts
+from onlydjango.tasks.dedup import Deduplicator, DedupTask
+
+
+class DedupTaskTests(SimpleTestCase):
+    def setUp(self):
+        self.huey = MemoryHuey("dedup")
+        self.runs = []
+
+        def track(user_id, action, metadata=None):
+            self.runs.append((user_id, action))
+
+        self.deduplicator = Deduplicator(self.huey, track, ttl=60)
+        wrapper = self.huey.task()(self.deduplicator.release_on_run(track))
+        self.task = DedupTask(wrapper, self.deduplicator)
+
+    def drain(self):
+        while (message := self.huey.dequeue()) is not None:
+            self.huey.execute(message)
+
+    def test_duplicate_pending_calls_collapse(self):
+        self.task(1, "login")
+        self.task(user_id=1, action="login")
+        self.task(1, "login", None)
+        self.task(1, "logout")
+
+        self.assertEqual(self.huey.pending_count(), 2)
+        self.assertEqual(suppressed_counts(self.huey), {"track": 2})
+
+        self.drain()
+        self.assertEqual(self.runs, [(1, "login"), (1, "logout")])
+
+    def test_duplicate_returns_the_pending_result(self):
+        def double(n):
+            return n * 2
+
+        deduplicator = Deduplicator(self.huey, double)
+        task = DedupTask(self.huey.task()(deduplicator.release_on_run(double)), deduplicator)
+        first, duplicate = task(21), task(21)
+
+        self.assertEqual(duplicate.id, first.id)
+        self.assertIsNone(duplicate.get())
+        self.drain()
+        # Both callers read the shared result.
+        self.assertEqual((first.get(), duplicate.get()), (42, 42))
+
+    def test_key_is_released_when_task_runs(self):
+        self.task(1, "login")
+        self.drain()
+        self.task(1, "login")
+        self.assertEqual(self.huey.pending_count(), 1)
+
+    def test_custom_key_function(self):
+        deduplicator = Deduplicator(self.huey, lambda user_id, action: None,
+                                    key=lambda user_id, action: user_id)
+        self.assertEqual(deduplicator.key((1, "a")), deduplicator.key((1, "b")))
+
+    def test_batched_calls_are_deduplicated(self):
+        received = []
+
+        def collect(calls):
+            received.extend(calls)
+
+        deduplicator = Deduplicator(self.huey, collect, batched=True)
+        wrapper = self.huey.task()(deduplicator.release_on_run(collect))
+        batched = DedupTask(BatchedTask(wrapper, size=10, window=60), deduplicator)
+
+        batched(user_id=1)
+        batched(user_id=1)
+        batched.flush()
+        self.drain()
+        batched(user_id=1)
+
+        self.assertEqual(received, [{"user_id": 1}])
+        self.assertEqual(batched.pending, 1)
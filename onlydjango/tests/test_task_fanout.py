@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from huey import MemoryHuey
+from huey.exceptions import TaskException
+
+from onlydjango.tasks.fanout import fan_out, get_checkpoint
+
+
+class FanOutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.ids = [
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com").pk
+            for i in range(7)
+        ]
+
+    def setUp(self):
+        self.huey = MemoryHuey("fanout", immediate=True)
+        self.chunks = []
+        self.fail_on = None
+
+        @self.huey.task()
+        def visit(ids, label):
+            if ids[0] == self.fail_on:
+                self.fail_on = None
+                raise RuntimeError("worker died")
+            self.chunks.append(ids)
+            return len(ids)
+
+        self.visit = visit
+        self.users = get_user_model().objects.all()
+
+    def test_walks_table_in_keyset_chunks(self):
+        dispatched = fan_out(self.users.order_by("-pk"), self.visit, "all", chunk_size=3, label="x")
+
+        self.assertEqual(dispatched, 7)
+        self.assertEqual(self.chunks, [self.ids[0:3], self.ids[3:6], self.ids[6:]])
+        self.assertIsNone(get_checkpoint(self.huey, "all"))
+
+    def test_interrupted_fan_out_resumes_after_checkpoint(self):
+        self.fail_on = self.ids[3]
+        with self.assertRaises(TaskException):
+            fan_out(self.users, self.visit, "resume", chunk_size=3, label="x")
+        self.assertEqual(get_checkpoint(self.huey, "resume"), self.ids[2])
+
+        self.chunks.clear()
+        self.assertEqual(fan_out(self.users, self.visit, "resume", chunk_size=3, label="x"), 4)
+        self.assertEqual(self.chunks, [self.ids[3:6], self.ids[6:]])
+
+    def test_restart_ignores_checkpoint(self):
+        self.huey.put("fanout:restart", self.ids[5])
+        self.assertEqual(fan_out(self.users, self.visit, "restart", chunk_size=3, label="x"), 1)
+        self.huey.put("fanout:restart", self.ids[5])
+        self.assertEqual(fan_out(self.users, self.visit, "restart", chunk_size=3, restart=True, label="x"), 7)
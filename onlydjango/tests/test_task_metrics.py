@@ -0,0 +1,60 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from huey import MemoryHuey
+
+from onlydjango.tasks import metrics, task_metrics
+
+
+class TaskMetricsTests(SimpleTestCase):
+    def setUp(self):
+        self.huey = MemoryHuey("metrics")
+        metrics.install(self.huey)
+
+        @self.huey.task(create_id=metrics.timed_task_id)
+        def work(fail=False):
+            if fail:
+                raise ValueError("boom")
+
+        @self.huey.task(retries=1, create_id=metrics.timed_task_id)
+        def flaky():
+            raise ValueError("again")
+
+        self.work, self.flaky = work, flaky
+
+    def drain(self):
+        while (message := self.huey.dequeue()) is not None:
+            self.huey.execute(message)
+
+    def test_task_ids_carry_creation_time(self):
+        task = self.work.s()
+        self.assertAlmostEqual(metrics.enqueued_at(task), time.time(), delta=5)
+
+    def test_records_outcomes_and_latency_per_task(self):
+        self.work()
+        self.work()
+        self.work(fail=True)
+        self.flaky()
+        self.drain()
+
+        summary = task_metrics(self.huey, minutes=5)
+        self.assertEqual(summary["work"]["runs"], 3)
+        self.assertEqual(summary["work"]["outcomes"], {"success": 2, "error": 1})
+        self.assertEqual(summary["flaky"]["outcomes"], {"retry": 1, "error": 1})
+        self.assertIsNotNone(summary["work"]["wait"][95])
+        self.assertEqual(summary["work"]["run"][50], 1)
+
+    def test_percentile_uses_bucket_upper_bounds(self):
+        histogram = [0] * (len(metrics.BUCKETS_MS) + 1)
+        histogram[0], histogram[6] = 90, 10  # <=1ms and <=100ms
+        self.assertEqual(metrics.percentile(histogram, 0.5), 1)
+        self.assertEqual(metrics.percentile(histogram, 0.95), 100)
+
+
+class TaskStatsCommandTests(SimpleTestCase):
+    def test_runs_without_metrics(self):
+        out = StringIO()
+        call_command("task_stats", minutes=5, stdout=out)
+        self.assertIn("Pending", out.getvalue())
@@ -0,0 +1,64 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TransactionTestCase
+from huey import MemoryHuey
+
+from onlydjango.tasks import enqueue_many
+from onlydjango.tasks.deferred import OnCommitTask
+
+
+class OnCommitTaskTests(TransactionTestCase):
+    def setUp(self):
+        self.huey = MemoryHuey("on_commit")
+        self.enqueued = []
+        self.huey.signal("enqueued")(lambda signal, task: self.enqueued.append(task.args))
+
+        @self.huey.task()
+        def touch(user_id):
+            return user_id
+
+        self.task = OnCommitTask(touch)
+
+    def test_outside_transaction_enqueues_immediately(self):
+        self.task(1)
+        self.assertEqual(self.enqueued, [(1,)])
+
+    def test_calls_wait_for_commit(self):
+        with transaction.atomic():
+            self.task(1)
+            self.task(2)
+            self.assertEqual(self.huey.pending_count(), 0)
+        self.assertEqual(self.enqueued, [(1,), (2,)])
+
+    def test_rollback_enqueues_nothing(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.task(1)
+                raise RuntimeError
+        self.assertEqual(self.huey.pending_count(), 0)
+
+        with transaction.atomic():
+            self.task(2)
+        self.assertEqual(self.enqueued, [(2,)])
+
+    def test_savepoint_rollback_drops_only_its_calls(self):
+        with transaction.atomic():
+            self.task(1)
+            try:
+                with transaction.atomic():
+                    self.task(2)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            self.task(3)
+        self.assertEqual(self.enqueued, [(1,), (3,)])
+
+    def test_commit_enqueues_held_calls_together(self):
+        with mock.patch("onlydjango.tasks.deferred.enqueue_many", wraps=enqueue_many) as spy:
+            with transaction.atomic():
+                for user_id in range(5):
+                    self.task(user_id)
+                    transaction.on_commit(lambda: None)
+        spy.assert_called_once()
+        self.assertEqual(len(spy.call_args.args[1]), 5)
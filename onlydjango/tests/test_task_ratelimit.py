@@ -0,0 +1,70 @@
+from django.test import SimpleTestCase
+from huey import MemoryHuey
+
+from onlydjango.tasks import metrics, task_metrics
+from onlydjango.tasks.ratelimit import LocalLimiterStore, RateLimiter, get_store
+
+
+class LimiterStoreTests(SimpleTestCase):
+    def test_token_bucket_allows_burst_then_waits(self):
+        store = LocalLimiterStore()
+        self.assertEqual(store.take_token("t", rate=2, burst=2), 0.0)
+        self.assertEqual(store.take_token("t", rate=2, burst=2), 0.0)
+        wait = store.take_token("t", rate=2, burst=2)
+        self.assertGreater(wait, 0.4)
+        self.assertLessEqual(wait, 0.5)
+
+    def test_concurrency_slots_are_released(self):
+        store = LocalLimiterStore()
+        self.assertTrue(store.acquire_slot("t", 1, 60, "a"))
+        self.assertFalse(store.acquire_slot("t", 1, 60, "b"))
+        store.release_slot("t", "a")
+        self.assertTrue(store.acquire_slot("t", 1, 60, "b"))
+
+
+class RateLimitedTaskTests(SimpleTestCase):
+    def setUp(self):
+        self.huey = MemoryHuey("ratelimit")
+        metrics.install(self.huey)
+        self.runs = []
+
+        def send(user_id):
+            self.runs.append(user_id)
+
+        limiter = RateLimiter(self.huey, "send", rate=0.01, burst=1)
+        self.send = self.huey.task(retries=0, create_id=metrics.timed_task_id)(limiter.guard(send))
+
+    def drain(self):
+        while (message := self.huey.dequeue()) is not None:
+            self.huey.execute(message)
+
+    def test_over_limit_runs_are_rescheduled_without_using_retries(self):
+        for user_id in range(3):
+            self.send(user_id)
+        self.drain()
+
+        self.assertEqual(self.runs, [0])
+        self.assertEqual(self.huey.scheduled_count(), 2)
+        delays = sorted(task.eta for task in self.huey.scheduled())
+        self.assertGreater((delays[1] - delays[0]).total_seconds(), 50)
+        self.assertTrue(all(task.retries == 0 for task in self.huey.scheduled()))
+        self.assertEqual(task_metrics(self.huey)["send"]["outcomes"],
+                         {"success": 1, "throttled": 2})
+
+    def test_concurrency_cap_reschedules_while_slots_are_taken(self):
+        limiter = RateLimiter(self.huey, "capped", max_concurrency=1)
+        self.assertTrue(get_store(self.huey).acquire_slot("capped", 1, 60, "held"))
+        capped = self.huey.task()(limiter.guard(lambda: self.runs.append("ran")))
+
+        capped()
+        self.drain()
+        self.assertEqual(self.runs, [])
+        self.assertEqual(self.huey.scheduled_count(), 1)
+
+    def test_immediate_mode_is_not_limited(self):
+        huey = MemoryHuey("ratelimit-inline", immediate=True)
+        limiter = RateLimiter(huey, "send", rate=0.01, burst=1)
+        send = huey.task()(limiter.guard(self.runs.append))
+        for user_id in range(3):
+            send(user_id)
+        self.assertEqual(self.runs, [0, 1, 2])
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+from django.test import SimpleTestCase
+from huey import MemoryHuey
+from huey.exceptions import TaskException
+from huey.serializer import Serializer
+
+from onlydjango.tasks import get_results, results
+from onlydjango.tasks.results import (
+    JSON,
+    MSGPACK,
+    CompactSerializer,
+    ResultHuey,
+    _clear_result_ttl,
+    _set_result_ttl,
+    discard_result,
+)
+
+
+class CompactSerializerTests(SimpleTestCase):
+    def test_plain_values_round_trip_smaller_than_pickle(self):
+        serializer = CompactSerializer()
+        value = {"user_id": 1, "action": "login", "processed": True, "scores": [1.5, None]}
+        data = serializer.serialize(value)
+        self.assertEqual(serializer.deserialize(data), value)
+        self.assertLess(len(data), len(Serializer().serialize(value)))
+
+    @skipUnless(results.msgpack, "msgpack is not installed")
+    def test_plain_values_use_msgpack(self):
+        self.assertEqual(CompactSerializer().serialize({"n": 1})[:1], MSGPACK)
+
+    def test_json_without_msgpack(self):
+        serializer = CompactSerializer()
+        with mock.patch.object(results, "msgpack", None):
+            data = serializer.serialize({"n": 1})
+            self.assertEqual(data[:1], JSON)
+            self.assertEqual(serializer.deserialize(data), {"n": 1})
+            with self.assertRaises(RuntimeError):
+                serializer.deserialize(MSGPACK + b"\x81\xa1n\x01")
+
+    def test_other_values_are_pickled(self):
+        serializer = CompactSerializer()
+        for value in [(1, 2), {1: "a"}, {"when": {1, 2}}]:
+            self.assertEqual(serializer.deserialize(serializer.serialize(value)), value)
+
+
+class ResultStoreTests(SimpleTestCase):
+    def test_get_results_reads_in_order(self):
+        huey = MemoryHuey("results")
+
+        @huey.task()
+        def double(n):
+            return {"n": n * 2}
+
+        @huey.task()
+        def fail():
+            raise ValueError("boom")
+
+        results = [double(n) for n in range(3)]
+        while (message := huey.dequeue()) is not None:
+            huey.execute(message)
+
+        self.assertEqual(get_results(huey, results + ["missing"]),
+                         [{"n": 0}, {"n": 2}, {"n": 4}, None])
+
+        failed = fail()
+        huey.execute(huey.dequeue())
+        with self.assertRaises(TaskException):
+            get_results(huey, [failed])
+
+    def test_discarded_results_are_not_stored(self):
+        huey = MemoryHuey("discard")
+        noisy = huey.task()(discard_result(lambda: {"big": "result"}))
+        noisy()
+        huey.execute(huey.dequeue())
+        self.assertEqual(huey.result_count(), 0)
+
+    def test_result_ttl_follows_running_task(self):
+        huey = ResultHuey("ttl", expire_time=86400)
+        huey.storage.conn = mock.Mock()
+
+        _set_result_ttl(SimpleNamespace(result_ttl=60))
+        huey.storage.put_data("a", b"x", is_result=True)
+        _clear_result_ttl(None, None, None)
+        huey.storage.put_data("b", b"x", is_result=True)
+
+        calls = huey.storage.conn.set.call_args_list
+        self.assertEqual(calls[0], mock.call(b"huey.r.ttl.a", b"x", ex=60))
+        self.assertEqual(calls[1], mock.call(b"huey.r.ttl.b", b"x", ex=86400))
+
+    def test_dict_settings_can_set_the_periodic_check_frequency(self):
+        huey = ResultHuey("check", expire_time=60, periodic_task_check_frequency=1)
+        self.assertEqual(huey.periodic_task_check_frequency, 1)
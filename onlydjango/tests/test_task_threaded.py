@@ -0,0 +1,129 @@
+import datetime
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, override_settings
+from huey import crontab
+
+from onlydjango.tasks import ThreadedHuey, get_huey
+
+
+class ThreadedHueyTests(SimpleTestCase):
+    def setUp(self):
+        self.huey = ThreadedHuey("threaded-tests", workers=2, queue_depth=2)
+        self.huey.poll_interval = 0.05
+        self.done = threading.Event()
+        self.threads = []
+
+    def tearDown(self):
+        self.huey.storage.executor.shutdown(wait=True)
+
+    def test_tasks_run_on_worker_threads(self):
+        @self.huey.task()
+        def record(n):
+            self.threads.append(threading.current_thread().name)
+            if len(self.threads) == 5:
+                self.done.set()
+
+        for n in range(5):
+            record(n)
+
+        self.assertTrue(self.done.wait(5))
+        self.assertTrue(all(name.startswith("huey-threaded-tests") for name in self.threads))
+
+    def test_full_queue_blocks_until_a_slot_frees(self):
+        release = threading.Event()
+
+        @self.huey.task()
+        def hold():
+            release.wait(5)
+
+        for n in range(4):  # two running, two queued
+            hold()
+        self.assertEqual(self.huey.storage.queue_size(), 4)
+        blocked = threading.Thread(target=hold)
+        blocked.start()
+        blocked.join(0.2)
+        self.assertTrue(blocked.is_alive())
+
+        release.set()
+        blocked.join(5)
+        self.assertFalse(blocked.is_alive())
+
+    def test_full_queue_runs_worker_enqueues_inline(self):
+        release = threading.Event()
+
+        @self.huey.task()
+        def hold():
+            release.wait(5)
+
+        @self.huey.task()
+        def child():
+            self.threads.append(threading.current_thread().name)
+
+        @self.huey.task()
+        def parent():
+            full.wait(5)
+            child()
+            self.done.set()
+
+        full = threading.Event()
+        hold()
+        parent()
+        hold()
+        hold()
+        full.set()
+        self.assertTrue(self.done.wait(5))
+        # The pool was full: the child ran on the parent's thread, not queued.
+        self.assertEqual(len(self.threads), 1)
+        release.set()
+
+    def test_scheduler_starts_only_when_needed(self):
+        self.assertIsNone(self.huey._scheduler)
+
+        @self.huey.task()
+        def later():
+            self.done.set()
+
+        later.schedule(delay=0.1)
+        self.assertIsNotNone(self.huey._scheduler)
+        self.assertTrue(self.done.wait(5))
+
+    def test_periodic_tasks_run_only_where_enabled(self):
+        runs = []
+
+        @self.huey.periodic_task(crontab(minute="30"))
+        def half_past():
+            runs.append(1)
+
+        self.huey.run_scheduler_once(datetime.datetime(2026, 1, 1, 12, 30, 1))
+        self.huey.storage.executor.shutdown(wait=True)
+        self.assertEqual(runs, [])
+
+    def test_periodic_tasks_run_once_per_matching_minute(self):
+        self.huey = ThreadedHuey("threaded-tests", workers=2, queue_depth=2, periodic=True)
+        runs = []
+
+        @self.huey.periodic_task(crontab(minute="30"))
+        def half_past():
+            runs.append(1)
+            self.done.set()
+
+        self.huey.run_scheduler_once(datetime.datetime(2026, 1, 1, 12, 29, 59))
+        self.huey.run_scheduler_once(datetime.datetime(2026, 1, 1, 12, 30, 1))
+        self.huey.run_scheduler_once(datetime.datetime(2026, 1, 1, 12, 30, 40))
+
+        self.assertTrue(self.done.wait(5))
+        self.huey.storage.executor.shutdown(wait=True)
+        self.assertEqual(runs, [1])
+
+
+class TasksModeTests(SimpleTestCase):
+    @override_settings(TASKS_MODE="inline")
+    def test_inline_mode_is_immediate(self):
+        self.assertTrue(get_huey().immediate)
+
+    @override_settings(TASKS_MODE="celery")
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_huey()
@@ -4,6 +4,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
 
+from onlydjango.db.views import pool_stats
+
 urlpatterns = [
     path('admin/', admin.site.urls),
 ]
@@ -12,8 +14,10 @@ urlpatterns += [
     path("__debug__/", include(debug_toolbar.urls)),
     path("__reload__/", include("django_browser_reload.urls")),
     path('accounts/', include('allauth.urls')),
+    path("__dbpool__/", pool_stats, name="db_pool_stats"),
 
     # apps : YOUR APP URLS go here
+    path("", include("apps.core.urls")),
     # Note that wagtail urls dont need including if using default aproach of wagtail
 
 ]